@@ -0,0 +1,33 @@
+"""Add (owner_id, created_at, id) index for keyset pagination
+
+Revision ID: 3c1f0e2a7b94
+Revises: 9876543210ab
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f0e2a7b94"
+down_revision: Union[str, Sequence[str], None] = "9876543210ab"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_tasks_owner_created_at_id",
+        "tasks",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_tasks_owner_created_at_id", table_name="tasks")
@@ -0,0 +1,48 @@
+"""Add users.tasks_version for task list ETags
+
+Revision ID: 5d2a8c41e6f3
+Revises: 3c1f0e2a7b94
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2a8c41e6f3"
+down_revision: Union[str, Sequence[str], None] = "3c1f0e2a7b94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("tasks_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    # Task writes only bump tasks_version: not a profile update
+    op.execute("DROP TRIGGER IF EXISTS set_users_updated_at ON users")
+    op.execute("""
+    CREATE TRIGGER set_users_updated_at
+    BEFORE UPDATE ON users
+    FOR EACH ROW
+    WHEN (OLD.tasks_version IS NOT DISTINCT FROM NEW.tasks_version)
+    EXECUTE FUNCTION handle_updated_at();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS set_users_updated_at ON users")
+    op.execute("""
+    CREATE TRIGGER set_users_updated_at
+    BEFORE UPDATE ON users
+    FOR EACH ROW
+    EXECUTE FUNCTION handle_updated_at();
+    """)
+    op.drop_column("users", "tasks_version")
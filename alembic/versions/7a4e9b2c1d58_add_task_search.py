@@ -0,0 +1,53 @@
+"""Add full-text and trigram search on tasks
+
+Revision ID: 7a4e9b2c1d58
+Revises: 5d2a8c41e6f3
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a4e9b2c1d58"
+down_revision: Union[str, Sequence[str], None] = "5d2a8c41e6f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Title words rank above description words (weights A and B)
+    op.execute("""
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """)
+    op.create_index(
+        "idx_tasks_search_vector",
+        "tasks",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "idx_tasks_title_trgm",
+        "tasks",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_tasks_title_trgm", table_name="tasks")
+    op.drop_index("idx_tasks_search_vector", table_name="tasks")
+    op.drop_column("tasks", "search_vector")
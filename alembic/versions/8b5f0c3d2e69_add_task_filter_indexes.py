@@ -0,0 +1,41 @@
+"""Add indexes for task list filters and sorts
+
+Revision ID: 8b5f0c3d2e69
+Revises: 7a4e9b2c1d58
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b5f0c3d2e69"
+down_revision: Union[str, Sequence[str], None] = "7a4e9b2c1d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_tasks_owner_status_created_at_id",
+        "tasks",
+        ["owner_id", "status", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_tasks_owner_modified_at_id",
+        "tasks",
+        ["owner_id", sa.text("coalesce(updated_at, created_at)"), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_tasks_owner_modified_at_id", table_name="tasks")
+    op.drop_index("idx_tasks_owner_status_created_at_id", table_name="tasks")
@@ -0,0 +1,53 @@
+"""Add task_counters with per-owner, per-status task counts
+
+Revision ID: 9c6a1d4e3f7b
+Revises: 8b5f0c3d2e69
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c6a1d4e3f7b"
+down_revision: Union[str, Sequence[str], None] = "8b5f0c3d2e69"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_counters",
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "TODO", "IN_PROGRESS", "DONE", name="taskstatus", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["users.id"],
+            name=op.f("fk_task_counters_owner_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("owner_id", "status", name=op.f("pk_task_counters")),
+    )
+    # Backfill from existing tasks
+    op.execute("""
+    INSERT INTO task_counters (owner_id, status, count)
+    SELECT owner_id, status, count(*) FROM tasks GROUP BY owner_id, status
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_counters")
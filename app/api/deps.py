@@ -1,48 +1,134 @@
-from typing import Generator, Annotated
+from typing import AsyncGenerator, Annotated
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.metrics import registry
+from app.core.tracing import span
+from app.db import session
+from app.db.routing import use_replica
+from app.db.session import AsyncSessionLocal, SessionLocal, ThreadedSession
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Authenticated users keyed by access token. A hit skips both the JWT decode
+# and the user lookup; entries never outlive the token's `exp`.
+principal_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+registry.counter(
+    "principal_cache_events_total",
+    "Principal cache hits, misses and evictions.",
+    ("event",),
+    collect=lambda: [
+        ((name,), value)
+        for name, value in principal_cache.stats().items()
+        if name in ("hits", "misses", "evictions")
+    ],
+)
+
+
+def invalidate_user(user_id: UUID) -> int:
+    """
+    Drop every cached principal for a user. Returns how many entries were removed.
+    """
+    return principal_cache.invalidate_where(lambda user: user.id == user_id)
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
 
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    # ORM-level hook: bulk UPDATE/DELETE statements bypass it and rely on the TTL
+    invalidate_user(target.id)
 
-def get_current_user(
+
+async def get_db(request: Request) -> AsyncGenerator:
+    """
+    Yields the request's database session.
+
+    With DB_ASYNC enabled this is a native AsyncSession; otherwise it is a sync
+    Session wrapped in ThreadedSession, which exposes the same awaitable API.
+
+    When read replicas are configured, GET/HEAD requests are bound to one of
+    them unless the client is pinned to the primary after a recent write
+    (see app.db.routing); everything else uses the primary.
+    """
+    replica = use_replica(request)
+    request.state.db_replica = replica
+    if AsyncSessionLocal is not None:
+        options = (
+            {"bind": session.pick_replica(session.async_replica_engines)}
+            if replica
+            else {}
+        )
+        async with AsyncSessionLocal(**options) as db:
+            yield db
+    else:
+        options = (
+            {"bind": session.pick_replica(session.replica_engines)} if replica else {}
+        )
+        db = ThreadedSession(SessionLocal(**options))
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
+    with span("get_current_user") as current:
+        user = principal_cache.get(token)
+        if current is not None:
+            current.attributes["app.principal_cache_hit"] = user is not None
+        if user is not None:
+            return user
+        return await authenticate_token(token, db)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> User:
+    """
+    Decode the access token and load its user, then cache the principal.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        with span("jwt.decode"):
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
         sub: str | None = payload.get("sub")
         if sub is None:
             raise credentials_exception
-        token_data = TokenPayload(sub=sub)
+        token_data = TokenPayload(sub=sub, uid=payload.get("uid"))
     except (JWTError, ValidationError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == token_data.sub).first()
+    if token_data.uid is not None:
+        user = await db.get(User, token_data.uid)
+        # Tokens are bound to the email they were issued for
+        if user is not None and user.email != token_data.sub:
+            user = None
+    else:
+        user = await db.scalar(select(User).where(User.email == token_data.sub))
     if user is None:
         raise credentials_exception
+
+    # Detach so the cached instance is not expired by this request's commit
+    db.expunge(user)
+    principal_cache.set(token, user, expires_at=payload.get("exp"))
     return user
@@ -1,52 +1,53 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 
 from app.api.deps import get_db, get_current_user
 from app.core import security
 from app.core.config import settings
+from app.core.tracing import TracedRoute
 from app.models.user import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserResponse, UserLogin
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TracedRoute)
 
 
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def register(user_in: UserCreate, db: Annotated[Session, Depends(get_db)]):
+async def register(user_in: UserCreate, db: Annotated[AsyncSession, Depends(get_db)]):
     """
     Register a new user.
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await db.scalar(select(User).where(User.email == user_in.email))
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    user = User(
-        email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
-    )
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    user = User(email=user_in.email, hashed_password=hashed_password)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
-    form_data: Annotated[UserLogin, Body()], db: Annotated[Session, Depends(get_db)]
+async def login(
+    form_data: Annotated[UserLogin, Body()],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
     Login with email and password to obtain access and refresh tokens.
     """
-    user = db.query(User).filter(User.email == form_data.email).first()
-    if not user or not security.verify_password(
+    user = await db.scalar(select(User).where(User.email == form_data.email))
+    if not user or not await security.verify_password_async(
         form_data.password, user.hashed_password
     ):
         raise HTTPException(
@@ -55,9 +56,20 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = security.create_access_token(user.email)
+    access_token = security.create_access_token(user.email, user_id=user.id)
     refresh_token = security.create_refresh_token(user.email)
 
+    # Migrate the stored hash to the current work factor while we hold the
+    # plaintext. Best effort: under hashing back-pressure, retry on a later login.
+    if security.needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await security.get_password_hash_async(
+                form_data.password
+            )
+            await db.commit()
+        except security.PasswordHasherBusyError:
+            pass
+
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -66,9 +78,9 @@ def login(
 
 
 @router.post("/refresh", response_model=Token)
-def refresh_token(
+async def refresh_token(
     refresh_token: Annotated[str, Body(embed=True)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
     Refresh access token using a valid refresh token.
@@ -89,12 +101,12 @@ def refresh_token(
         raise credentials_exception
 
     # Verify user still exists
-    user = db.query(User).filter(User.email == sub).first()
+    user = await db.scalar(select(User).where(User.email == sub))
     if not user:
         raise credentials_exception
 
     # Issue new tokens
-    new_access_token = security.create_access_token(sub)
+    new_access_token = security.create_access_token(sub, user_id=user.id)
     # Ideally rotate refresh token, but for now we can just return a new access token
     # or return the same refresh token if we want to keep it valid until exp.
     # The requirement says "Issue a new access token".
@@ -110,7 +122,7 @@ def refresh_token(
 
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(current_user: Annotated[User, Depends(get_current_user)]):
+async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]):
     """
     Get current user profile (Protected route).
     """
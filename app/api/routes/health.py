@@ -1,6 +1,9 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, status
 
-router = APIRouter(tags=["health"])
+from app.core.lifecycle import lifecycle
+from app.core.tracing import TracedRoute
+
+router = APIRouter(tags=["health"], route_class=TracedRoute)
 
 
 @router.get("/health", status_code=status.HTTP_200_OK)
@@ -9,3 +12,16 @@ def health_check():
     Health check endpoint to verify service status.
     """
     return {"status": "ok"}
+
+
+@router.get("/health/ready", status_code=status.HTTP_200_OK)
+def readiness_check():
+    """
+    Readiness probe: 503 until startup (connection pool warm-up) is done, and
+    again once the instance is draining for shutdown.
+    """
+    if not lifecycle.accepting:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Not ready"
+        )
+    return {"status": "ready"}
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.tracing import TracedRoute
+
+router = APIRouter(tags=["metrics"], route_class=TracedRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """
+    This worker's metrics in the Prometheus text format.
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
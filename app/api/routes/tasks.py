@@ -1,22 +1,300 @@
-from typing import Annotated, List
-from uuid import UUID
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Annotated, AsyncIterator, List
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import anyio
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    status,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert, null, select, true, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.api.deps import get_db, get_current_user
-from app.models.task import Task
+from app.core import cache
+from app.core.cache import CachedResponse
+from app.core.export import (
+    CSV_HEADER,
+    EXPORT_MEDIA_TYPES,
+    EXPORT_RENDERERS,
+    TaskFileFormat,
+    GzipEncoder,
+    accepts_gzip,
+)
+from app.core.etag import (
+    etag_matches,
+    list_etag,
+    parse_etags,
+    task_etag,
+    task_version,
+    task_versions_from_etags,
+)
+from app.core.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from app.core.search import search_clauses
+from app.core.task_import import (
+    ImportFormatError,
+    iter_lines,
+    iter_records,
+    validate_record,
+)
+from app.core.tracing import TracedRoute, span
+from app.db.bulk import copy_rows
+from app.db.counters import (
+    apply_status_deltas,
+    status_change_deltas,
+    status_deltas,
+)
+from app.db.routing import replica_staleness
+from app.models.task import Task, TaskStatus
+from app.models.task_counter import TaskCounter
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchDeleteResponse,
+    TaskBatchSelector,
+    TaskBatchUpdate,
+    TaskBatchUpdateResponse,
+    TaskCreate,
+    TaskImportResponse,
+    TaskResponse,
+    TaskSort,
+    TaskStatsResponse,
+    TaskUpdate,
+)
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+router = APIRouter(prefix="/tasks", tags=["tasks"], route_class=TracedRoute)
+
+task_list_adapter = TypeAdapter(List[TaskResponse])
+
+# Rows fetched from the export cursor (and rendered into one chunk) at a time
+EXPORT_PARTITION_SIZE = 1000
+
+# Valid import rows buffered before each COPY, and rejected rows reported in full
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+
+def batch_conditions(current_user: User, selector: TaskBatchSelector) -> list:
+    """
+    WHERE clause for a batch request: always scoped to the caller's tasks.
+    """
+    conditions = [Task.owner_id == current_user.id]
+    if selector.ids is not None:
+        conditions.append(Task.id.in_(selector.ids))
+    elif selector.filter is not None and selector.filter.status is not None:
+        conditions.append(Task.status == selector.filter.status)
+    return conditions
+
+
+# Sort key of each GET /tasks ordering; every one is backed by an index
+# on (owner_id, <key>, id) and paginated by keyset on (<key>, id)
+TASK_SORT_KEYS = {
+    "created_at": Task.created_at,
+    "updated_at": func.coalesce(Task.updated_at, Task.created_at),
+}
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    # Naive values are taken as UTC, like everything stored
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def list_tasks_query(
+    owner_id: UUID,
+    status: TaskStatus | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_since: datetime | None = None,
+    sort: TaskSort = "created_at",
+    after: tuple[datetime, UUID] | None = None,
+):
+    """
+    SELECT for one GET /tasks page (without LIMIT), resuming after the
+    keyset position `after` if given.
+    """
+    descending = sort.startswith("-")
+    key = TASK_SORT_KEYS[sort.lstrip("-")]
+    query = select(Task).where(Task.owner_id == owner_id)
+    if status is not None:
+        query = query.where(Task.status == status)
+    if created_after is not None:
+        query = query.where(Task.created_at > as_utc(created_after))
+    if created_before is not None:
+        query = query.where(Task.created_at < as_utc(created_before))
+    if updated_since is not None:
+        query = query.where(TASK_SORT_KEYS["updated_at"] >= as_utc(updated_since))
+    if after is not None:
+        position = tuple_(key, Task.id)
+        query = query.where(
+            position < tuple_(*after) if descending else position > tuple_(*after)
+        )
+    if descending:
+        return query.order_by(key.desc(), Task.id.desc())
+    return query.order_by(key, Task.id)
+
+
+def list_version_query(
+    owner_id: UUID, status: TaskStatus | None = None, with_total: bool = True
+):
+    """
+    SELECT of the owner's task list version and, if `with_total`, the number
+    of tasks (in `status`) read from the counters; NULL otherwise.
+    """
+    total = null()
+    if with_total:
+        total_query = select(func.coalesce(func.sum(TaskCounter.count), 0)).where(
+            TaskCounter.owner_id == owner_id
+        )
+        if status is not None:
+            total_query = total_query.where(TaskCounter.status == status)
+        total = total_query.scalar_subquery()
+    return select(User.tasks_version, total).where(User.id == owner_id)
+
+
+def warmup_queries() -> list:
+    """
+    The hottest statements of this router (a GET /tasks page in each sort
+    and with a status filter, its version/total, GET /tasks/{id}), bound to
+    an owner that does not exist: run at startup to prime the statement
+    cache without reading anything.
+    """
+    owner_id = uuid4()
+    position = (datetime.now(timezone.utc), owner_id)
+    queries: list = [
+        list_tasks_query(owner_id, sort=sort).limit(1)
+        for sort in ("created_at", "-created_at", "updated_at", "-updated_at")
+    ]
+    queries += [
+        list_tasks_query(owner_id, status=TaskStatus.TODO).limit(1),
+        list_tasks_query(owner_id, after=position).limit(1),
+        list_version_query(owner_id),
+        list_version_query(owner_id, TaskStatus.TODO),
+        select(Task).where(Task.id == owner_id, Task.owner_id == owner_id),
+    ]
+    return queries
+
+
+async def update_tasks(
+    db: AsyncSession, conditions: list, values: dict
+) -> list[tuple[Task, TaskStatus]]:
+    """
+    Apply `values` to the tasks matching `conditions` and return
+    (task, previous status) pairs, so status counters can be adjusted.
+    On PostgreSQL the previous statuses come from a locking CTE read in the
+    same UPDATE ... RETURNING statement. SQLite's RETURNING cannot see an
+    UPDATE's FROM clause, so there they are read first and the UPDATE is
+    limited to the rows read (a task inserted in between is left alone).
+    """
+    if "status" not in values:
+        statement = update(Task).where(*conditions).values(**values)
+        return (await db.execute(statement.returning(Task, Task.status))).all()
+
+    if db.get_bind().dialect.name != "postgresql":
+        previous = dict(
+            (await db.execute(select(Task.id, Task.status).where(*conditions))).all()
+        )
+        statement = (
+            update(Task)
+            .where(*conditions, Task.id.in_(list(previous)))
+            .values(**values)
+        )
+        tasks = (await db.scalars(statement.returning(Task))).all()
+        return [(task, previous[task.id]) for task in tasks]
+
+    previous = (
+        select(Task.id, Task.status)
+        .where(*conditions)
+        .with_for_update()
+        .cte("previous")
+    )
+    statement = update(Task).where(Task.id == previous.c.id).values(**values)
+    return (await db.execute(statement.returning(Task, previous.c.status))).all()
+
+
+async def bump_tasks_version(db: AsyncSession, owner_id: UUID) -> None:
+    """
+    Move the owner's task list to a new version, invalidating list ETags.
+    Must run in the same transaction as the write it accounts for.
+    """
+    await db.execute(
+        update(User)
+        .where(User.id == owner_id)
+        # updated_at is pinned: a task write is not a change to the user
+        .values(tasks_version=User.tasks_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def if_match_condition(id: UUID, if_match: str):
+    """
+    WHERE clause that only matches the task in a state the client has seen.
+    Checked by the write statement itself, so no row lock is needed. Weak
+    tags never match (strong comparison), so they fail the precondition.
+    """
+    tags = parse_etags(if_match, weak=False)
+    if "*" in tags:
+        return true()
+    versions = task_versions_from_etags(tags, id)
+    return func.coalesce(Task.updated_at, Task.created_at).in_(versions)
+
+
+def json_response(cached: CachedResponse, if_none_match: str | None) -> Response:
+    """
+    Send a rendered JSON response, or a 304 if the client already has it.
+    """
+    etag = cached.headers.get("ETag")
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return Response(
+        content=cached.body, media_type="application/json", headers=cached.headers
+    )
+
+
+async def raise_not_found_or_precondition_failed(
+    db: AsyncSession, id: UUID, current_user: User, if_match: str | None
+):
+    # Only reached when a conditional write matched no row: tell a missing
+    # task apart from one that changed since the client's copy
+    if if_match is not None:
+        exists = await db.scalar(
+            select(Task.id).where(Task.id == id, Task.owner_id == current_user.id)
+        )
+        if exists is not None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task was modified by another request",
+            )
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_in: TaskCreate,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
     Create a new task owned by the current user.
@@ -28,98 +306,517 @@ def create_task(
         owner_id=current_user.id,
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+    # The flush's INSERT ... RETURNING fetches server defaults such as created_at
+    # (SQLAlchemy's eager_defaults="auto"), so no refresh round trip is needed
+    await db.flush()
+    await bump_tasks_version(db, current_user.id)
+    await apply_status_deltas(db, current_user.id, {task.status: 1})
+    created = TaskResponse.model_validate(task)
+    response.headers["ETag"] = task_etag(task.id, task.created_at)
+    await db.commit()
+    await cache.response_cache.invalidate_owner(current_user.id)
+    return created
 
 
 @router.get("", response_model=List[TaskResponse])
-def read_tasks(
+async def read_tasks(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(10, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    offset: int = Query(0, ge=0, deprecated=True),
+    status_filter: TaskStatus | None = Query(None, alias="status"),
+    created_after: datetime | None = Query(None),
+    created_before: datetime | None = Query(None),
+    updated_since: datetime | None = Query(None),
+    sort: TaskSort = Query("created_at"),
+    if_none_match: str | None = Header(None),
 ):
     """
-    Retrieve tasks owned by the current user with pagination.
+    Retrieve tasks owned by the current user.
+
+    Filters: `status`, `created_after` / `created_before` (exclusive) and
+    `updated_since` (last modified at or after; creation counts). `sort` is
+    `created_at` (default) or `updated_at`, prefixed with `-` for descending;
+    ties are broken by id.
+
+    Pagination is keyset-based: pass the `X-Next-Cursor` value (also linked
+    from the `Link` header) as `cursor` to fetch the next page, keeping the
+    same filters and sort. Each page is an index range scan on
+    (owner_id, [status,] sort key, id), so cost does not grow with depth.
+    `offset` is kept for older clients and ignored when `cursor` is present.
+
+    `X-Total-Count` gives the number of matching tasks across all pages,
+    read from the status counters; it is omitted when date filters are used.
+
+    The `ETag` tracks the owner's task list version; a matching
+    `If-None-Match` gets a 304 without the tasks being queried. Rendered pages
+    are kept in the response cache until the owner's next write.
     """
-    tasks = (
-        db.query(Task)
-        .filter(Task.owner_id == current_user.id)
-        .offset(offset)
-        .limit(limit)
-        .all()
+    cache_key = await cache.response_cache.key(current_user.id, str(request.url))
+    cached = await cache.response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, if_none_match)
+
+    # Read the version before the page: a concurrent write can then only make
+    # the ETag older than the data (a spurious 200), never newer (a stale 304)
+    tasks_version, total_count = (
+        await db.execute(
+            list_version_query(
+                current_user.id,
+                status_filter,
+                with_total=not (created_after or created_before or updated_since),
+            )
+        )
+    ).one()
+    etag = list_etag(current_user.id, tasks_version)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    headers = {"ETag": etag}
+    if total_count is not None:
+        headers["X-Total-Count"] = str(total_count)
+
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+    query = list_tasks_query(
+        current_user.id,
+        status=status_filter,
+        created_after=created_after,
+        created_before=created_before,
+        updated_since=updated_since,
+        sort=sort,
+        after=after,
     )
-    return tasks
+    if after is None and offset:
+        query = query.offset(offset)
+
+    # Fetch one extra row to know whether another page exists
+    tasks = (await db.scalars(query.limit(limit + 1))).all()
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        sort_value = (
+            last.created_at
+            if sort.lstrip("-") == "created_at"
+            else task_version(last.updated_at, last.created_at)
+        )
+        next_cursor = encode_cursor(sort_value, last.id)
+        next_url = request.url.remove_query_params("offset").include_query_params(
+            cursor=next_cursor
+        )
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    with span("serialize", **{"app.tasks": len(tasks)}):
+        body = task_list_adapter.dump_json(
+            [TaskResponse.model_validate(task) for task in tasks]
+        )
+    rendered = CachedResponse(body=body, headers=headers)
+    await cache.response_cache.set(
+        cache_key, rendered, min_version_age=replica_staleness(request)
+    )
+    return json_response(rendered, if_none_match)
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def read_task_stats(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Number of tasks the current user has in each status.
+    Read from the maintained counters, so cost does not grow with task count.
+    """
+    counts = {task_status: 0 for task_status in TaskStatus}
+    rows = await db.execute(
+        select(TaskCounter.status, TaskCounter.count).where(
+            TaskCounter.owner_id == current_user.id
+        )
+    )
+    for task_status, count in rows:
+        counts[task_status] = count
+    return {"total": sum(counts.values()), "by_status": counts}
+
+
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks(
+    request: Request,
+    response: Response,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None),
+):
+    """
+    Search the current user's tasks by title and description, best match first.
+
+    On PostgreSQL every word of `q` is matched as a prefix against the
+    generated `search_vector` column (GIN index), and titles containing a word
+    trigram-similar to `q` also match, so small typos are tolerated.
+    Results are ordered by (rank, id) descending and paginated by keyset like
+    GET /tasks: pass `X-Next-Cursor` back as `cursor`.
+    """
+    rank, match = search_clauses(db.get_bind().dialect.name, q)
+    ranked = (
+        select(Task, rank.label("rank"))
+        .where(Task.owner_id == current_user.id, match)
+        .subquery()
+    )
+    task_alias = aliased(Task, ranked)
+    query = select(task_alias, ranked.c.rank).order_by(
+        ranked.c.rank.desc(), ranked.c.id.desc()
+    )
+    if cursor is not None:
+        try:
+            after = decode_rank_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.where(tuple_(ranked.c.rank, ranked.c.id) < tuple_(*after))
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_task, last_rank = rows[-1]
+        next_cursor = encode_rank_cursor(last_rank, last_task.id)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return [task for task, _ in rows]
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}
+    },
+)
+async def export_tasks(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    format: TaskFileFormat = Query("ndjson"),
+    accept_encoding: str | None = Header(None),
+):
+    """
+    Stream all of the current user's tasks as NDJSON or CSV, ordered by
+    (created_at, id).
+
+    Rows come from a server-side cursor in partitions of EXPORT_PARTITION_SIZE,
+    so memory use does not depend on how many tasks exist. The body is
+    gzip-compressed on the fly when the client accepts it. If the client
+    disconnects, the cursor is closed right away.
+    """
+    query = (
+        select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.owner_id,
+            Task.created_at,
+        )
+        .where(Task.owner_id == current_user.id)
+        .order_by(Task.created_at, Task.id)
+    )
+    gzip = GzipEncoder() if accepts_gzip(accept_encoding) else None
+    encode = gzip.encode if gzip else bytes
+
+    async def body() -> AsyncIterator[bytes]:
+        result = await db.stream(query)
+        try:
+            if format == "csv":
+                yield encode(CSV_HEADER)
+            async for partition in result.partitions(EXPORT_PARTITION_SIZE):
+                yield encode(EXPORT_RENDERERS[format](partition))
+            if gzip:
+                yield gzip.finish()
+        finally:
+            # Runs on disconnect too, where the surrounding scope is cancelled
+            with anyio.CancelScope(shield=True):
+                await result.close()
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="tasks.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        body(), media_type=EXPORT_MEDIA_TYPES[format], headers=headers
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    format: TaskFileFormat = Query("ndjson"),
+):
+    """
+    Bulk-load tasks from an NDJSON or CSV upload (the export format works as-is).
+
+    The body is parsed as it arrives and validated against TaskCreate; valid
+    rows are loaded IMPORT_CHUNK_SIZE at a time with COPY (executemany on
+    SQLite), so memory use does not depend on the upload size. Invalid rows
+    are skipped and reported by line number. Accepted rows are committed
+    together at the end.
+    """
+    accepted = 0
+    rejected = 0
+    errors = []
+    chunk: list[dict] = []
+    imported: Counter[TaskStatus] = Counter()
+    try:
+        async for line, record in iter_records(iter_lines(request.stream()), format):
+            task = validate_record(record)
+            if not isinstance(task, TaskCreate):
+                rejected += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append({"line": line, "errors": task})
+                continue
+            # COPY skips Python-side defaults, so the id is assigned here
+            chunk.append(
+                {"id": uuid4(), **task.model_dump(), "owner_id": current_user.id}
+            )
+            imported[task.status] += 1
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                await db.run_sync(copy_rows, Task.__table__, chunk)
+                accepted += len(chunk)
+                chunk = []
+    except (ImportFormatError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    await db.run_sync(copy_rows, Task.__table__, chunk)
+    accepted += len(chunk)
+    if accepted:
+        await bump_tasks_version(db, current_user.id)
+        await apply_status_deltas(db, current_user.id, imported)
+    await db.commit()
+    if accepted:
+        await cache.response_cache.invalidate_owner(current_user.id)
+    return {"accepted": accepted, "rejected": rejected, "errors": errors}
+
+
+@router.post(
+    "/batch", response_model=List[TaskResponse], status_code=status.HTTP_201_CREATED
+)
+async def create_tasks_batch(
+    batch: TaskBatchCreate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Create several tasks with a single INSERT ... RETURNING statement.
+    Created tasks are returned in the order they were submitted.
+    """
+    rows = [{**item.model_dump(), "owner_id": current_user.id} for item in batch.items]
+    tasks = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True), rows
+    )
+    # Serialize before commit: committed instances may be expired
+    created = [TaskResponse.model_validate(task) for task in tasks.all()]
+    await bump_tasks_version(db, current_user.id)
+    await apply_status_deltas(
+        db, current_user.id, status_deltas(task.status for task in created)
+    )
+    await db.commit()
+    await cache.response_cache.invalidate_owner(current_user.id)
+    return created
+
+
+@router.patch("/batch", response_model=TaskBatchUpdateResponse)
+async def update_tasks_batch(
+    batch: TaskBatchUpdate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Apply the same changes to tasks selected by id list or filter, using a
+    single UPDATE ... RETURNING statement. Requested ids that do not exist
+    or belong to another user are reported in `not_found`.
+    """
+    rows = await update_tasks(
+        db,
+        batch_conditions(current_user, batch),
+        batch.changes.model_dump(exclude_unset=True),
+    )
+    updated = [TaskResponse.model_validate(task) for task, _ in rows]
+    if updated:
+        await bump_tasks_version(db, current_user.id)
+        await apply_status_deltas(
+            db,
+            current_user.id,
+            status_change_deltas((previous, task.status) for task, previous in rows),
+        )
+    await db.commit()
+    if updated:
+        await cache.response_cache.invalidate_owner(current_user.id)
+
+    found = {task.id for task in updated}
+    not_found = [id for id in batch.ids or [] if id not in found]
+    return {"updated": updated, "not_found": not_found}
+
+
+@router.delete("/batch", response_model=TaskBatchDeleteResponse)
+async def delete_tasks_batch(
+    batch: TaskBatchDelete,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Delete tasks selected by id list or filter with a single
+    DELETE ... RETURNING statement.
+    """
+    rows = (
+        await db.execute(
+            delete(Task)
+            .where(*batch_conditions(current_user, batch))
+            .returning(Task.id, Task.status)
+        )
+    ).all()
+    deleted = [id for id, _ in rows]
+    if deleted:
+        await bump_tasks_version(db, current_user.id)
+        await apply_status_deltas(
+            db, current_user.id, status_deltas((status for _, status in rows), -1)
+        )
+    await db.commit()
+    if deleted:
+        await cache.response_cache.invalidate_owner(current_user.id)
+
+    found = set(deleted)
+    not_found = [id for id in batch.ids or [] if id not in found]
+    return {"deleted": deleted, "not_found": not_found}
 
 
 @router.get("/{id}", response_model=TaskResponse)
-def read_task(
+async def read_task(
     id: UUID,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    if_none_match: str | None = Header(None),
 ):
     """
     Retrieve a specific task by ID.
     Enforces ownership: Users can only see their own tasks.
+    Returns 304 when `If-None-Match` carries the task's current `ETag`.
     """
-    task = (
-        db.query(Task).filter(Task.id == id, Task.owner_id == current_user.id).first()
+    cache_key = await cache.response_cache.key(current_user.id, f"task:{id.hex}")
+    cached = await cache.response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, if_none_match)
+
+    task = await db.scalar(
+        select(Task).where(Task.id == id, Task.owner_id == current_user.id)
     )
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
-    return task
+
+    with span("serialize"):
+        body = TaskResponse.model_validate(task).model_dump_json().encode()
+    rendered = CachedResponse(
+        body=body,
+        headers={
+            "ETag": task_etag(task.id, task_version(task.updated_at, task.created_at))
+        },
+    )
+    await cache.response_cache.set(
+        cache_key, rendered, min_version_age=replica_staleness(request)
+    )
+    return json_response(rendered, if_none_match)
 
 
 @router.put("/{id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     id: UUID,
     task_update: TaskUpdate,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    if_match: str | None = Header(None),
 ):
     """
     Update a task.
     Enforces ownership: Users can only update their own tasks.
+    A single UPDATE ... RETURNING both applies the change and reads the row back.
+    With `If-Match`, the update only applies if the task still has that
+    `ETag`; otherwise 412 is returned and nothing is written.
     """
-    task = (
-        db.query(Task).filter(Task.id == id, Task.owner_id == current_user.id).first()
-    )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
+    conditions = [Task.id == id, Task.owner_id == current_user.id]
+    if if_match is not None:
+        conditions.append(if_match_condition(id, if_match))
 
     update_data = task_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
+    rows = await update_tasks(db, conditions, update_data)
+    if not rows:
+        await raise_not_found_or_precondition_failed(db, id, current_user, if_match)
 
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+    task, previous_status = rows[0]
+    await bump_tasks_version(db, current_user.id)
+    await apply_status_deltas(
+        db, current_user.id, status_change_deltas([(previous_status, task.status)])
+    )
+    updated = TaskResponse.model_validate(task)
+    response.headers["ETag"] = task_etag(
+        task.id, task_version(task.updated_at, task.created_at)
+    )
+    await db.commit()
+    await cache.response_cache.invalidate_owner(current_user.id)
+    return updated
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    if_match: str | None = Header(None),
 ):
     """
     Delete a task.
     Enforces ownership: Users can only delete their own tasks.
+    With `If-Match`, the task is only deleted if it still has that `ETag`.
     """
-    task = (
-        db.query(Task).filter(Task.id == id, Task.owner_id == current_user.id).first()
+    conditions = [Task.id == id, Task.owner_id == current_user.id]
+    if if_match is not None:
+        conditions.append(if_match_condition(id, if_match))
+
+    deleted_status = await db.scalar(
+        delete(Task).where(*conditions).returning(Task.status)
     )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
+    if deleted_status is None:
+        await raise_not_found_or_precondition_failed(db, id, current_user, if_match)
 
-    db.delete(task)
-    db.commit()
+    await bump_tasks_version(db, current_user.id)
+    await apply_status_deltas(db, current_user.id, {deleted_status: -1})
+    await db.commit()
+    await cache.response_cache.invalidate_owner(current_user.id)
     return None
@@ -0,0 +1,412 @@
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Hashable, Protocol, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis import RedisClient, RedisError
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache whose entries also expire.
+
+    Each entry lives for at most `ttl` seconds, or less if the caller passes an
+    earlier wall-clock deadline (e.g. a token's `exp`). When `maxsize` entries
+    (or, if set, `max_bytes` as measured by `sizeof`) are exceeded the least
+    recently used entries are evicted. A `maxsize` or `ttl` of 0 disables the
+    cache. Safe to share between the event loop and threadpool.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] = len,  # type: ignore[assignment]
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._data: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            deadline, value, _ = entry
+            if deadline <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        """
+        Store a value. `expires_at` is an optional Unix timestamp that caps the TTL.
+        """
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        now = time.monotonic()
+        deadline = now + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, now + (expires_at - time.time()))
+        if deadline <= now:
+            return
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (deadline, value, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[V], bool]) -> int:
+        """
+        Drop every entry whose value matches the predicate. Returns how many were removed.
+        """
+        with self._lock:
+            stale = [
+                key for key, (_, value, _) in self._data.items() if predicate(value)
+            ]
+            for key in stale:
+                self._remove(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "bytes": self.bytes,
+            }
+
+    def _remove(self, key: K) -> None:
+        # Caller holds the lock
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+
+class CacheBackend(Protocol):
+    """
+    Byte-oriented key/value store behind ResponseCache.
+    """
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(
+        self, key: str, value: bytes, ttl: float, only_if_missing: bool = False
+    ) -> bool: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Per-process LRU backend, bounded by total bytes.
+
+    Invalidations only reach this process, so with several workers or
+    instances another process may serve a stale listing for up to the TTL.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        # Entry count is bounded by bytes alone
+        self._cache: TTLCache[str, bytes] = TTLCache(
+            maxsize=max_bytes, ttl=ttl, max_bytes=max_bytes
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(
+        self, key: str, value: bytes, ttl: float, only_if_missing: bool = False
+    ) -> bool:
+        if only_if_missing and self._cache.get(key) is not None:
+            return False
+        self._cache.set(key, value, expires_at=time.time() + ttl)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        stats = self._cache.stats()
+        return {
+            "evictions": stats["evictions"],
+            "entries": stats["size"],
+            "bytes": stats["bytes"],
+        }
+
+    async def close(self) -> None:
+        self._cache.clear()
+
+
+class RedisBackend:
+    """
+    Shared backend for anything speaking the Redis protocol (Redis, Valkey,
+    KeyDB, ...). Size bounds and eviction are the server's `maxmemory` policy.
+    """
+
+    def __init__(self, url: str):
+        self.client = RedisClient(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.execute("GET", key)
+
+    async def set(
+        self, key: str, value: bytes, ttl: float, only_if_missing: bool = False
+    ) -> bool:
+        args = ["SET", key, value, "PX", int(ttl * 1000)]
+        if only_if_missing:
+            args.append("NX")
+        return await self.client.execute(*args) is not None
+
+    def stats(self) -> dict[str, int]:
+        return {}
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+@dataclass
+class CachedResponse:
+    """
+    A JSON response body with the headers that belong to it (ETag, Link, ...).
+    """
+
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def encode(self) -> bytes:
+        head = "\n".join(f"{name}:{value}" for name, value in self.headers.items())
+        return head.encode() + b"\n\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        head, _, body = data.partition(b"\n\n")
+        headers = dict(line.split(":", 1) for line in head.decode().split("\n") if line)
+        return cls(body=body, headers=headers)
+
+
+def _new_version() -> bytes:
+    # Creation time (Unix ms) first, so the version's age can be read from a key
+    return f"{time.time_ns() // 1_000_000}-{uuid.uuid4().hex}".encode()
+
+
+def _version_age(key: str) -> float:
+    created, _, _ = key.split(":", 3)[2].partition("-")
+    if not created.isdigit():
+        return math.inf
+    return time.time() - int(created) / 1000
+
+
+class ResponseCache:
+    """
+    Caches task responses per owner, keyed by an owner version token.
+
+    Every entry key embeds the owner's current version; a write replaces the
+    version (after commit), so all of the owner's entries become unreachable
+    at once and simply age out. Version tokens are random rather than counters:
+    if a version is evicted or lost, the new one cannot collide with entries
+    written under an old one.
+
+    Backend failures are logged and treated as misses, so the cache never
+    fails a request. A `None` backend disables caching.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float, max_entry_bytes: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def key(self, owner_id: uuid.UUID, name: str) -> str | None:
+        """
+        Cache key for `name` under the owner's current version, or None if the
+        cache is disabled or unavailable.
+        """
+        if self.backend is None:
+            return None
+        version_key = f"tasks:{owner_id.hex}:version"
+        try:
+            version = await self.backend.get(version_key)
+            if version is None:
+                token = _new_version()
+                if await self.backend.set(
+                    version_key, token, self.ttl, only_if_missing=True
+                ):
+                    version = token
+                else:
+                    # Lost the race to another request; use its token
+                    version = await self.backend.get(version_key)
+                    if version is None:
+                        return None
+        except (OSError, TimeoutError, RedisError) as exc:
+            self._failed("read version", exc)
+            return None
+        return f"tasks:{owner_id.hex}:{version.decode()}:{name}"
+
+    async def get(self, key: str | None) -> CachedResponse | None:
+        if key is None or self.backend is None:
+            return None
+        try:
+            data = await self.backend.get(key)
+        except (OSError, TimeoutError, RedisError) as exc:
+            self._failed("get", exc)
+            return None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse.decode(data)
+
+    async def set(
+        self, key: str | None, response: CachedResponse, min_version_age: float = 0
+    ) -> None:
+        """
+        Store a rendered response. It is skipped while the owner's version is
+        younger than `min_version_age` seconds, for responses read from a
+        replica that may not have replayed the write behind that version yet.
+        """
+        if key is None or self.backend is None:
+            return
+        if min_version_age and _version_age(key) < min_version_age:
+            return
+        data = response.encode()
+        if len(data) > self.max_entry_bytes:
+            return
+        try:
+            await self.backend.set(key, data, self.ttl)
+        except (OSError, TimeoutError, RedisError) as exc:
+            self._failed("set", exc)
+            return
+        self.stores += 1
+
+    async def invalidate_owner(self, owner_id: uuid.UUID) -> None:
+        """
+        Move the owner to a new version. Call after the write has committed,
+        otherwise a concurrent read could cache pre-write data under it.
+        """
+        if self.backend is None:
+            return
+        version_key = f"tasks:{owner_id.hex}:version"
+        try:
+            await self.backend.set(version_key, _new_version(), self.ttl)
+        except (OSError, TimeoutError, RedisError) as exc:
+            # Entries under the old version stay visible until they expire
+            self._failed("invalidate", exc)
+            return
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def _failed(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        logger.warning("Response cache %s failed: %r", operation, exc)
+
+
+def build_response_cache() -> ResponseCache:
+    backend: CacheBackend | None = None
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        backend = MemoryBackend(
+            max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    elif settings.RESPONSE_CACHE_BACKEND == "redis":
+        backend = RedisBackend(settings.RESPONSE_CACHE_URL)
+    return ResponseCache(
+        backend,
+        ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    )
+
+
+response_cache = build_response_cache()
+
+
+# Cumulative statistics are exported as counters, the rest (entries, bytes) as gauges
+RESPONSE_CACHE_COUNTERS = (
+    "hits",
+    "misses",
+    "stores",
+    "invalidations",
+    "errors",
+    "evictions",
+)
+
+
+def _response_cache_stats(counters: bool) -> list[tuple[tuple[str], float]]:
+    return [
+        ((name,), value)
+        for name, value in response_cache.stats().items()
+        if (name in RESPONSE_CACHE_COUNTERS) == counters
+    ]
+
+
+registry.counter(
+    "response_cache_events_total",
+    "Response cache hits, misses, stores, invalidations, errors and evictions.",
+    ("event",),
+    collect=lambda: _response_cache_stats(counters=True),
+)
+registry.gauge(
+    "response_cache_usage",
+    "Response cache size (entries, bytes) where the backend reports it.",
+    ("measure",),
+    collect=lambda: _response_cache_stats(counters=False),
+)
@@ -19,10 +19,37 @@ class Settings(BaseSettings):
         "disable", "allow", "prefer", "require", "verify-ca", "verify-full"
     ] = Field("prefer", validation_alias="SSL_MODE")
 
+    # Read replicas (comma separated). GET/HEAD requests run read-only
+    # transactions on a replica, except for clients that wrote within the last
+    # READ_YOUR_WRITES_SECONDS, which stay on the primary. Keep the window
+    # above the replicas' usual replication lag.
+    DATABASE_REPLICA_URLS: list[str] | str = Field(
+        [], validation_alias="DATABASE_REPLICA_URLS"
+    )
+    READ_YOUR_WRITES_SECONDS: float = Field(
+        5.0, validation_alias="READ_YOUR_WRITES_SECONDS"
+    )
+
     # DB Pool Settings (important for Cloud Run)
     DB_POOL_SIZE: int = Field(5, validation_alias="DB_POOL_SIZE")
     DB_MAX_OVERFLOW: int = Field(10, validation_alias="DB_MAX_OVERFLOW")
 
+    # Lifespan: open DB_POOL_SIZE connections per engine and prime the compiled
+    # statement cache before /health/ready reports ready. On SIGTERM, wait up to
+    # SHUTDOWN_DRAIN_SECONDS for in-flight requests (Cloud Run allows 10s).
+    DB_WARMUP_ENABLED: bool = Field(True, validation_alias="DB_WARMUP_ENABLED")
+    SHUTDOWN_DRAIN_SECONDS: float = Field(
+        8.0, ge=0, validation_alias="SHUTDOWN_DRAIN_SECONDS"
+    )
+
+    # Async mode: routes run on an AsyncEngine (asyncpg) instead of a sync engine
+    # driven from the threadpool. Set the statement cache size to 0 when connecting
+    # through a transaction-mode pooler (e.g. Supabase on port 6543).
+    DB_ASYNC: bool = Field(False, validation_alias="DB_ASYNC")
+    DB_ASYNC_STATEMENT_CACHE_SIZE: int = Field(
+        100, validation_alias="DB_ASYNC_STATEMENT_CACHE_SIZE"
+    )
+
     # Security settings
     SECRET_KEY: str = Field(..., validation_alias="SECRET_KEY")
     ALGORITHM: str = Field("HS256", validation_alias="ALGORITHM")
@@ -33,6 +60,100 @@ class Settings(BaseSettings):
         7, validation_alias="REFRESH_TOKEN_EXPIRE_DAYS"
     )
 
+    # Password hashing pool: bcrypt runs on `PASSWORD_HASH_WORKERS` processes
+    # (or threads); requests beyond PASSWORD_HASH_MAX_PENDING queued hashes get a 503
+    PASSWORD_HASH_EXECUTOR: Literal["process", "thread"] = Field(
+        "process", validation_alias="PASSWORD_HASH_EXECUTOR"
+    )
+    PASSWORD_HASH_WORKERS: int = Field(2, validation_alias="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_MAX_PENDING: int = Field(
+        32, validation_alias="PASSWORD_HASH_MAX_PENDING"
+    )
+
+    # bcrypt work factor for new hashes. With BCRYPT_TARGET_MS set, the cost is
+    # instead calibrated at startup to take about that long on this instance.
+    # Logins transparently rehash passwords stored with a different cost.
+    BCRYPT_ROUNDS: int = Field(12, ge=4, le=31, validation_alias="BCRYPT_ROUNDS")
+    BCRYPT_TARGET_MS: int | None = Field(None, validation_alias="BCRYPT_TARGET_MS")
+
+    # Authenticated principal cache (per process). Bounds how long a deleted or
+    # changed user stays visible to other workers; 0 disables the cache.
+    PRINCIPAL_CACHE_SIZE: int = Field(10_000, validation_alias="PRINCIPAL_CACHE_SIZE")
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        60, validation_alias="PRINCIPAL_CACHE_TTL_SECONDS"
+    )
+
+    # Task response cache, keyed per owner and invalidated on every task write.
+    # "memory" is per process (other workers may serve stale lists for up to the
+    # TTL); "redis" is shared by every worker pointing at RESPONSE_CACHE_URL.
+    RESPONSE_CACHE_BACKEND: Literal["none", "memory", "redis"] = Field(
+        "none", validation_alias="RESPONSE_CACHE_BACKEND"
+    )
+    RESPONSE_CACHE_URL: str = Field(
+        "redis://localhost:6379/0", validation_alias="RESPONSE_CACHE_URL"
+    )
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(
+        300, validation_alias="RESPONSE_CACHE_TTL_SECONDS"
+    )
+    RESPONSE_CACHE_MAX_BYTES: int = Field(
+        64 * 1024 * 1024, validation_alias="RESPONSE_CACHE_MAX_BYTES"
+    )
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = Field(
+        256 * 1024, validation_alias="RESPONSE_CACHE_MAX_ENTRY_BYTES"
+    )
+
+    # Logging: "text" or "json" lines on stdout, written from a background
+    # thread (records beyond LOG_QUEUE_SIZE waiting are dropped, never waited
+    # on). Only LOG_SAMPLE_RATE of the INFO records from LOG_SAMPLED_LOGGERS
+    # (per-request lines) are kept, chosen per request id.
+    LOG_FORMAT: Literal["text", "json"] = Field("text", validation_alias="LOG_FORMAT")
+    LOG_LEVEL: str = Field("INFO", validation_alias="LOG_LEVEL")
+    LOG_QUEUE_SIZE: int = Field(10_000, validation_alias="LOG_QUEUE_SIZE")
+    LOG_SAMPLE_RATE: float = Field(1.0, ge=0, le=1, validation_alias="LOG_SAMPLE_RATE")
+    LOG_SAMPLED_LOGGERS: list[str] | str = Field(
+        ["app.request", "uvicorn.access"], validation_alias="LOG_SAMPLED_LOGGERS"
+    )
+
+    # Tracing: spans for each request, get_current_user, SQL statements,
+    # handler and rendering, exported as OTLP/JSON lines to stdout or
+    # TRACE_FILE. New traces are sampled at TRACE_SAMPLE_RATE; an incoming
+    # W3C traceparent's sampled flag is honoured.
+    TRACE_EXPORTER: Literal["none", "stdout", "file"] = Field(
+        "none", validation_alias="TRACE_EXPORTER"
+    )
+    TRACE_FILE: str = Field("traces.jsonl", validation_alias="TRACE_FILE")
+    TRACE_SAMPLE_RATE: float = Field(
+        1.0, ge=0, le=1, validation_alias="TRACE_SAMPLE_RATE"
+    )
+
+    # Traffic recording for benchmarks/replay.py: when TRAFFIC_RECORD_FILE is
+    # set, TRAFFIC_RECORD_SAMPLE_RATE of the requests are appended to it as
+    # sanitized JSON lines (route template, query and body shape, a user
+    # pseudonym, status and timing). JSON bodies larger than
+    # TRAFFIC_RECORD_MAX_BODY_BYTES are recorded by size only.
+    TRAFFIC_RECORD_FILE: str = Field("", validation_alias="TRAFFIC_RECORD_FILE")
+    TRAFFIC_RECORD_SAMPLE_RATE: float = Field(
+        1.0, ge=0, le=1, validation_alias="TRAFFIC_RECORD_SAMPLE_RATE"
+    )
+    TRAFFIC_RECORD_MAX_BODY_BYTES: int = Field(
+        64 * 1024, validation_alias="TRAFFIC_RECORD_MAX_BODY_BYTES"
+    )
+
+    # Per-request SQL instrumentation: statement count and DB time in a
+    # Server-Timing header and the request log; statements slower than
+    # SLOW_QUERY_MS are logged (a sampled fraction of them), and a request
+    # repeating one statement shape more than N_PLUS_ONE_THRESHOLD times is
+    # flagged as a likely N+1.
+    SERVER_TIMING_ENABLED: bool = Field(True, validation_alias="SERVER_TIMING_ENABLED")
+    SLOW_QUERY_MS: float = Field(200.0, validation_alias="SLOW_QUERY_MS")
+    SLOW_QUERY_SAMPLE_RATE: float = Field(
+        1.0, ge=0, le=1, validation_alias="SLOW_QUERY_SAMPLE_RATE"
+    )
+    N_PLUS_ONE_THRESHOLD: int = Field(10, validation_alias="N_PLUS_ONE_THRESHOLD")
+
+    # Prometheus metrics at /metrics (per worker process; scrape each one)
+    METRICS_ENABLED: bool = Field(True, validation_alias="METRICS_ENABLED")
+
     # Environment indicator
     ENV: str = Field("production", validation_alias="ENV")
 
@@ -50,6 +171,17 @@ class Settings(BaseSettings):
             return v.strip('"').strip("'")
         return v
 
+    @field_validator("DATABASE_REPLICA_URLS", "LOG_SAMPLED_LOGGERS", mode="before")
+    @classmethod
+    def split_comma_list(cls, v: Any) -> Any:
+        if isinstance(v, str) and not v.startswith("["):
+            return [
+                item.strip().strip('"').strip("'")
+                for item in v.split(",")
+                if item.strip()
+            ]
+        return v
+
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: Any) -> Any:
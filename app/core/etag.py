@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_micros(value: datetime) -> int:
+    # SQLite hands back naive datetimes; every stored timestamp is UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def task_version(updated_at: datetime | None, created_at: datetime) -> datetime:
+    """
+    The timestamp that identifies a task's current state.
+    """
+    return updated_at or created_at
+
+
+def task_etag(id: UUID, version: datetime) -> str:
+    """
+    Strong ETag for a single task: its id plus the version timestamp.
+    """
+    return f'"{id.hex}-{_to_micros(version)}"'
+
+
+def list_etag(owner_id: UUID, tasks_version: int) -> str:
+    """
+    Strong ETag for any listing of an owner's tasks at a given tasks_version.
+    """
+    return f'"{owner_id.hex}-v{tasks_version}"'
+
+
+def parse_etags(header: str | None, weak: bool = True) -> list[str]:
+    """
+    Split an If-Match / If-None-Match header into entity tags.
+    Weak validators are returned without their W/ prefix, or left out when
+    `weak` is false: If-Match requires strong comparison (RFC 9110).
+    """
+    if not header:
+        return []
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            if not weak:
+                continue
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    If-None-Match semantics: `*` or any listed tag (weak comparison) matches.
+    """
+    tags = parse_etags(header)
+    return "*" in tags or etag in tags
+
+
+def task_versions_from_etags(tags: list[str], id: UUID) -> list[datetime]:
+    """
+    Version timestamps encoded in the given tags for this task.
+    Tags for other tasks or in an unknown format are ignored.
+    """
+    versions = []
+    for tag in tags:
+        task_hex, _, micros = tag.strip('"').partition("-")
+        if task_hex != id.hex or not micros.isdigit():
+            continue
+        seconds, micro = divmod(int(micros), 1_000_000)
+        versions.append(
+            datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=micro)
+        )
+    return versions
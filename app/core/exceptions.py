@@ -34,8 +34,23 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+async def password_hasher_busy_handler(request: Request, exc: Exception):
+    # Login/register bursts beyond the hashing queue are shed instead of queued
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=ErrorResponse(
+            message="Service temporarily overloaded, please retry"
+        ).model_dump(),
+        headers={"Retry-After": "1"},
+    )
+
+
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    # Lazy arguments: the message and traceback are rendered by the log
+    # listener thread, not while this request is being answered
+    logger.error(
+        "Unhandled exception in %s %s", request.method, request.url.path, exc_info=exc
+    )
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(message="Internal server error").model_dump(),
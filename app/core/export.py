@@ -0,0 +1,67 @@
+import csv
+import io
+import zlib
+from typing import Iterable, Literal
+
+from app.schemas.task import TaskResponse
+
+TaskFileFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_FIELDS = list(TaskResponse.model_fields)
+
+
+def render_ndjson(rows: Iterable) -> bytes:
+    """
+    One JSON object per line, serialized exactly like TaskResponse.
+    """
+    return b"".join(
+        TaskResponse.model_validate(row).model_dump_json().encode() + b"\n"
+        for row in rows
+    )
+
+
+def render_csv(rows: Iterable) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    for row in rows:
+        writer.writerow(TaskResponse.model_validate(row).model_dump(mode="json"))
+    return buffer.getvalue().encode()
+
+
+CSV_HEADER = (",".join(CSV_FIELDS) + "\r\n").encode()
+
+EXPORT_RENDERERS = {"ndjson": render_ndjson, "csv": render_csv}
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Whether the client listed gzip in Accept-Encoding (and did not refuse it with q=0).
+    """
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class GzipEncoder:
+    """
+    Incremental gzip: each chunk is flushed so the client receives data as it
+    is produced rather than when the compressor's window fills.
+    """
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(wbits=31)  # gzip container
+
+    def encode(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
@@ -0,0 +1,111 @@
+import logging
+import signal
+import threading
+from types import FrameType
+
+import anyio
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.schemas.error import ErrorResponse
+
+logger = logging.getLogger(__name__)
+
+DRAINING_BODY = ErrorResponse(message="Shutting down, please retry").model_dump_json()
+
+
+class Lifecycle:
+    """
+    Readiness of this process: ready once the lifespan startup (pool warm-up)
+    is done, and draining from SIGTERM on, when readiness fails and new
+    requests are turned away while in-flight ones finish.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+
+    @property
+    def accepting(self) -> bool:
+        return self.ready and not self.draining
+
+    def start_draining(self) -> None:
+        if not self.draining:
+            logger.info("Draining %d in-flight request(s)", self.in_flight)
+        self.draining = True
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop taking requests and wait up to `timeout` seconds for the
+        in-flight ones. Returns whether they all finished.
+        """
+        self.start_draining()
+        with anyio.move_on_after(timeout):
+            while self.in_flight:
+                await anyio.sleep(0.05)
+        if self.in_flight:
+            logger.warning(
+                "%d request(s) still running after %ss", self.in_flight, timeout
+            )
+        return not self.in_flight
+
+
+lifecycle = Lifecycle()
+
+
+def install_sigterm_handler() -> None:
+    """
+    Start draining as soon as SIGTERM arrives, then pass the signal on to
+    the handler already installed (uvicorn's, which stops accepting
+    connections and shuts down once the open ones are done). Signal
+    handlers can only be set from the main thread; elsewhere this is a no-op.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum: int, frame: FrameType | None) -> None:
+        lifecycle.start_draining()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.raise_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+class DrainMiddleware:
+    """
+    Counts in-flight HTTP requests and, while draining, answers new ones with
+    503 and `Connection: close` so clients retry on another instance.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if lifecycle.draining:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"connection", b"close"),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": DRAINING_BODY.encode()})
+            return
+
+        lifecycle.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lifecycle.in_flight -= 1
@@ -1,25 +1,307 @@
+import atexit
+import json
 import logging
+import queue
+import random
+import re
 import sys
+import time
+import uuid
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Any
 
-from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
+from app.core.tracing import current_span
+from app.db.instrumentation import QueryStats, current_query_stats
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        stream=sys.stdout,
+logger = logging.getLogger("app.request")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+# Correlates every log line emitted while serving a request (including from
+# threadpool sessions, which run in a copy of the request's context)
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "request_id"}
+
+_listener: QueueListener | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps records with the current request id (None outside requests), and
+    with the trace and span ids while a request is being traced.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        span = current_span.get()
+        if span is not None:
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps `rate` of the INFO-and-below records from the given high-volume
+    loggers; warnings and errors always pass. Within a request the decision
+    is derived from the request id, so a sampled request keeps all its lines.
+    """
+
+    def __init__(self, rate: float, loggers: list[str]):
+        super().__init__()
+        self.rate = rate
+        self.loggers = frozenset(loggers)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (
+            self.rate >= 1
+            or record.levelno >= logging.WARNING
+            or record.name not in self.loggers
+        ):
+            return True
+        rid = getattr(record, "request_id", None)
+        if rid:
+            point = zlib.crc32(rid.encode()) / 2**32
+        else:
+            point = random.random()
+        return point < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, request_id, any
+    `extra` fields, and the formatted traceback when there is one.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever blocking the caller.
+
+    Unlike the stock QueueHandler, records are not formatted here: the
+    message arguments are merged, but tracebacks and JSON are rendered by
+    the listener thread, off the request path. When the queue is full the
+    record is dropped and counted rather than waited on.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(
+    log_format: str | None = None,
+    level: str | None = None,
+    stream: IO[str] | None = None,
+    use_queue: bool = True,
+) -> None:
+    """
+    Configure the root logger: text or JSON lines on stdout, written by a
+    QueueListener thread so that logging never blocks a request. uvicorn's
+    loggers are routed through the same handler.
+
+    Arguments default to LOG_FORMAT / LOG_LEVEL and stdout; `use_queue=False`
+    writes from the calling thread instead (used by the logging benchmark).
+    """
+    global _listener
+    stop_logging()
+
+    formatter = (
+        JsonFormatter()
+        if (log_format or settings.LOG_FORMAT) == "json"
+        else logging.Formatter(TEXT_FORMAT)
+    )
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(formatter)
+
+    if use_queue:
+        handler: logging.Handler = LogQueueHandler(
+            queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        )
+        _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(
+        SamplingFilter(settings.LOG_SAMPLE_RATE, settings.LOG_SAMPLED_LOGGERS)
+    )
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if getattr(existing, "app_handler", False):
+            root.removeHandler(existing)
+    handler.app_handler = True
+    root.addHandler(handler)
+    root.setLevel(level or settings.LOG_LEVEL)
+
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """
+    Server-Timing value: DB time (with statement count) and total app time,
+    both up to the moment the response headers are sent.
+    """
+    return (
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.statements} queries", '
+        f"app;dur={elapsed * 1000:.1f}"
     )
 
-    # Suppress verbose logs from third-party libraries if needed
-    # logging.getLogger("multipart").setLevel(logging.WARNING)
 
+class RequestLogMiddleware:
+    """
+    Counts the SQL statements each request executes and the time spent in
+    them (via the cursor events in app.db.instrumentation).
+
+    The totals so far go out in a `Server-Timing` header with the response
+    headers; the final totals, including work done while the body streams and
+    the session commit/close, are logged once the request ends. Statement
+    shapes repeated more than N_PLUS_ONE_THRESHOLD times in one request are
+    logged as a likely N+1 query.
+
+    Every request also gets a request id (the caller's `X-Request-ID`, or a
+    new one), echoed in the response and attached to all its log records.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses
+    (exports) are neither buffered nor moved to another task.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        rid = self.request_id(scope)
+        rid_token = request_id.set(rid)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = rid
+                if settings.SERVER_TIMING_ENABLED:
+                    headers.append(
+                        "Server-Timing",
+                        server_timing(stats, time.perf_counter() - start),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self.log(scope, status_code, stats, time.perf_counter() - start)
+            request_id.reset(rid_token)
 
-async def log_request_middleware(request: Request, call_next):
-    # Simple request logging
-    # In production, this might be handled by uvicorn's access log or a reverse proxy.
-    # We add this for application-level visibility if needed, but uvicorn already logs access.
-    # So we focus on ensuring the global config is set.
+    @staticmethod
+    def request_id(scope: Scope) -> str:
+        """
+        The caller's X-Request-ID when it is a sane token, else a new one.
+        """
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(candidate):
+                    return candidate
+                break
+        return uuid.uuid4().hex
 
-    response = await call_next(request)
-    return response
+    def log(
+        self, scope: Scope, status_code: int, stats: QueryStats, elapsed: float
+    ) -> None:
+        route = scope.get("route")
+        path = getattr(route, "path", scope["path"])
+        fields = {
+            "method": scope["method"],
+            "route": path,
+            "status": status_code,
+            "duration_ms": round(elapsed * 1000, 3),
+            "db_statements": stats.statements,
+            "db_time_ms": round(stats.seconds * 1000, 3),
+        }
+        logger.info(
+            "%s %s %d %.1fms db=%d/%.1fms",
+            scope["method"],
+            path,
+            status_code,
+            fields["duration_ms"],
+            stats.statements,
+            fields["db_time_ms"],
+            extra=fields,
+        )
+        for shape, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "Possible N+1: %d similar statements in %s %s: %s",
+                count,
+                scope["method"],
+                path,
+                shape,
+                extra={**fields, "sql": shape, "repeats": count},
+            )
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Encode a keyset position (created_at, id) as an opaque URL-safe token.
+    """
+    raw = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a token produced by encode_cursor.
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_rank_cursor(rank: float, id: UUID) -> str:
+    """
+    Encode a position in relevance-ordered results (rank, id) as an opaque token.
+    """
+    raw = json.dumps([rank, str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, UUID]:
+    """
+    Decode a token produced by encode_rank_cursor.
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(rank, (int, float)):
+            raise TypeError(rank)
+        return float(rank), UUID(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
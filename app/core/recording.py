@@ -0,0 +1,232 @@
+import atexit
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import IO, Any
+from urllib.parse import parse_qsl
+
+from jose import jwt
+from jose.exceptions import JOSEError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Values of these fields (query parameters or JSON keys) are low-cardinality
+# and not personal, so they are recorded as-is; other strings become shapes.
+KEPT_FIELDS = frozenset(
+    {
+        "status",
+        "sort",
+        "format",
+        "created_after",
+        "created_before",
+        "updated_since",
+    }
+)
+# Values of these fields are secrets: even their length is not recorded.
+REDACTED_FIELDS = frozenset({"password", "access_token", "refresh_token"})
+REDACTED = "<redacted>"
+
+
+def shape(value: Any, key: str | None = None) -> Any:
+    """
+    A JSON value with its strings replaced by "<str:LENGTH>" (except under
+    KEPT_FIELDS keys) and any value under REDACTED_FIELDS keys by
+    "<redacted>". Numbers, booleans, nulls and structure are kept, so a
+    replay can send a body of the same shape and size.
+    """
+    if key in REDACTED_FIELDS:
+        return REDACTED
+    if isinstance(value, dict):
+        return {k: shape(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [shape(item, key) for item in value]
+    if isinstance(value, str) and key not in KEPT_FIELDS:
+        return f"<str:{len(value)}>"
+    return value
+
+
+def shape_query(query: dict[str, str]) -> dict[str, Any]:
+    """
+    Query parameters shaped like a JSON body, except that numeric values
+    (limits, offsets) are kept: every query value arrives as a string.
+    """
+    return {
+        key: value
+        if value.isdigit() and key not in REDACTED_FIELDS
+        else shape(value, key)
+        for key, value in query.items()
+    }
+
+
+def user_pseudonym(token: str) -> str:
+    """
+    Stable, non-reversible id for the caller: a keyed hash of the token's
+    user id (or of the token itself if it cannot be read). The signature is
+    not checked; the pseudonym only groups requests.
+    """
+    try:
+        claims = jwt.get_unverified_claims(token)
+        subject = str(claims.get("uid") or claims.get("sub") or token)
+    except JOSEError:
+        subject = token
+    digest = hmac.new(settings.SECRET_KEY.encode(), subject.encode(), hashlib.sha256)
+    return digest.hexdigest()[:16]
+
+
+class TrafficRecorder:
+    """
+    Appends one JSON line per recorded request, from a background thread.
+    Entries beyond `max_pending` waiting are dropped, never waited on.
+    """
+
+    def __init__(self, stream: IO[str], max_pending: int = 10_000):
+        self.stream = stream
+        self.dropped = 0
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(max_pending)
+        self._thread = threading.Thread(
+            target=self._run, name="traffic-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, entry: dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while (entry := self._queue.get()) is not None:
+            try:
+                self.stream.write(json.dumps(entry) + "\n")
+                self.stream.flush()
+            except (OSError, ValueError) as exc:
+                logger.warning("Traffic recording failed: %r", exc)
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
+def build_recorder() -> TrafficRecorder | None:
+    if not settings.TRAFFIC_RECORD_FILE:
+        return None
+    traffic_recorder = TrafficRecorder(
+        open(settings.TRAFFIC_RECORD_FILE, "a", encoding="utf-8")
+    )
+    atexit.register(traffic_recorder.shutdown)
+    return traffic_recorder
+
+
+recorder = build_recorder()
+
+
+class TrafficRecordMiddleware:
+    """
+    Records a sanitized line per request for benchmarks/replay.py: method,
+    route template, query and JSON body shapes (see `shape`), a user
+    pseudonym, status, start time and duration. Unmatched routes are not
+    recorded. A no-op unless TRAFFIC_RECORD_FILE is set.
+
+    Only the first TRAFFIC_RECORD_MAX_BODY_BYTES of a body are kept, and
+    only while it is read, so streamed uploads are not buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or recorder is None
+            or random.random() >= settings.TRAFFIC_RECORD_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.TRAFFIC_RECORD_MAX_BODY_BYTES
+        chunks: list[bytes] = []
+        body_bytes = 0
+        status_code = 500
+
+        async def receive_recording() -> Message:
+            nonlocal body_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                if body_bytes + len(body) <= limit:
+                    chunks.append(body)
+                body_bytes += len(body)
+            return message
+
+        async def send_recording(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_recording, send_recording)
+        finally:
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                recorder.record(
+                    self.entry(
+                        scope,
+                        route,
+                        b"".join(chunks) if body_bytes <= limit else None,
+                        body_bytes,
+                        status_code,
+                        started_at,
+                        time.perf_counter() - start,
+                    )
+                )
+
+    @staticmethod
+    def entry(
+        scope: Scope,
+        route: str,
+        body: bytes | None,
+        body_bytes: int,
+        status_code: int,
+        started_at: float,
+        elapsed: float,
+    ) -> dict[str, Any]:
+        headers = dict(scope["headers"])
+        query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+
+        body_shape = None
+        if body and content_type.startswith("application/json"):
+            try:
+                body_shape = shape(json.loads(body))
+            except ValueError:
+                pass
+
+        user = None
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            user = user_pseudonym(token)
+
+        return {
+            "ts": round(started_at, 6),
+            "method": scope["method"],
+            "route": route,
+            "query": shape_query(query),
+            "content_type": content_type or None,
+            "body": body_shape,
+            "body_bytes": body_bytes,
+            "user": user,
+            "status": status_code,
+            "duration_ms": round(elapsed * 1000, 3),
+        }
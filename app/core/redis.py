@@ -0,0 +1,125 @@
+import asyncio
+from typing import Any
+from urllib.parse import urlsplit
+
+
+class RedisError(Exception):
+    """
+    Error reply from the server, or a reply that could not be parsed.
+    """
+
+
+class RedisClient:
+    """
+    Minimal asyncio client for the Redis protocol (RESP2).
+
+    Only what the response cache needs: one command per round trip over a
+    small set of reused connections. Connections are bound to the event loop
+    that opened them, and are dropped after any error.
+    """
+
+    def __init__(self, url: str, max_idle: int = 8, timeout: float = 0.5):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.StreamReader, asyncio.StreamWriter]
+        ] = []
+
+    async def execute(self, *args: Any) -> Any:
+        reader, writer = await self._acquire()
+        try:
+            writer.write(encode_command(args))
+            await writer.drain()
+            reply = await asyncio.wait_for(read_reply(reader), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        self._release(reader, writer)
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, _, writer in idle:
+            writer.close()
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            conn_loop, reader, writer = self._idle.pop()
+            if conn_loop is loop and not writer.is_closing():
+                return reader, writer
+            if conn_loop is loop:
+                writer.close()
+
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        try:
+            setup = []
+            if self.password:
+                setup.append(("AUTH", self.password))
+            if self.db:
+                setup.append(("SELECT", self.db))
+            for command in setup:
+                writer.write(encode_command(command))
+                await writer.drain()
+                reply = await asyncio.wait_for(read_reply(reader), self.timeout)
+                if isinstance(reply, RedisError):
+                    raise reply
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    def _release(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if len(self._idle) < self.max_idle:
+            self._idle.append((asyncio.get_running_loop(), reader, writer))
+        else:
+            writer.close()
+
+
+def encode_command(args: tuple[Any, ...]) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one reply. Error replies are returned (not raised) so the connection
+    can still be reused.
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionResetError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        return RedisError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply: {line!r}")
@@ -0,0 +1,58 @@
+import re
+
+from sqlalchemy import Float, case, cast, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.models.task import Task
+
+# Generated column and indexes created by migration 7a4e9b2c1d58. They are
+# PostgreSQL-only, so they are not declared on the Task model (which must
+# also create_all on SQLite); Alembic autogenerate is told to ignore them.
+SEARCH_VECTOR = literal_column("tasks.search_vector", TSVECTOR)
+SEARCH_SCHEMA_OBJECTS = {
+    "search_vector",
+    "idx_tasks_search_vector",
+    "idx_tasks_title_trgm",
+}
+
+SEARCH_TEXT_CONFIG = "simple"
+
+
+def search_terms(q: str) -> list[str]:
+    """
+    Words of a search query, lowercased. Punctuation (and so any tsquery
+    operator syntax) is dropped.
+    """
+    return re.findall(r"\w+", q.lower())
+
+
+def search_clauses(dialect_name: str, q: str):
+    """
+    (rank, match) SQL expressions for a search query.
+
+    On PostgreSQL a task matches when its search_vector contains every term
+    as a word prefix, or when the query is trigram-similar to a word of the
+    title (typo tolerance). The rank is the better of the normalized text
+    rank (title weighted above description) and the trigram word similarity.
+    Other databases fall back to a case-insensitive substring match.
+    """
+    if dialect_name == "postgresql":
+        fuzzy_match = Task.title.op("%>")(q)
+        fuzzy_rank = func.word_similarity(q, Task.title)
+        terms = search_terms(q)
+        if not terms:
+            return cast(fuzzy_rank, Float), fuzzy_match
+        tsquery = func.to_tsquery(
+            SEARCH_TEXT_CONFIG, " & ".join(f"{term}:*" for term in terms)
+        )
+        # Normalization 32 maps the rank into [0, 1), comparable to similarity
+        text_rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery, 32)
+        rank = func.greatest(text_rank, fuzzy_rank)
+        # Double precision so the rank round-trips exactly through the cursor
+        return cast(rank, Float), or_(SEARCH_VECTOR.op("@@")(tsquery), fuzzy_match)
+
+    pattern = "%" + re.sub(r"([\\%_])", r"\\\1", q) + "%"
+    title_match = Task.title.ilike(pattern, escape="\\")
+    description_match = Task.description.ilike(pattern, escape="\\")
+    rank = case((title_match, 1.0), else_=0.5)
+    return cast(rank, Float), or_(title_match, description_match)
@@ -1,10 +1,35 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from typing import Any, Callable, TypeVar, Union
+from uuid import UUID
 
 import bcrypt
 from jose import jwt
 
 from app.core.config import settings
+from app.core.metrics import registry
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Lowest cost calibration may choose, whatever the hardware
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+# Work factor for new hashes; replaced at startup when calibration is enabled
+bcrypt_rounds: int = settings.BCRYPT_ROUNDS
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,25 +42,183 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: int | None = None) -> str:
     """
     Hash a password using bcrypt.
+    `rounds` defaults to the current work factor; pool workers receive it
+    explicitly since they do not share this process's calibrated value.
     """
     # bcrypt.hashpw requires bytes and returns bytes
     pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or bcrypt_rounds)
     hashed = bcrypt.hashpw(pwd_bytes, salt)
     return hashed.decode("utf-8")
 
 
-def create_access_token(subject: Union[str, Any]) -> str:
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Whether a stored hash was made with a different cost than the current one.
+    """
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2]) != bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> int:
+    """
+    Pick the bcrypt cost whose hash time on this machine is closest to
+    `target_ms`, make it the work factor for new hashes and return it.
+    """
+    global bcrypt_rounds
+    salt = bcrypt.gensalt(rounds=BCRYPT_MIN_ROUNDS)
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", salt)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # Each extra round doubles the cost
+    extra = round(math.log2(max(target_ms, 1) / max(elapsed_ms, 1e-3)))
+    bcrypt_rounds = max(
+        BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, BCRYPT_MIN_ROUNDS + extra)
+    )
+    logger.info(
+        "bcrypt calibrated to %d rounds (target %.0fms, %.1fms at %d rounds)",
+        bcrypt_rounds,
+        target_ms,
+        elapsed_ms,
+        BCRYPT_MIN_ROUNDS,
+    )
+    return bcrypt_rounds
+
+
+class PasswordHasherBusyError(Exception):
+    """
+    Raised when the password hashing queue is full.
+    """
+
+
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify time on the hashing pool, including queueing.",
+    ("operation",),
+)
+password_hash_rejections = registry.counter(
+    "password_hash_rejections_total",
+    "Hashing requests refused because the pool queue was full (503).",
+)
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt on a bounded executor, off the event loop.
+
+    At most `workers` hashes run at once and at most `max_pending` more may
+    wait for a slot; beyond that calls fail fast with PasswordHasherBusyError
+    so a login burst cannot starve the rest of the API. With `use_processes`
+    the work runs in separate processes and never competes with request
+    handling for the worker's CPU time.
+    """
+
+    def __init__(self, workers: int, max_pending: int, use_processes: bool = True):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self.in_flight = 0
+        self._executor: Executor | None = None
+        # Slots are released from executor callbacks, off the event loop
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never starts processes
+        if self._executor is None:
+            if self.use_processes:
+                # spawn: forking a multi-threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run `fn(*args)` on the executor. The slot is held until the job
+        itself is done: a cancelled caller (client gone) does not stop a
+        hash that already started, so it must keep counting against the cap.
+        """
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_pending:
+                password_hash_rejections.inc()
+                raise PasswordHasherBusyError()
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        def release(done: Future) -> None:
+            self._release()
+            password_hash_duration.observe(
+                time.perf_counter() - start, operation=fn.__name__
+            )
+
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_EXECUTOR == "process",
+)
+
+registry.gauge(
+    "password_hash_in_flight",
+    "Hashes running or queued on the hashing pool.",
+    collect=lambda: [((), password_hasher.in_flight)],
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password on the bounded password hashing pool.
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash on the bounded password hashing pool.
+    """
+    return await password_hasher.run(get_password_hash, password, bcrypt_rounds)
+
+
+def create_access_token(subject: Union[str, Any], user_id: UUID | None = None) -> str:
     """
     Create a JWT access token.
+    `user_id` is carried in the `uid` claim so the user can be loaded by primary key.
     """
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
     to_encode = {"exp": expire, "sub": str(subject), "iat": datetime.now(timezone.utc)}
+    if user_id is not None:
+        to_encode["uid"] = str(user_id)
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -0,0 +1,110 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator
+
+from pydantic import ValidationError
+
+from app.core.export import TaskFileFormat
+from app.schemas.task import TaskCreate
+
+# Longest line (or quoted CSV record) accepted; bounds memory per record
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+
+# Assigned by the server; dropped so an export can be imported as-is
+SERVER_FIELDS = {"id", "owner_id", "created_at", "updated_at"}
+
+
+class ImportFormatError(ValueError):
+    """
+    The upload cannot be parsed any further (e.g. a line exceeds the limit).
+    """
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """
+    Decode a UTF-8 byte stream into (line number, line) pairs, holding at most
+    one partial line in memory. A leading BOM and trailing CR are dropped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            number += 1
+            yield number, line.removesuffix("\r")
+        if len(pending) > IMPORT_MAX_LINE_BYTES:
+            raise ImportFormatError(f"Line {number + 1} is too long")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield number + 1, pending.removesuffix("\r")
+
+
+async def iter_records(
+    lines: AsyncIterator[tuple[int, str]], format: TaskFileFormat
+) -> AsyncIterator[tuple[int, dict[str, Any] | None]]:
+    """
+    Parse lines into (line number, record) pairs; the record is None when the
+    line is not valid NDJSON. Blank lines are skipped. CSV records may span
+    several lines inside quoted fields, and need a header row.
+    """
+    if format == "ndjson":
+        async for number, line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, None
+                continue
+            yield number, record if isinstance(record, dict) else None
+        return
+
+    header: list[str] | None = None
+    start, parts = 0, []
+    async for number, line in lines:
+        if not parts:
+            start = number
+            if not line.strip():
+                continue
+        parts.append(line)
+        text = "\n".join(parts)
+        # RFC 4180 escapes quotes by doubling, so an odd count means an open field
+        if text.count('"') % 2:
+            if len(text) > IMPORT_MAX_LINE_BYTES:
+                raise ImportFormatError(f"Record at line {start} is too long")
+            continue
+        parts = []
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        record = dict(zip(header, values))
+        if len(values) != len(header):
+            record = None
+        yield start, _from_csv(record)
+    if parts:
+        yield start, None
+
+
+def _from_csv(record: dict[str, str] | None) -> dict[str, Any] | None:
+    # Empty cells mean "not provided" (no description, default status)
+    if record is None:
+        return None
+    return {key: value for key, value in record.items() if value != ""}
+
+
+def validate_record(record: dict[str, Any] | None) -> TaskCreate | list[dict]:
+    """
+    Validate a parsed record against TaskCreate. Returns the task, or the
+    list of validation errors.
+    """
+    if record is None:
+        return [{"loc": [], "msg": "Malformed record", "type": "record_invalid"}]
+    fields = {key: value for key, value in record.items() if key not in SERVER_FIELDS}
+    try:
+        return TaskCreate.model_validate(fields)
+    except ValidationError as exc:
+        return exc.errors(include_url=False, include_input=False, include_context=False)
@@ -0,0 +1,342 @@
+import atexit
+import functools
+import inspect
+import json
+import logging
+import queue
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Iterator
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "task-manager-api"
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a trace. Unsampled spans still carry the trace
+    context (so it can be propagated and logged) but record nothing.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    kind: int = SPAN_KIND_INTERNAL
+    sampled: bool = True
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    error: str | None = None
+    # Finished spans of the whole trace, shared by every span in it
+    finished: list["Span"] = field(default_factory=list, repr=False)
+
+    def child(self, name: str, kind: int, attributes: dict[str, Any]) -> "Span":
+        return Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=self.span_id,
+            kind=kind,
+            attributes=attributes,
+            finished=self.finished,
+        )
+
+    def end(self, end_ns: int | None = None) -> None:
+        self.end_ns = end_ns or time.time_ns()
+        self.finished.append(self)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """
+    (trace id, parent span id, sampled) from a W3C traceparent header, or
+    None when it is missing or malformed.
+    """
+    if not header:
+        return None
+    match = _TRACEPARENT.fullmatch(header.strip().lower())
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or parent_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def start_span(
+    name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any
+) -> Span | None:
+    """
+    Start a child of the current span without making it current (for
+    leaf operations such as SQL statements); call `end()` on it. Returns
+    None outside a sampled trace.
+    """
+    parent = current_span.get()
+    if parent is None or not parent.sampled:
+        return None
+    return parent.child(name, kind, attributes)
+
+
+@contextmanager
+def span(
+    name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any
+) -> Iterator[Span | None]:
+    """
+    Record the enclosed block as a child of the current span, and make it
+    the current span meanwhile. A no-op outside a sampled trace.
+    """
+    child = start_span(name, kind, **attributes)
+    if child is None:
+        yield None
+        return
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = repr(exc)
+        raise
+    finally:
+        current_span.reset(token)
+        child.end()
+
+
+def _attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def otlp_json(spans: list[Span]) -> dict[str, Any]:
+    """
+    Spans as an OTLP/JSON ExportTraceServiceRequest (ids in hex, times as
+    nanosecond strings), the format the OpenTelemetry Collector's file
+    receiver and OTLP/HTTP endpoints accept.
+    """
+    encoded = []
+    for s in spans:
+        entry: dict[str, Any] = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": s.kind,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [_attribute(k, v) for k, v in s.attributes.items()],
+        }
+        if s.parent_id:
+            entry["parentSpanId"] = s.parent_id
+        if s.error:
+            entry["status"] = {"code": 2, "message": s.error}
+        encoded.append(entry)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "app"}, "spans": encoded}],
+            }
+        ]
+    }
+
+
+class SpanExporter:
+    """
+    Writes each finished trace as one OTLP/JSON line, from a background
+    thread. Traces beyond `max_pending` waiting are dropped, never waited on.
+    """
+
+    def __init__(self, stream: IO[str], max_pending: int = 1000):
+        self.stream = stream
+        self.dropped = 0
+        self._queue: queue.Queue[list[Span] | None] = queue.Queue(max_pending)
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, spans: list[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while (spans := self._queue.get()) is not None:
+            try:
+                self.stream.write(json.dumps(otlp_json(spans)) + "\n")
+                self.stream.flush()
+            except (OSError, ValueError) as exc:
+                logger.warning("Span export failed: %r", exc)
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
+def build_exporter() -> SpanExporter | None:
+    if settings.TRACE_EXPORTER == "none":
+        return None
+    if settings.TRACE_EXPORTER == "stdout":
+        span_exporter = SpanExporter(sys.stdout)
+    else:
+        span_exporter = SpanExporter(open(settings.TRACE_FILE, "a", encoding="utf-8"))
+    # Flush queued traces on interpreter exit
+    atexit.register(span_exporter.shutdown)
+    return span_exporter
+
+
+exporter = build_exporter()
+
+
+def _handler_ended(span_: Span | None) -> None:
+    if span_ is not None:
+        span_.attributes.setdefault("app.handler_end_ns", time.time_ns())
+
+
+def traced_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a route endpoint in a "handler" span. functools.wraps keeps the
+    original signature visible to FastAPI's dependency resolution.
+    """
+    # include_router re-creates each route from the already wrapped endpoint
+    if getattr(endpoint, "traced", False):
+        return endpoint
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span("handler"):
+                result = await endpoint(*args, **kwargs)
+            _handler_ended(current_span.get())
+            return result
+
+        async_wrapper.traced = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Sync endpoints run in the threadpool, in a copy of the request context
+        with span("handler"):
+            result = endpoint(*args, **kwargs)
+        _handler_ended(current_span.get())
+        return result
+
+    wrapper.traced = True
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute whose endpoint runs inside a "handler" span; what FastAPI does
+    between the endpoint returning and the response starting (validation,
+    serialization) is recorded by the middleware as a "render" span.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, traced_endpoint(endpoint), **kwargs)
+
+
+class TracingMiddleware:
+    """
+    Opens the server span of each request: continues the caller's W3C
+    `traceparent` (honouring its sampled flag) or starts a new trace sampled
+    at TRACE_SAMPLE_RATE. The trace is exported when the request ends and
+    its id is returned in a `traceresponse` header. A no-op unless
+    TRACE_EXPORTER is set.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        header = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                header = value.decode("latin-1")
+                break
+        parent = parse_traceparent(header)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = random.random() < settings.TRACE_SAMPLE_RATE
+        root = Span(
+            name=scope["method"],
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent_id,
+            kind=SPAN_KIND_SERVER,
+            sampled=sampled,
+            attributes={"http.request.method": scope["method"]},
+        )
+        status_code = 500
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                handler_end = root.attributes.pop("app.handler_end_ns", None)
+                if sampled and handler_end is not None:
+                    render = root.child("render", SPAN_KIND_INTERNAL, {})
+                    render.start_ns = handler_end
+                    render.end()
+                MutableHeaders(scope=message)["traceresponse"] = root.traceparent
+            await send(message)
+
+        token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_context)
+        except BaseException as exc:
+            root.error = repr(exc)
+            raise
+        finally:
+            current_span.reset(token)
+            if sampled:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    root.name = f"{scope['method']} {route}"
+                    root.attributes["http.route"] = route
+                root.attributes["http.response.status_code"] = status_code
+                root.end()
+                exporter.export(root.finished)
@@ -0,0 +1,79 @@
+import enum
+import io
+from typing import Any
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+
+
+def copy_rows(session: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    """
+    Bulk-load rows into a table inside the session's transaction.
+
+    On PostgreSQL this is COPY FROM STDIN (psycopg2) or the binary COPY protocol
+    (asyncpg, via run_sync); elsewhere it falls back to an executemany INSERT.
+    Every row must have the same keys. No ORM events or Python-side column
+    defaults are applied on the COPY path, so callers supply those values.
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        session.execute(insert(table), rows)
+        return
+
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.dialect.driver == "asyncpg":
+        records = [
+            tuple(_copy_value(row[column]) for column in columns) for row in rows
+        ]
+
+        async def copy(conn) -> None:
+            # The raw asyncpg connection bypasses SQLAlchemy's adapter, which
+            # only BEGINs when a statement goes through it: open the
+            # transaction first (as the adapter's cursor does), or a COPY
+            # that is the request's first statement would autocommit.
+            if not dbapi_connection._started:
+                await dbapi_connection._start_transaction()
+            await conn.copy_records_to_table(
+                table.name, records=records, columns=columns, schema_name=table.schema
+            )
+
+        dbapi_connection.run_async(copy)
+        return
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    quoted_table = connection.dialect.identifier_preparer.format_table(table)
+    quoted_columns = ", ".join(
+        connection.dialect.identifier_preparer.quote(column) for column in columns
+    )
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {quoted_table} ({quoted_columns}) FROM STDIN", buffer)
+
+
+def _copy_value(value: Any) -> Any:
+    # SQLAlchemy's Enum type stores member names; COPY bypasses its bind processing
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def _copy_text(value: Any) -> str:
+    """
+    Encode one value for COPY's text format.
+    """
+    value = _copy_value(value)
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
@@ -0,0 +1,78 @@
+import uuid
+from collections import Counter
+from typing import Any, Mapping
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus
+from app.models.task_counter import TaskCounter
+
+StatusDeltas = Mapping[TaskStatus, int]
+
+
+def status_deltas(statuses: Any, sign: int = 1) -> Counter[TaskStatus]:
+    """
+    Counter deltas for tasks with these statuses being created (sign=1) or
+    deleted (sign=-1).
+    """
+    deltas: Counter[TaskStatus] = Counter()
+    for status in statuses:
+        deltas[status] += sign
+    return deltas
+
+
+def status_change_deltas(changes: Any) -> Counter[TaskStatus]:
+    """
+    Counter deltas for (previous status, new status) pairs of updated tasks.
+    """
+    deltas: Counter[TaskStatus] = Counter()
+    for previous, current in changes:
+        if previous != current:
+            deltas[previous] -= 1
+            deltas[current] += 1
+    return deltas
+
+
+async def apply_status_deltas(
+    db: Any, owner_id: uuid.UUID, deltas: StatusDeltas
+) -> None:
+    """
+    Add deltas to the owner's counters with one upsert. Must run in the same
+    transaction as the task write it accounts for.
+
+    Rows are written in status order, so concurrent transactions touching
+    several of an owner's counters lock them in the same order.
+    """
+    rows = [
+        {"owner_id": owner_id, "status": status, "count": delta}
+        for status, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    upsert = (postgresql if dialect == "postgresql" else sqlite).insert(TaskCounter)
+    await db.execute(
+        upsert.values(rows).on_conflict_do_update(
+            index_elements=[TaskCounter.owner_id, TaskCounter.status],
+            set_={"count": TaskCounter.count + upsert.excluded.count},
+        )
+    )
+
+
+def rebuild_task_counters(session: Session) -> None:
+    """
+    Recompute every counter from the tasks table, for data written without
+    going through the routes (seeding, manual fixes).
+    """
+    session.execute(delete(TaskCounter))
+    session.execute(
+        insert(TaskCounter).from_select(
+            ["owner_id", "status", "count"],
+            select(Task.owner_id, Task.status, func.count()).group_by(
+                Task.owner_id, Task.status
+            ),
+        )
+    )
@@ -0,0 +1,30 @@
+from typing import Any
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class utcnow(FunctionElement):
+    """
+    Current timestamp for server-side defaults.
+
+    Renders as now() on PostgreSQL. SQLite's CURRENT_TIMESTAMP only has second
+    precision and a different text layout from the values SQLAlchemy writes,
+    so equality and range comparisons against bound datetimes (keyset cursors,
+    ETag versions) would silently fail; there it renders a microsecond
+    timestamp in SQLAlchemy's own storage format instead.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element: utcnow, compiler: Any, **kw: Any) -> str:
+    return "now()"
+
+
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element: utcnow, compiler: Any, **kw: Any) -> str:
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
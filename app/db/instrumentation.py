@@ -0,0 +1,117 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.tracing import SPAN_KIND_CLIENT, start_span
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """
+    The shape of a statement: literals and bind placeholders become `?`,
+    lists of them (expanded IN, VALUES rows) collapse to one, and whitespace
+    is folded. Statements differing only in their values share a shape.
+    """
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _LIST.sub("?", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL executed on behalf of one request.
+    """
+
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Statement shapes executed more than `threshold` times (likely N+1).
+        """
+        return [(shape, n) for shape, n in self.shapes.items() if n > threshold]
+
+
+# Set by the request middleware. Worker threads (ThreadedSession) run in a
+# copy of the request's context, so they update the same QueryStats object.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started_at"] = time.perf_counter()
+    conn.info["query_span"] = start_span(
+        statement.split(None, 1)[0].upper(),
+        SPAN_KIND_CLIENT,
+        **{"db.system": conn.dialect.name},
+    )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn, cursor, statement: str, parameters: Any, context, executemany: bool
+):
+    started_at = conn.info.pop("query_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    query_span = conn.info.pop("query_span", None)
+    if query_span is not None:
+        query_span.attributes["db.statement"] = normalize_sql(statement)
+        query_span.end()
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+        stats.shapes[normalize_sql(statement)] += 1
+
+    elapsed_ms = elapsed * 1000
+    if (
+        elapsed_ms >= settings.SLOW_QUERY_MS
+        and random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+    ):
+        shape = normalize_sql(statement)
+        logger.warning(
+            "Slow query (%.1fms): %s",
+            elapsed_ms,
+            shape,
+            extra={"duration_ms": round(elapsed_ms, 3), "sql": shape},
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    connection = context.connection
+    if connection is None:
+        return
+    connection.info.pop("query_started_at", None)
+    query_span = connection.info.pop("query_span", None)
+    if query_span is not None:
+        query_span.attributes["db.statement"] = normalize_sql(context.statement or "")
+        query_span.error = repr(context.original_exception)
+        query_span.end()
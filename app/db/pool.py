@@ -0,0 +1,97 @@
+import time
+from typing import Callable
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import registry
+
+# Engines whose pools are exported to /metrics, by the name used as their
+# `pool` label. The pool is looked up at scrape time: dispose() replaces it.
+engines: dict[str, Engine] = {}
+
+
+def _pool_values(read: Callable[[Pool], float]) -> list[tuple[tuple[str], float]]:
+    return [((name,), read(engine.pool)) for name, engine in list(engines.items())]
+
+
+registry.gauge(
+    "db_pool_size",
+    "Configured number of persistent connections (DB_POOL_SIZE).",
+    ("pool",),
+    collect=lambda: _pool_values(lambda pool: pool.size()),
+)
+registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ("pool",),
+    collect=lambda: _pool_values(lambda pool: pool.checkedout()),
+)
+registry.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool fills).",
+    ("pool",),
+    collect=lambda: _pool_values(lambda pool: pool.overflow()),
+)
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool.", ("pool",)
+)
+pool_connects = registry.counter(
+    "db_pool_connections_created_total", "New DBAPI connections opened.", ("pool",)
+)
+pool_invalidations = registry.counter(
+    "db_pool_invalidations_total",
+    "Connections invalidated (e.g. failed pre-ping).",
+    ("pool",),
+)
+pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection, including opening overflow ones.",
+    ("pool",),
+)
+
+
+class _TimedCheckout:
+    """
+    Times each checkout. Pool events only fire once a connection has been
+    handed out, so the wait is measured around the queue get instead.
+    """
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(
+                time.perf_counter() - start, pool=self.metrics_name
+            )
+
+    def recreate(self):
+        # Engine.dispose() swaps in a recreated pool; keep its label
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Export the engine's pool under the given label: size and usage gauges
+    read at scrape time, plus checkout, connect and invalidation counts from
+    pool events. Both follow the pool across Engine.dispose(), which carries
+    the event listeners over to the recreated pool.
+    """
+    engine.pool.metrics_name = name
+    engines[name] = engine
+    event.listen(engine, "checkout", lambda *args: pool_checkouts.inc(pool=name))
+    event.listen(engine, "connect", lambda *args: pool_connects.inc(pool=name))
+    event.listen(engine, "invalidate", lambda *args: pool_invalidations.inc(pool=name))
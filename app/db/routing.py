@@ -0,0 +1,102 @@
+import math
+import time
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db import session
+
+# A client that wrote recently carries the time (Unix milliseconds) until
+# which its reads must go to the primary, as a cookie or, for clients that do
+# not keep cookies, by echoing the response header back as a request header.
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _now_millis() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def pinned_until(request: Request) -> int:
+    """
+    The client's read-your-writes deadline in Unix milliseconds (0 if none).
+    """
+    value = request.cookies.get(READ_PRIMARY_COOKIE) or request.headers.get(
+        READ_PRIMARY_HEADER
+    )
+    if value is None or not value.isdigit():
+        return 0
+    return int(value)
+
+
+def use_replica(request: Request) -> bool:
+    """
+    Whether this request's session can be bound to a read replica: replicas
+    are configured, the method does not write, and the client has not
+    written within the read-your-writes window.
+    """
+    if not session.replica_engines or request.method not in READ_METHODS:
+        return False
+    return pinned_until(request) <= _now_millis()
+
+
+def replica_staleness(request: Request) -> float:
+    """
+    How far behind the primary this request's data may be, in seconds.
+    Responses read from a replica must not be cached under an owner version
+    younger than this: the replica may not have replayed the write yet.
+    """
+    if getattr(request.state, "db_replica", False):
+        return settings.READ_YOUR_WRITES_SECONDS
+    return 0.0
+
+
+def _pin_cookie(value: str) -> str:
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[READ_PRIMARY_COOKIE] = value
+    morsel = cookie[READ_PRIMARY_COOKIE]
+    morsel["max-age"] = math.ceil(settings.READ_YOUR_WRITES_SECONDS)
+    morsel["path"] = "/"
+    morsel["httponly"] = True
+    morsel["samesite"] = "lax"
+    return morsel.OutputString()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a client to the primary for READ_YOUR_WRITES_SECONDS after any
+    successful non-GET request, so its next reads see its own writes even
+    when the replicas lag. A no-op unless replicas are configured.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses (exports)
+    pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in READ_METHODS
+            or not session.replica_engines
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = str(
+                    _now_millis() + int(settings.READ_YOUR_WRITES_SECONDS * 1000)
+                )
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", _pin_cookie(until))
+                headers[READ_PRIMARY_HEADER] = until
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
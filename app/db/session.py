@@ -1,10 +1,20 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from functools import partial
+from itertools import count
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+import anyio
+from sqlalchemy import URL, Engine, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine
+
+T = TypeVar("T")
 
 # Shared engine configuration
 engine_params = {
+    "poolclass": TimedQueuePool,
     "pool_size": settings.DB_POOL_SIZE,
     "max_overflow": settings.DB_MAX_OVERFLOW,
     "pool_pre_ping": True,
@@ -15,6 +25,7 @@ engine_params = {
 # The engine manages the connection pool to the database
 # connect_args={"sslmode": "require"} enforces SSL for Supabase/Cloud Run
 engine = create_engine(str(settings.DATABASE_URL), **engine_params)
+instrument_engine(engine, "primary")
 
 # Create a configured "Session" class
 # This factory will be used to create new Session objects for each request
@@ -23,12 +34,232 @@ engine = create_engine(str(settings.DATABASE_URL), **engine_params)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_async_url(url: str) -> URL:
+    """
+    Derives the async driver URL from a sync connection string.
+    postgresql:// maps to asyncpg and sqlite:// to aiosqlite. The libpq-only
+    sslmode query parameter is dropped; SSL is passed through connect_args instead.
+    """
+    sync_url = make_url(url)
+    drivername = {
+        "postgresql": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+    }.get(sync_url.get_backend_name(), sync_url.drivername)
+    async_url = sync_url.set(drivername=drivername).difference_update_query(["sslmode"])
+    if async_url.get_backend_name() == "postgresql":
+        async_url = async_url.update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    settings.DB_ASYNC_STATEMENT_CACHE_SIZE
+                )
+            }
+        )
+    return async_url
+
+
+# Async engine configuration; connect_args depend on the driver (see below)
+async_engine_params = {
+    **{key: value for key, value in engine_params.items() if key != "connect_args"},
+    "poolclass": TimedAsyncAdaptedQueuePool,
+}
+
+
+def async_connect_args(async_url: URL) -> dict[str, Any]:
+    """
+    Driver options for a URL from get_async_url: asyncpg takes "ssl" instead
+    of libpq's "sslmode", and its own statement cache size. aiosqlite
+    accepts neither.
+    """
+    if async_url.get_backend_name() == "postgresql":
+        return {
+            "ssl": settings.SSL_MODE,
+            "statement_cache_size": settings.DB_ASYNC_STATEMENT_CACHE_SIZE,
+        }
+    return {}
+
+
+def create_async_engine_from(url: str, **kwargs: Any) -> AsyncEngine:
+    """
+    AsyncEngine for a sync connection string, with the shared pool settings.
+    """
+    async_url = get_async_url(url)
+    return create_async_engine(
+        async_url,
+        **async_engine_params,
+        connect_args=async_connect_args(async_url),
+        **kwargs,
+    )
+
+
+# The async engine is only built when DB_ASYNC is enabled, so the sync-only
+# tooling (Alembic, scripts) never needs an async driver installed.
+# expire_on_commit=False: attributes stay readable after commit without
+# triggering implicit IO, which AsyncSession cannot do.
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker | None = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine_from(str(settings.DATABASE_URL))
+    instrument_engine(async_engine.sync_engine, "primary_async")
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+def replica_execution_options(url: str) -> dict[str, Any]:
+    """
+    Engine options for a read replica: on PostgreSQL every transaction is
+    started READ ONLY, so a write routed there by mistake fails loudly.
+    """
+    if make_url(url).get_backend_name() == "postgresql":
+        return {"postgresql_readonly": True}
+    return {}
+
+
+# Read replicas, used by get_db for GET/HEAD requests (see app.db.routing)
+replica_engines: list[Engine] = [
+    create_engine(
+        url, **engine_params, execution_options=replica_execution_options(url)
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+async_replica_engines: list[AsyncEngine] = []
+if settings.DB_ASYNC:
+    async_replica_engines = [
+        create_async_engine_from(url, execution_options=replica_execution_options(url))
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+for i, replica in enumerate(replica_engines):
+    instrument_engine(replica, f"replica{i}")
+for i, replica in enumerate(async_replica_engines):
+    instrument_engine(replica.sync_engine, f"replica{i}_async")
+
+_replica_turns = count()
+
+
+def pick_replica(engines: list[T]) -> T:
+    """
+    Round-robin over the configured replicas.
+    """
+    return engines[next(_replica_turns) % len(engines)]
+
+
+class ThreadedResult:
+    """
+    Awaitable facade over a streaming sync Result (see ThreadedSession.stream).
+    """
+
+    def __init__(self, result: Any, run: Callable[..., Any]):
+        self.result = result
+        self._run = run
+
+    async def partitions(self, size: int | None = None) -> AsyncIterator[Any]:
+        while partition := await self._run(self.result.fetchmany, size):
+            yield partition
+
+    async def close(self) -> None:
+        await self._run(self.result.close)
+
+
+class ThreadedSession:
+    """
+    Awaitable facade over a sync Session.
+
+    Mirrors the subset of the AsyncSession API used by the routes, running each
+    blocking call in the threadpool. This lets handlers be written once as
+    ``async def`` and served by either the sync or the async engine.
+    """
+
+    def __init__(self, sync_session: Session):
+        self.sync_session = sync_session
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await anyio.to_thread.run_sync(partial(fn, *args, **kwargs))
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance: Any) -> None:
+        self.sync_session.expunge(instance)
+
+    def get_bind(self) -> Any:
+        return self.sync_session.get_bind()
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def stream(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Same contract as AsyncSession.stream: rows come from a server-side
+        cursor and are fetched in partitions rather than buffered up front.
+        """
+        result = await self._run(
+            self.sync_session.execute,
+            statement.execution_options(stream_results=True),
+            *args,
+            **kwargs,
+        )
+        return ThreadedResult(result, self._run)
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        await self._run(self.sync_session.delete, instance)
+
+    async def refresh(self, instance: Any, *args: Any, **kwargs: Any) -> None:
+        await self._run(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def flush(self) -> None:
+        await self._run(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await self._run(self.sync_session.close)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Same contract as AsyncSession.run_sync: fn receives the sync Session.
+        """
+        return await self._run(fn, self.sync_session, *args, **kwargs)
+
+
 def set_custom_db_url(url: str) -> None:
     """
     Reconfigures the database engine and session maker with a custom URL.
     Useful for scripts requiring localhost connection instead of service names.
     """
-    global engine
+    global engine, async_engine
     engine.dispose()
     engine = create_engine(url, **engine_params)
+    instrument_engine(engine, "primary")
     SessionLocal.configure(bind=engine)
+    if AsyncSessionLocal is not None:
+        async_engine = create_async_engine_from(url)
+        instrument_engine(async_engine.sync_engine, "primary_async")
+        AsyncSessionLocal.configure(bind=async_engine)
+
+
+async def dispose_engines() -> None:
+    """
+    Close the pooled connections of every engine (primary, replicas, async),
+    so the database sees clean disconnects at shutdown.
+    """
+    for pooled in [engine, *replica_engines]:
+        pooled.dispose()
+    for pooled_async in [async_engine, *async_replica_engines]:
+        if pooled_async is not None:
+            await pooled_async.dispose()
@@ -0,0 +1,119 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import anyio
+from sqlalchemy import Connection, Engine, Executable
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import session
+
+logger = logging.getLogger(__name__)
+
+
+def warm_pool(engine: Engine, size: int) -> int:
+    """
+    Open `size` connections at once and return them to the pool idle, so the
+    first requests do not pay for TCP, TLS and authentication. Returns how
+    many were opened; the first connection error is raised after the others
+    have been returned.
+    """
+    with ThreadPoolExecutor(max_workers=size) as executor:
+        futures = [executor.submit(engine.connect) for _ in range(size)]
+    connections: list[Connection] = []
+    errors: list[BaseException] = []
+    for future in futures:
+        if (error := future.exception()) is not None:
+            errors.append(error)
+        else:
+            connections.append(future.result())
+    for connection in connections:
+        connection.close()
+    if errors:
+        raise errors[0]
+    return len(connections)
+
+
+async def warm_async_pool(engine: AsyncEngine, size: int) -> int:
+    """
+    warm_pool for an AsyncEngine.
+    """
+    connections: list[AsyncConnection] = []
+
+    async def connect() -> None:
+        connections.append(await engine.connect())
+
+    try:
+        async with anyio.create_task_group() as tg:
+            for _ in range(size):
+                tg.start_soon(connect)
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+def prime_statement_cache(
+    connection: Connection, statements: Sequence[Executable]
+) -> None:
+    """
+    Run `statements` through an ORM Session on `connection` and roll back,
+    leaving their compiled forms in the engine's statement cache. They
+    should select rows that do not exist: only compilation is of interest.
+    """
+    with Session(bind=connection) as db:
+        for statement in statements:
+            db.execute(statement).all()
+        db.rollback()
+
+
+def prime_engine(engine: Engine, statements: Sequence[Executable]) -> None:
+    with engine.connect() as connection:
+        prime_statement_cache(connection, statements)
+
+
+async def warm_up_engines(statements: Sequence[Executable]) -> None:
+    """
+    Fill the pool of every engine serving requests (the async ones with
+    DB_ASYNC, the sync ones otherwise) to DB_POOL_SIZE and prime its
+    statement cache with `statements`. Failures are logged rather than
+    raised: the app still starts, and connects lazily once the database is
+    reachable.
+    """
+    size = settings.DB_POOL_SIZE
+    sync_engines = (
+        [] if settings.DB_ASYNC else [session.engine, *session.replica_engines]
+    )
+    for engine in sync_engines:
+        name = getattr(engine.pool, "metrics_name", engine.url.host)
+        start = time.perf_counter()
+        try:
+            opened = await anyio.to_thread.run_sync(warm_pool, engine, size)
+            await anyio.to_thread.run_sync(prime_engine, engine, statements)
+        except (SQLAlchemyError, OSError) as exc:
+            logger.warning("Warm-up of the %s pool failed: %r", name, exc)
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(
+            "Warmed the %s pool: %d connections in %.0fms", name, opened, elapsed
+        )
+
+    async_engines = [session.async_engine, *session.async_replica_engines]
+    for async_engine in filter(None, async_engines):
+        name = getattr(async_engine.pool, "metrics_name", async_engine.url.host)
+        start = time.perf_counter()
+        try:
+            opened = await warm_async_pool(async_engine, size)
+            async with async_engine.connect() as connection:
+                await connection.run_sync(prime_statement_cache, statements)
+        except (SQLAlchemyError, OSError) as exc:
+            logger.warning("Warm-up of the %s pool failed: %r", name, exc)
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(
+            "Warmed the %s pool: %d connections in %.0fms", name, opened, elapsed
+        )
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,19 +7,51 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.types import ExceptionHandler
 from typing import cast
 
-from app.api.routes import auth, tasks, health
+from app.api.routes import auth, tasks, health, metrics
 from app.core.config import settings
 from app.core.exceptions import (
     global_exception_handler,
     http_exception_handler,
+    password_hasher_busy_handler,
     validation_exception_handler,
 )
-from app.core.logging import setup_logging
+from app.core.lifecycle import DrainMiddleware, install_sigterm_handler, lifecycle
+from app.core.logging import RequestLogMiddleware, setup_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.recording import TrafficRecordMiddleware
+from app.core.tracing import TracingMiddleware
+from app.core import cache, security
+from app.core.security import PasswordHasherBusyError
+from app.db.routing import ReadYourWritesMiddleware
+from app.db.session import dispose_engines
+from app.db.warmup import warm_up_engines
 
 # Configure logging at startup
 setup_logging()
 
-app = FastAPI(title="Task Manager API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lifecycle.draining = False
+    install_sigterm_handler()
+    if settings.BCRYPT_TARGET_MS:
+        security.calibrate_bcrypt_rounds(settings.BCRYPT_TARGET_MS)
+    # Pay for connections and SQL compilation before traffic, not on it
+    if settings.DB_WARMUP_ENABLED:
+        await warm_up_engines(tasks.warmup_queries())
+    lifecycle.ready = True
+    yield
+    lifecycle.ready = False
+    await lifecycle.drain(settings.SHUTDOWN_DRAIN_SECONDS)
+    await cache.response_cache.close()
+    security.password_hasher.shutdown()
+    await dispose_engines()
+
+
+app = FastAPI(title="Task Manager API", lifespan=lifespan)
+
+# Keep clients on the primary right after they write (no-op without replicas)
+app.add_middleware(ReadYourWritesMiddleware)
 
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
@@ -29,6 +63,24 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Per-request SQL statement count and DB time (Server-Timing, request log)
+app.add_middleware(RequestLogMiddleware)
+
+# Request spans (no-op unless TRACE_EXPORTER is set); outside the request log,
+# so its lines carry the trace id
+app.add_middleware(TracingMiddleware)
+
+# Sanitized request log for benchmarks/replay.py (no-op unless
+# TRAFFIC_RECORD_FILE is set)
+app.add_middleware(TrafficRecordMiddleware)
+
+# Route latency and in-flight requests; outermost, so it times the whole stack
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# In-flight request count, and 503s while draining for shutdown; outermost
+app.add_middleware(DrainMiddleware)
+
 # Register exception handlers
 app.add_exception_handler(
     StarletteHTTPException, cast(ExceptionHandler, http_exception_handler)
@@ -36,12 +88,15 @@ app.add_exception_handler(
 app.add_exception_handler(
     RequestValidationError, cast(ExceptionHandler, validation_exception_handler)
 )
+app.add_exception_handler(PasswordHasherBusyError, password_hasher_busy_handler)
 app.add_exception_handler(Exception, global_exception_handler)
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(health.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,4 +1,5 @@
 from app.models.user import User
 from app.models.task import Task
+from app.models.task_counter import TaskCounter
 
-__all__ = ["User", "Task"]
+__all__ = ["User", "Task", "TaskCounter"]
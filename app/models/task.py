@@ -3,11 +3,12 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, ForeignKey, DateTime, Enum, Text, Uuid
+from sqlalchemy import String, ForeignKey, DateTime, Enum, Index, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.db.base import Base
+from app.db.functions import utcnow
 from app.models.user import User
 
 
@@ -31,11 +32,31 @@ class Task(Base):
     owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=utcnow(), nullable=False
     )
 
     updated_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), onupdate=func.now(), nullable=True
+        DateTime(timezone=True), onupdate=utcnow(), nullable=True
     )
 
     owner: Mapped["User"] = relationship()
+
+    __table_args__ = (
+        # Keyset pagination: per-owner listing ordered by (created_at, id)
+        Index("idx_tasks_owner_created_at_id", "owner_id", "created_at", "id"),
+        # Same, filtered by status
+        Index(
+            "idx_tasks_owner_status_created_at_id",
+            "owner_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # Ordering and updated_since filtering by last modification
+        Index(
+            "idx_tasks_owner_modified_at_id",
+            "owner_id",
+            func.coalesce(updated_at, created_at),
+            "id",
+        ),
+    )
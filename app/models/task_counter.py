@@ -0,0 +1,27 @@
+import uuid
+
+from sqlalchemy import BigInteger, Enum, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.task import TaskStatus
+
+
+class TaskCounter(Base):
+    """
+    Number of tasks an owner has in each status.
+
+    Maintained by the task write routes in the same transaction as the write
+    (see app.db.counters), so reading totals never needs COUNT(*).
+    """
+
+    __tablename__ = "task_counters"
+
+    owner_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Shares the tasks.status enum type
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), primary_key=True)
+    count: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
@@ -1,11 +1,11 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, Uuid
+from sqlalchemy import BigInteger, String, DateTime, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.sql import func
 
 from app.db.base import Base
+from app.db.functions import utcnow
 
 
 class User(Base):
@@ -29,10 +29,17 @@ class User(Base):
     # Created At: Timestamp when the user record was created
     # Server default ensures DB handles time
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=utcnow(), nullable=False
     )
 
     # Updated At: Timestamp of last update
     updated_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), onupdate=func.now(), nullable=True
+        DateTime(timezone=True), onupdate=utcnow(), nullable=True
+    )
+
+    # Tasks Version: Bumped by every write to the user's tasks, in the same
+    # transaction. Versions the task list for ETags and caches. Deferred so a
+    # cached (and possibly stale) User can never be used to read it.
+    tasks_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False, deferred=True
     )
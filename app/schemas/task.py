@@ -1,11 +1,17 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.models.task import TaskStatus
 
+# Upper bound on items per batch request, keeping each statement's size sane
+BATCH_MAX_ITEMS = 1000
+
+# GET /tasks orderings; "updated_at" is last modification (creation if never updated)
+TaskSort = Literal["created_at", "-created_at", "updated_at", "-updated_at"]
+
 
 class TaskBase(BaseModel):
     title: str = Field(..., min_length=1)
@@ -31,3 +37,93 @@ class TaskResponse(TaskBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True, extra="forbid")
+
+
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class TaskBatchFilter(BaseModel):
+    status: Optional[TaskStatus] = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        # An empty filter would select every task the caller owns
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("At least one filter criterion must be set")
+        return self
+
+
+class TaskBatchSelector(BaseModel):
+    """
+    Selects the current user's tasks either by explicit ids or by a filter.
+    """
+
+    ids: Optional[list[UUID]] = Field(None, min_length=1, max_length=BATCH_MAX_ITEMS)
+    filter: Optional[TaskBatchFilter] = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        return self
+
+
+class TaskBatchChanges(BaseModel):
+    title: Optional[str] = Field(None, min_length=1)
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_fields_set:
+            raise ValueError("At least one field must be set")
+        if "title" in self.model_fields_set and self.title is None:
+            raise ValueError("'title' cannot be null")
+        return self
+
+
+class TaskBatchUpdate(TaskBatchSelector):
+    changes: TaskBatchChanges
+
+
+class TaskBatchDelete(TaskBatchSelector):
+    pass
+
+
+class TaskBatchUpdateResponse(BaseModel):
+    updated: list[TaskResponse]
+    not_found: list[UUID]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class TaskBatchDeleteResponse(BaseModel):
+    deleted: list[UUID]
+    not_found: list[UUID]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class TaskImportError(BaseModel):
+    line: int
+    errors: list[dict]
+
+
+class TaskImportResponse(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[TaskImportError]
+
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    by_status: dict[TaskStatus, int]
@@ -0,0 +1,182 @@
+"""
+Timing, result files and baseline comparison for benchmarks/run.py.
+
+Each benchmark is a zero-argument callable (sync or async). It is warmed up
+and calibrated so that one round takes about `round_seconds`, then timed for
+`rounds` rounds; the per-call time of each round is one sample. The median
+of the samples is what gets compared against the baseline.
+"""
+
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class Benchmark:
+    name: str
+    fn: Callable[[], Any] | Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Result:
+    name: str
+    median_us: float
+    min_us: float
+    stdev_us: float
+    calls_per_round: int
+    rounds: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: float | None
+    current_us: float | None
+    # current / baseline - 1: positive is slower
+    change: float | None
+    status: str  # "ok", "regressed", "improved", "new" or "missing"
+
+
+async def _time_calls(fn: Callable, calls: int, is_async: bool) -> float:
+    start = time.perf_counter()
+    if is_async:
+        for _ in range(calls):
+            await fn()
+    else:
+        for _ in range(calls):
+            fn()
+    return time.perf_counter() - start
+
+
+async def measure(bench: Benchmark, rounds: int, round_seconds: float) -> Result:
+    """
+    Time one benchmark. Calibration doubles as the warm-up: the call count
+    grows tenfold until a batch takes a tenth of a round.
+    """
+    is_async = inspect.iscoroutinefunction(bench.fn)
+    calls = 1
+    while True:
+        elapsed = await _time_calls(bench.fn, calls, is_async)
+        if elapsed >= round_seconds / 10 or calls >= 1_000_000:
+            break
+        calls *= 10
+    per_round = max(1, round(calls * round_seconds / max(elapsed, 1e-9)))
+
+    samples = [
+        await _time_calls(bench.fn, per_round, is_async) / per_round * 1e6
+        for _ in range(rounds)
+    ]
+    return Result(
+        name=bench.name,
+        median_us=statistics.median(samples),
+        min_us=min(samples),
+        stdev_us=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        calls_per_round=per_round,
+        rounds=rounds,
+    )
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, results: list[Result]) -> None:
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict[str, dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    results: list[Result], baseline: dict[str, dict[str, Any]], threshold: float
+) -> list[Comparison]:
+    """
+    Median of each benchmark against the baseline's. A change beyond
+    `threshold` (0.1 = 10%) either way is flagged; benchmarks present on
+    only one side are reported but never fail the run.
+    """
+    comparisons = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            comparisons.append(
+                Comparison(result.name, None, result.median_us, None, "new")
+            )
+            continue
+        change = result.median_us / base["median_us"] - 1
+        if change > threshold:
+            state = "regressed"
+        elif change < -threshold:
+            state = "improved"
+        else:
+            state = "ok"
+        comparisons.append(
+            Comparison(result.name, base["median_us"], result.median_us, change, state)
+        )
+    measured = {result.name for result in results}
+    for name, base in baseline.items():
+        if name not in measured:
+            comparisons.append(
+                Comparison(name, base["median_us"], None, None, "missing")
+            )
+    return comparisons
+
+
+def _us(value: float | None) -> str:
+    return "-" if value is None else f"{value:,.1f}"
+
+
+def print_results(results: list[Result]) -> None:
+    width = max((len(result.name) for result in results), default=10)
+    print(f"{'benchmark':<{width}}  {'median us':>12}  {'min us':>12}  {'stdev':>7}")
+    for result in results:
+        spread = result.stdev_us / result.median_us if result.median_us else 0
+        print(
+            f"{result.name:<{width}}  {_us(result.median_us):>12}  "
+            f"{_us(result.min_us):>12}  {spread:>6.1%}"
+        )
+
+
+def print_comparison(comparisons: list[Comparison], threshold: float) -> None:
+    width = max((len(c.name) for c in comparisons), default=10)
+    print(f"\nagainst baseline (threshold {threshold:.0%}):")
+    print(
+        f"{'benchmark':<{width}}  {'baseline us':>12}  {'current us':>12}  "
+        f"{'change':>8}  status"
+    )
+    for c in comparisons:
+        change = "-" if c.change is None else f"{c.change:+.1%}"
+        print(
+            f"{c.name:<{width}}  {_us(c.baseline_us):>12}  {_us(c.current_us):>12}  "
+            f"{change:>8}  {c.status}"
+        )
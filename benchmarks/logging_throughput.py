@@ -0,0 +1,135 @@
+"""
+Request throughput with logging off, written inline, or through the queue.
+
+Drives GET /tasks in-process (httpx ASGI transport, SQLite file database)
+with one INFO request line per call, and reports requests/s and p50/p99:
+
+    uv run benchmarks/logging_throughput.py --logging off
+    uv run benchmarks/logging_throughput.py --logging sync --format json
+    uv run benchmarks/logging_throughput.py --logging queue --format json
+
+"sync" writes each record from the event loop, as logging.basicConfig does;
+"queue" hands it to the QueueListener thread. Log lines go to --log-file
+(a temporary file by default), so the terminal is not the bottleneck.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Ensure the project root is in the python path
+sys.path.append(os.getcwd())
+
+# The app's own engine is never used (get_db is overridden below), but settings
+# must validate before the app can be imported.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.logging import setup_logging, stop_logging  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import ThreadedSession  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Task, User  # noqa: E402
+
+
+def setup_database(path: str) -> tuple[sessionmaker, str]:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(autoflush=False, bind=engine)
+
+    with SessionFactory() as db:
+        # Never logs in, so the stored hash only has to exist
+        user = User(email="bench@example.com", hashed_password="unused")
+        db.add(user)
+        db.flush()
+        db.add_all(Task(title=f"Task {i}", owner_id=user.id) for i in range(50))
+        db.commit()
+        token = security.create_access_token(subject=user.email, user_id=user.id)
+    return SessionFactory, token
+
+
+async def worker(
+    client: httpx.AsyncClient, headers: dict, deadline: float, samples: list[float]
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/tasks?limit=20", headers=headers)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+async def run_benchmark(args: argparse.Namespace, token: str) -> list[float]:
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        await c.get("/tasks", headers=headers)  # warm up
+        samples: list[float] = []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *(worker(c, headers, deadline, samples) for _ in range(args.clients))
+        )
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /tasks throughput vs logging.")
+    parser.add_argument("--logging", choices=["off", "sync", "queue"], default="queue")
+    parser.add_argument("--format", choices=["text", "json"], default="json")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--log-file", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = args.log_file or os.path.join(tmp, "bench.log")
+        with open(log_path, "a") as log_file:
+            if args.logging == "off":
+                logging.disable(logging.CRITICAL)
+            else:
+                setup_logging(
+                    log_format=args.format,
+                    stream=log_file,
+                    use_queue=args.logging == "queue",
+                )
+            # One INFO line per request from httpx would double the volume
+            logging.getLogger("httpx").setLevel(logging.WARNING)
+
+            SessionFactory, token = setup_database(os.path.join(tmp, "bench.db"))
+
+            async def override_get_db():
+                db = ThreadedSession(SessionFactory())
+                try:
+                    yield db
+                finally:
+                    await db.close()
+
+            app.dependency_overrides[get_db] = override_get_db
+            samples = asyncio.run(run_benchmark(args, token))
+            stop_logging()
+
+    if len(samples) < 2:
+        print("not enough samples")
+        return
+    cuts = statistics.quantiles(samples, n=100)
+    print(
+        f"logging={args.logging:<5} format={args.format:<4} clients={args.clients} "
+        f"n={len(samples):<6} rps={len(samples) / args.duration:<8.1f} "
+        f"p50={cuts[49]:>7.2f}ms  p99={cuts[98]:>7.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Mixed-load benchmark: bursts of logins alongside ordinary task listing.
+
+Drives the app in-process (httpx ASGI transport, SQLite file database) and
+reports p50/p99 latency for POST /auth/login and GET /tasks, so the effect of
+where bcrypt runs is visible on the requests that do not hash at all:
+
+    uv run benchmarks/login_mixed_load.py --executor inline   # bcrypt on the event loop
+    uv run benchmarks/login_mixed_load.py --executor thread
+    uv run benchmarks/login_mixed_load.py --executor process
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Ensure the project root is in the python path
+sys.path.append(os.getcwd())
+
+# The app's own engine is never used (get_db is overridden below), but settings
+# must validate before the app can be imported.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.core import security  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import ThreadedSession  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Task, User  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "password123"
+
+
+class InlineHasher:
+    """
+    Baseline: hash directly on the event loop, as a sync handler body would.
+    """
+
+    in_flight = 0
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+    def shutdown(self) -> None:
+        pass
+
+
+def setup_database(path: str) -> sessionmaker:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(autoflush=False, bind=engine)
+
+    with SessionFactory() as db:
+        user = User(email=EMAIL, hashed_password=security.get_password_hash(PASSWORD))
+        db.add(user)
+        db.flush()
+        db.add_all(Task(title=f"Task {i}", owner_id=user.id) for i in range(50))
+        db.commit()
+    return SessionFactory
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    deadline: float,
+    samples: list[float],
+    errors: list[int],
+    **kwargs,
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+
+
+def summarize(name: str, samples: list[float], errors: list[int], duration: float):
+    if len(samples) < 2:
+        print(f"{name:<14} not enough samples")
+        return
+    cuts = statistics.quantiles(samples, n=100)
+    print(
+        f"{name:<14} n={len(samples):<6} rps={len(samples) / duration:<8.1f} "
+        f"p50={cuts[49]:>8.1f}ms  p99={cuts[98]:>8.1f}ms  errors={len(errors)}"
+    )
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        credentials = {"email": EMAIL, "password": PASSWORD}
+        # Warm up (spawns pool processes) and obtain a token for the readers
+        token = (await c.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        login_samples: list[float] = []
+        login_errors: list[int] = []
+        task_samples: list[float] = []
+        task_errors: list[int] = []
+        deadline = time.perf_counter() + args.duration
+
+        await asyncio.gather(
+            *(
+                worker(
+                    c,
+                    "POST",
+                    "/auth/login",
+                    deadline,
+                    login_samples,
+                    login_errors,
+                    json=credentials,
+                )
+                for _ in range(args.login_clients)
+            ),
+            *(
+                worker(
+                    c,
+                    "GET",
+                    "/tasks?limit=20",
+                    deadline,
+                    task_samples,
+                    task_errors,
+                    headers=headers,
+                )
+                for _ in range(args.task_clients)
+            ),
+        )
+
+    print(
+        f"executor={args.executor} workers={args.workers} "
+        f"login_clients={args.login_clients} task_clients={args.task_clients}"
+    )
+    summarize("POST /auth/login", login_samples, login_errors, args.duration)
+    summarize("GET /tasks", task_samples, task_errors, args.duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login vs /tasks mixed load.")
+    parser.add_argument(
+        "--executor", choices=["inline", "thread", "process"], default="process"
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--login-clients", type=int, default=8)
+    parser.add_argument("--task-clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    # One INFO line per request would dominate the measurement
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.executor == "inline":
+        security.password_hasher = InlineHasher()
+    else:
+        security.password_hasher = security.PasswordHashPool(
+            workers=args.workers,
+            max_pending=args.max_pending,
+            use_processes=args.executor == "process",
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        SessionFactory = setup_database(os.path.join(tmp, "bench.db"))
+
+        async def override_get_db():
+            db = ThreadedSession(SessionFactory())
+            try:
+                yield db
+            finally:
+                await db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            asyncio.run(run_benchmark(args))
+        finally:
+            security.password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""
+Replay recorded traffic against a running instance and report latency.
+
+Sources are request logs written by TrafficRecordMiddleware (set
+TRAFFIC_RECORD_FILE on the instance being recorded) and/or the REST Client
+files in http/, which seed scenarios before any traffic has been recorded:
+
+    uv run benchmarks/replay.py --log traffic.jsonl --speedup 5 --clients 32
+    uv run benchmarks/replay.py --http http/tasks.http --repeat 200 --speedup 0
+    uv run benchmarks/replay.py --log traffic.jsonl --compare replay-before.json
+
+Requests are sent in recorded order, each no earlier than its recorded offset
+divided by --speedup (0 sends as fast as the clients allow), by --clients
+concurrent clients. Recorded users are mapped onto --users synthetic users
+registered at startup, each given --tasks-per-user tasks so that /tasks/{id}
+routes have something to hit. Masked strings are replayed as strings of the
+same length; keyset cursors are dropped, and non-JSON bodies (imports) are
+skipped.
+
+Per-route p50/p95/p99 and throughput are printed and written to --output;
+with --compare they are diffed against an earlier output, and with
+--threshold a p95 more than that much slower fails the run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+# Ensure the project root is in the python path
+sys.path.append(os.getcwd())
+
+# Only app.core.recording is used, but settings must validate to import it
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import httpx  # noqa: E402
+
+from app.core.recording import shape, shape_query  # noqa: E402
+
+PASSWORD = "replay-password"
+MASKED = re.compile(r"<str:(\d+)>")
+PATH_PARAM = re.compile(r"\{[^}/]+\}")
+HTTP_VARIABLE = re.compile(r"\{\{\s*([^}]+?)\s*\}\}")
+HTTP_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+# Gap between consecutive requests of a .http file, in recorded seconds
+HTTP_INTERVAL = 0.1
+
+
+@dataclass
+class ReplayUser:
+    email: str
+    token: str = ""
+    refresh_token: str = ""
+    task_ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int  # 0 when the request failed at the transport level
+    ms: float
+
+
+def load_log(path: str) -> list[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_http_file(path: str) -> list[dict[str, Any]]:
+    """
+    Requests of a REST Client .http file as recording entries. Path segments
+    made of {{variables}} become "{id}", query parameters with variables are
+    dropped, and file variables (@name = value) are substituted in bodies.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    variables = dict(re.findall(r"^@(\w+)\s*=\s*(.*?)\s*$", text, flags=re.MULTILINE))
+    entries = []
+    for block in re.split(r"^###.*$", text, flags=re.MULTILINE):
+        lines = [
+            line
+            for line in block.strip().splitlines()
+            if not line.lstrip().startswith(("#", "//", "@"))
+        ]
+        if not lines or lines[0].split(" ", 1)[0] not in HTTP_METHODS:
+            continue
+        method, url = lines[0].split()[:2]
+        headers: dict[str, str] = {}
+        body_start = len(lines)
+        for i, line in enumerate(lines[1:], start=1):
+            if not line.strip():
+                body_start = i + 1
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if url.startswith("{{"):
+            url = HTTP_VARIABLE.sub("", url, count=1)  # {{baseUrl}}
+        parts = urlsplit(url)
+        route = "/".join(
+            "{id}" if "{{" in segment else segment for segment in parts.path.split("/")
+        )
+        query = {
+            key: value for key, value in parse_qsl(parts.query) if "{{" not in value
+        }
+        raw_body = "\n".join(lines[body_start:]).strip()
+        body = None
+        if raw_body:
+            raw_body = HTTP_VARIABLE.sub(
+                lambda m: variables.get(m.group(1), m.group(0)), raw_body
+            )
+            try:
+                body = shape(json.loads(raw_body))
+            except ValueError:
+                continue
+        entries.append(
+            {
+                "ts": len(entries) * HTTP_INTERVAL,
+                "method": method,
+                "route": route,
+                "query": shape_query(query),
+                "content_type": "application/json" if body is not None else None,
+                "body": body,
+                "body_bytes": len(raw_body),
+                "user": "http" if "authorization" in headers else None,
+            }
+        )
+    return entries
+
+
+def repeat(entries: list[dict[str, Any]], times: int) -> list[dict[str, Any]]:
+    """
+    The scenario `times` times back to back, shifted in time.
+    """
+    if not entries or times <= 1:
+        return entries
+    first = min(entry["ts"] for entry in entries)
+    length = max(entry["ts"] for entry in entries) - first + HTTP_INTERVAL
+    return [
+        {**entry, "ts": entry["ts"] + n * length}
+        for n in range(times)
+        for entry in entries
+    ]
+
+
+def materialize(value: Any) -> Any:
+    """
+    A concrete JSON value for a recorded shape.
+    """
+    if isinstance(value, dict):
+        return {k: materialize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    if isinstance(value, str) and (match := MASKED.fullmatch(value)):
+        return "x" * int(match.group(1))
+    return value
+
+
+async def setup_users(
+    client: httpx.AsyncClient, count: int, tasks_per_user: int
+) -> list[ReplayUser]:
+    run = uuid.uuid4().hex[:8]
+    users = []
+    for n in range(count):
+        user = ReplayUser(email=f"replay-{run}-{n}@example.com")
+        credentials = {"email": user.email, "password": PASSWORD}
+        (await client.post("/auth/register", json=credentials)).raise_for_status()
+        login = await client.post("/auth/login", json=credentials)
+        login.raise_for_status()
+        user.token = login.json()["access_token"]
+        user.refresh_token = login.json()["refresh_token"]
+        for i in range(tasks_per_user):
+            created = await client.post(
+                "/tasks",
+                json={"title": f"Replay task {i}"},
+                headers={"Authorization": f"Bearer {user.token}"},
+            )
+            created.raise_for_status()
+            user.task_ids.append(created.json()["id"])
+        users.append(user)
+    return users
+
+
+def build_request(
+    entry: dict[str, Any], user: ReplayUser | None, users: list[ReplayUser]
+) -> dict[str, Any] | None:
+    """
+    httpx request arguments for a recorded entry, or None if it cannot be
+    replayed.
+    """
+    if entry["body"] is None and entry.get("body_bytes"):
+        return None  # not JSON (file import), or too large to have been shaped
+
+    path = entry["route"]
+    if PATH_PARAM.search(path):
+        owner = user or users[0]
+        if not owner.task_ids:
+            return None
+        # Deletes consume a task; everything else rotates through the pool
+        task_id = (
+            owner.task_ids.pop()
+            if entry["method"] == "DELETE"
+            else owner.task_ids[hash(entry["ts"]) % len(owner.task_ids)]
+        )
+        path = PATH_PARAM.sub(task_id, path)
+
+    query = {
+        key: value
+        for key, value in materialize(entry.get("query") or {}).items()
+        if key != "cursor"
+    }
+    body = materialize(entry["body"]) if entry["body"] is not None else None
+    account = user or users[0]
+    if entry["route"] == "/auth/login":
+        body = {"email": account.email, "password": PASSWORD}
+    elif entry["route"] == "/auth/register":
+        body = {"email": f"replay-{uuid.uuid4().hex}@example.com", "password": PASSWORD}
+    elif entry["route"] == "/auth/refresh":
+        body = {"refresh_token": account.refresh_token}
+
+    request: dict[str, Any] = {
+        "method": entry["method"],
+        "url": path,
+        "params": query,
+        "headers": {},
+    }
+    if user is not None:
+        request["headers"]["Authorization"] = f"Bearer {user.token}"
+    if body is not None:
+        request["json"] = body
+    return request
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    entries: list[dict[str, Any]],
+    users: list[ReplayUser],
+    clients: int,
+    speedup: float,
+) -> tuple[list[Sample], int, float]:
+    """
+    Send the entries; returns the samples, the number of skipped entries and
+    the wall-clock duration.
+    """
+    entries = sorted(entries, key=lambda entry: entry["ts"])
+    mapping: dict[str, ReplayUser] = {}
+    pending: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    for entry in entries:
+        pending.put_nowait(entry)
+    samples: list[Sample] = []
+    skipped = 0
+    first = entries[0]["ts"] if entries else 0.0
+    start = time.perf_counter()
+
+    async def worker() -> None:
+        nonlocal skipped
+        while True:
+            try:
+                entry = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if speedup > 0:
+                delay = start + (entry["ts"] - first) / speedup - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            user = None
+            if entry.get("user"):
+                user = mapping.setdefault(
+                    entry["user"], users[len(mapping) % len(users)]
+                )
+            request = build_request(entry, user, users)
+            if request is None:
+                skipped += 1
+                continue
+
+            route = f"{entry['method']} {entry['route']}"
+            sent = time.perf_counter()
+            try:
+                response = await client.request(**request)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append(Sample(route, status, (time.perf_counter() - sent) * 1000))
+
+            if status == 201 and entry["route"] == "/tasks" and user is not None:
+                user.task_ids.append(response.json()["id"])
+
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return samples, skipped, time.perf_counter() - start
+
+
+def summarize(samples: list[Sample], wall: float) -> dict[str, Any]:
+    def stats(group: list[Sample]) -> dict[str, Any]:
+        latencies = sorted(sample.ms for sample in group)
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = latencies[0]
+        return {
+            "count": len(group),
+            "errors": sum(1 for s in group if s.status == 0 or s.status >= 500),
+            "client_errors": sum(1 for s in group if 400 <= s.status < 500),
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "p99_ms": round(p99, 3),
+            "rps": round(len(group) / wall, 2) if wall else 0.0,
+        }
+
+    by_route: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample.route, []).append(sample)
+    return {
+        "routes": {route: stats(group) for route, group in sorted(by_route.items())},
+        "total": stats(samples) if samples else None,
+    }
+
+
+def print_summary(summary: dict[str, Any]) -> None:
+    rows = dict(summary["routes"])
+    if summary["total"] is not None:
+        rows["TOTAL"] = summary["total"]
+    if not rows:
+        return
+    width = max(len(route) for route in rows)
+    print(
+        f"{'route':<{width}}  {'n':>7}  {'5xx':>5}  {'4xx':>5}  "
+        f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'req/s':>8}"
+    )
+    for route, row in rows.items():
+        print(
+            f"{route:<{width}}  {row['count']:>7}  {row['errors']:>5}  "
+            f"{row['client_errors']:>5}  {row['p50_ms']:>8.2f}  {row['p95_ms']:>8.2f}  "
+            f"{row['p99_ms']:>8.2f}  {row['rps']:>8.1f}"
+        )
+
+
+def print_diff(
+    previous: dict[str, Any], current: dict[str, Any], threshold: float | None
+) -> list[str]:
+    """
+    Print the change of each route's percentiles and throughput against a
+    previous run. Returns the routes whose p95 regressed beyond `threshold`.
+    """
+
+    def change(before: float, after: float) -> str:
+        return f"{after / before - 1:+.0%}" if before else "-"
+
+    before_rows = {**previous["routes"], "TOTAL": previous["total"]}
+    after_rows = {**current["routes"], "TOTAL": current["total"]}
+    width = max(len(route) for route in {**before_rows, **after_rows})
+    print(f"\nagainst {previous.get('meta', {}).get('started_at', 'previous run')}:")
+    print(f"{'route':<{width}}  {'p50':>16}  {'p95':>16}  {'p99':>16}  {'req/s':>16}")
+    regressed = []
+    for route in sorted(set(before_rows) | set(after_rows)):
+        before, after = before_rows.get(route), after_rows.get(route)
+        if before is None or after is None:
+            print(
+                f"{route:<{width}}  {'only in ' + ('current' if before is None else 'previous')}"
+            )
+            continue
+        cells = [
+            f"{after[key]:.1f} ({change(before[key], after[key])})"
+            for key in ("p50_ms", "p95_ms", "p99_ms", "rps")
+        ]
+        print(f"{route:<{width}}  " + "  ".join(f"{cell:>16}" for cell in cells))
+        if (
+            threshold is not None
+            and route != "TOTAL"
+            and before["p95_ms"]
+            and after["p95_ms"] / before["p95_ms"] - 1 > threshold
+        ):
+            regressed.append(route)
+    return regressed
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    entries: list[dict[str, Any]] = []
+    for path in args.log:
+        entries.extend(load_log(path))
+    for path in args.http or ([] if args.log else ["http/tasks.http"]):
+        entries.extend(load_http_file(path))
+    entries = repeat(entries, args.repeat)
+    if not entries:
+        sys.exit("nothing to replay")
+
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        print(f"registering {args.users} users ...", file=sys.stderr)
+        users = await setup_users(client, args.users, args.tasks_per_user)
+        print(f"replaying {len(entries)} requests ...", file=sys.stderr)
+        samples, skipped, wall = await replay(
+            client, entries, users, args.clients, args.speedup
+        )
+
+    summary = summarize(samples, wall)
+    summary["meta"] = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "base_url": args.base_url,
+        "clients": args.clients,
+        "speedup": args.speedup,
+        "requests": len(samples),
+        "skipped": skipped,
+        "wall_seconds": round(wall, 3),
+    }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded API traffic.")
+    parser.add_argument("--log", action="append", default=[], help="recorded JSONL")
+    parser.add_argument("--http", action="append", default=[], help=".http file")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument(
+        "--speedup",
+        type=float,
+        default=1.0,
+        help="replay this many times faster than recorded; 0 for no pacing",
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks-per-user", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", default="replay-results.json")
+    parser.add_argument("--compare", help="output of a previous run to diff against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="fail if a route's p95 is this much slower than in --compare (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    print_summary(summary)
+    meta = summary["meta"]
+    print(
+        f"\n{meta['requests']} requests in {meta['wall_seconds']:.1f}s "
+        f"({meta['skipped']} skipped); results written to {args.output}"
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+        f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        regressed = print_diff(previous, summary, args.threshold)
+        if regressed:
+            print(
+                f"\np95 regressed beyond {args.threshold:.0%}: {', '.join(regressed)}"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
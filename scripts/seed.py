@@ -1,13 +1,53 @@
-import sys
+"""
+Seed the database.
+
+Without arguments, creates two demo users with a few tasks each:
+
+    uv run scripts/seed.py
+
+With --users, generates synthetic load-testing data instead: N users whose
+task counts follow a Pareto distribution around --tasks-per-user, plus a few
+power users holding --power-user-tasks each. Generation is deterministic for
+a given --seed (whatever the --workers count), every user shares one
+precomputed password hash, and rows are loaded with COPY by parallel worker
+processes, one transaction per chunk of users:
+
+    uv run scripts/seed.py --users 200000 --tasks-per-user 50 --workers 8
+    uv run scripts/seed.py --users 1000 --database-url postgresql://...@localhost/tasks
+"""
+
+import argparse
 import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
 
 # Ensure the project root is in the python path
 sys.path.append(os.getcwd())
 
-from app.db.session import SessionLocal
+from sqlalchemy import text
+
+from app.db import session
+from app.db.session import SessionLocal, set_custom_db_url
 from app.models.user import User
 from app.models.task import Task, TaskStatus
 from app.core.security import get_password_hash
+from app.db.bulk import copy_rows
+from app.db.counters import rebuild_task_counters
+
+# Rows per COPY statement, bounding the buffer a worker builds at once
+COPY_BATCH_SIZE = 50_000
+
+# Roughly what production looks like: most tasks end up done
+STATUS_WEIGHTS = {TaskStatus.TODO: 25, TaskStatus.IN_PROGRESS: 15, TaskStatus.DONE: 60}
+
+VERBS = ["Review", "Write", "Fix", "Plan", "Call", "Buy", "Update", "Prepare"]
+NOUNS = ["report", "invoice", "groceries", "roadmap", "bug", "meeting", "slides"]
 
 
 def seed_data():
@@ -59,6 +99,9 @@ def seed_data():
         )
 
         db.add_all([task1, task2, task3])
+        db.flush()
+        # Tasks were inserted directly, not through the API
+        rebuild_task_counters(db)
         db.commit()
 
         print("Database seeded successfully!")
@@ -73,5 +116,212 @@ def seed_data():
         db.close()
 
 
+@dataclass
+class GeneratorOptions:
+    seed: int
+    users: int
+    tasks_per_user: float
+    skew: float
+    power_users: int
+    power_user_tasks: int
+    days: int
+    hashed_password: str
+    now: datetime
+
+
+def tasks_for_user(rng: random.Random, index: int, opts: GeneratorOptions) -> int:
+    """
+    Power users get a fixed large count; everyone else a Pareto draw scaled
+    so the mean is about `tasks_per_user` (before capping at the power-user
+    count).
+    """
+    if index < opts.power_users:
+        return opts.power_user_tasks
+    mean = opts.skew / (opts.skew - 1)
+    count = int(opts.tasks_per_user * rng.paretovariate(opts.skew) / mean)
+    return min(count, opts.power_user_tasks)
+
+
+def random_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_chunk(
+    chunk: int, first: int, last: int, opts: GeneratorOptions
+) -> tuple[list[dict[str, Any]], Iterator[dict[str, Any]]]:
+    """
+    User rows for users [first, last) and a lazy iterator over their tasks.
+    Each chunk has its own RNG derived from the seed, so the data does not
+    depend on how chunks are spread over workers.
+    """
+    rng = random.Random(f"{opts.seed}:{chunk}")
+    span = timedelta(days=opts.days).total_seconds()
+    users = [
+        {
+            "id": random_uuid(rng),
+            "email": f"user{index}@example.com",
+            "hashed_password": opts.hashed_password,
+            "created_at": opts.now - timedelta(seconds=rng.random() * span),
+        }
+        for index in range(first, last)
+    ]
+    counts = [tasks_for_user(rng, index, opts) for index in range(first, last)]
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+
+    def tasks() -> Iterator[dict[str, Any]]:
+        for user, count in zip(users, counts):
+            age = (opts.now - user["created_at"]).total_seconds()
+            for status in rng.choices(statuses, weights, k=count):
+                created_at = opts.now - timedelta(seconds=rng.random() * age)
+                updated_at = None
+                if status != TaskStatus.TODO or rng.random() < 0.3:
+                    since = (opts.now - created_at).total_seconds()
+                    updated_at = created_at + timedelta(seconds=rng.random() * since)
+                yield {
+                    "id": random_uuid(rng),
+                    "title": f"{rng.choice(VERBS)} {rng.choice(NOUNS)} "
+                    f"{rng.randrange(1000)}",
+                    "description": None
+                    if rng.random() < 0.4
+                    else f"Synthetic task for {user['email']}",
+                    "status": status,
+                    "owner_id": user["id"],
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                }
+
+    return users, tasks()
+
+
+def init_worker(database_url: str | None) -> None:
+    # Forked workers must not reuse the parent's pooled connections
+    session.engine.dispose(close=False)
+    if database_url:
+        set_custom_db_url(database_url)
+
+
+def load_chunk(
+    chunk: int, first: int, last: int, opts: GeneratorOptions
+) -> tuple[int, int]:
+    """
+    Generate and COPY one chunk of users and their tasks in one transaction.
+    Returns (users, tasks) loaded.
+    """
+    users, tasks = generate_chunk(chunk, first, last, opts)
+    loaded = 0
+    db = SessionLocal()
+    try:
+        copy_rows(db, User.__table__, users)
+        batch: list[dict[str, Any]] = []
+        for row in tasks:
+            batch.append(row)
+            if len(batch) >= COPY_BATCH_SIZE:
+                copy_rows(db, Task.__table__, batch)
+                loaded += len(batch)
+                batch = []
+        copy_rows(db, Task.__table__, batch)
+        loaded += len(batch)
+        db.commit()
+    finally:
+        db.close()
+    return len(users), loaded
+
+
+def generate_data(args: argparse.Namespace) -> None:
+    if args.database_url:
+        set_custom_db_url(args.database_url)
+    db = SessionLocal()
+    try:
+        if db.query(User).first():
+            print("Database already contains data. Skipping seed.")
+            return
+    finally:
+        db.close()
+
+    opts = GeneratorOptions(
+        seed=args.seed,
+        users=args.users,
+        tasks_per_user=args.tasks_per_user,
+        skew=args.skew,
+        power_users=min(args.power_users, args.users),
+        power_user_tasks=args.power_user_tasks,
+        days=args.days,
+        # One bcrypt hash for everyone: hashing per user would dominate the run
+        hashed_password=get_password_hash(args.password),
+        # Fixed so that the same seed generates the same rows on every run
+        now=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    chunks = [
+        (i, first, min(first + args.chunk_users, args.users), opts)
+        for i, first in enumerate(range(0, args.users, args.chunk_users))
+    ]
+
+    print(f"Generating {args.users} users with {args.workers} worker(s)...")
+    start = time.perf_counter()
+    total_users = total_tasks = 0
+    with ProcessPoolExecutor(
+        args.workers, initializer=init_worker, initargs=(args.database_url,)
+    ) as pool:
+        for users, tasks in pool.map(load_chunk, *zip(*chunks)):
+            total_users += users
+            total_tasks += tasks
+            elapsed = time.perf_counter() - start
+            print(
+                f"  {total_users}/{args.users} users, {total_tasks} tasks "
+                f"({total_tasks / elapsed:,.0f} rows/s)"
+            )
+
+    db = SessionLocal()
+    try:
+        print("Rebuilding task counters...")
+        rebuild_task_counters(db)
+        db.commit()
+    finally:
+        db.close()
+    if session.engine.dialect.name == "postgresql":
+        # Fresh statistics, so query plans match what production would get
+        with session.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.execute(text("ANALYZE users, tasks, task_counters"))
+
+    print(
+        f"Loaded {total_users} users and {total_tasks} tasks in "
+        f"{time.perf_counter() - start:.1f}s "
+        f"(every password is {args.password!r})."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database.")
+    parser.add_argument(
+        "--users", type=int, help="generate this many synthetic users instead"
+    )
+    parser.add_argument("--tasks-per-user", type=float, default=20)
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=1.2,
+        help="Pareto shape of tasks per user; lower is more skewed (> 1)",
+    )
+    parser.add_argument("--power-users", type=int, default=3)
+    parser.add_argument("--power-user-tasks", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365, help="history to spread over")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-users", type=int, default=1000)
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    args = parser.parse_args()
+    if args.skew <= 1:
+        parser.error("--skew must be greater than 1")
+
+    if args.users is None:
+        seed_data()
+    else:
+        generate_data(args)
+
+
 if __name__ == "__main__":
-    seed_data()
+    main()
@@ -1,5 +1,6 @@
 -- Enable UUID extension (usually enabled by default in Supabase, but good practice)
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Create ENUM type
 DO $$ BEGIN
@@ -24,13 +25,15 @@ CREATE TABLE IF NOT EXISTS users (
     hashed_password VARCHAR(255) NOT NULL,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ,
+    tasks_version BIGINT NOT NULL DEFAULT 0,
     CONSTRAINT uq_users_email UNIQUE (email)
 );
 
--- Trigger for users
+-- Trigger for users (task writes only bump tasks_version; not a profile update)
 CREATE TRIGGER set_users_updated_at
 BEFORE UPDATE ON users
 FOR EACH ROW
+WHEN (OLD.tasks_version IS NOT DISTINCT FROM NEW.tasks_version)
 EXECUTE FUNCTION handle_updated_at();
 
 -- Create tasks table
@@ -42,21 +45,45 @@ CREATE TABLE IF NOT EXISTS tasks (
     owner_id UUID NOT NULL,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ,
+    -- Full-text search document; title words rank above description words
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED,
     CONSTRAINT fk_tasks_owner
         FOREIGN KEY(owner_id) 
         REFERENCES users(id)
         ON DELETE CASCADE
 );
 
+-- Per-owner task counts by status, maintained by the API in each write
+-- transaction (GET /tasks/stats, X-Total-Count)
+CREATE TABLE IF NOT EXISTS task_counters (
+    owner_id UUID NOT NULL,
+    status taskstatus NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT pk_task_counters PRIMARY KEY (owner_id, status),
+    CONSTRAINT fk_task_counters_owner_id_users
+        FOREIGN KEY(owner_id)
+        REFERENCES users(id)
+        ON DELETE CASCADE
+);
+
 -- Indexes for performance
 -- PK indexes are automatic.
 -- Email unique index is created by CONSTRAINT uq_users_email.
 CREATE INDEX IF NOT EXISTS idx_tasks_owner_id ON tasks(owner_id);
+-- Keyset pagination of a user's tasks ordered by (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_tasks_owner_created_at_id ON tasks(owner_id, created_at, id);
+-- GET /tasks filtered by status, and sorted/filtered by last modification
+CREATE INDEX IF NOT EXISTS idx_tasks_owner_status_created_at_id ON tasks(owner_id, status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_owner_modified_at_id ON tasks(owner_id, coalesce(updated_at, created_at), id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
--- Title index only if search feature is planned, strictly speaking redundant for simple list, 
--- but kept per original schema intent, changed to gin/trigram if advanced search, 
--- staying simple btree for exact match/sorting.
+-- Btree title index for exact match/sorting; search uses the GIN indexes below.
 CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks(title);
+-- GET /tasks/search: word-prefix full-text match and typo-tolerant title match
+CREATE INDEX IF NOT EXISTS idx_tasks_search_vector ON tasks USING gin(search_vector);
+CREATE INDEX IF NOT EXISTS idx_tasks_title_trgm ON tasks USING gin(title gin_trgm_ops);
 
 -- Trigger for tasks
 CREATE TRIGGER set_tasks_updated_at
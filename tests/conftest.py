@@ -1,40 +1,183 @@
+import hashlib
+import os
+from pathlib import Path
 from typing import Generator
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+# Test-only hashing profile: the cheapest bcrypt cost and an in-process pool,
+# so fixtures creating users and the auth tests do not pay production cost.
+# Set before the app is imported, since settings are read at import time.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "thread")
+# The app's own engines are not used by the tests: nothing to warm up
+os.environ.setdefault("DB_WARMUP_ENABLED", "false")
 
-from app.api.deps import get_db
-from app.core import security
-from app.db.base import Base
-from app.main import app
-from app.models.user import User
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import URL, Engine, create_engine, event, make_url  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import NullPool, StaticPool  # noqa: E402
 
-# Use an in-memory SQLite database for testing to ensure isolation and speed.
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+from app.api.deps import get_db, principal_cache  # noqa: E402
+from app.core import security  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import ThreadedSession  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from query_budget import QueryCapture  # noqa: E402
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+# Tests run on an in-memory SQLite database unless TEST_DATABASE_URL points at
+# a PostgreSQL server; the database it names is only used for administration.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    if TEST_DATABASE_URL:
+        marker = "sqlite_only"
+        skip = pytest.mark.skip(reason="SQLite-specific (TEST_DATABASE_URL is set)")
+    else:
+        marker = "postgres_only"
+        skip = pytest.mark.skip(reason="needs PostgreSQL (set TEST_DATABASE_URL)")
+    for item in items:
+        if item.get_closest_marker(marker):
+            item.add_marker(skip)
+
+
+def sqlite_engine() -> Engine:
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+    # emit BEGIN itself (the recipe from the SQLAlchemy SQLite docs)
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+MIGRATIONS = Path(__file__).resolve().parents[1] / "alembic"
+
+
+def schema_fingerprint() -> str:
+    """
+    Hash of the migration scripts: a template built from an older schema is
+    never reused.
+    """
+    digest = hashlib.sha1()
+    for script in sorted((MIGRATIONS / "versions").glob("*.py")):
+        digest.update(script.read_bytes())
+    return digest.hexdigest()[:10]
+
+
+def migrate(url: URL) -> None:
+    """
+    Build the schema the way production does (`alembic upgrade head`), so
+    migration-only objects (search column, pg_trgm, triggers) exist too.
+    """
+    config = Config()  # no ini file: leaves the test run's logging alone
+    config.set_main_option("script_location", str(MIGRATIONS))
+    engine = create_engine(url, poolclass=NullPool)
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    engine.dispose()
+
+
+def clone_template_database(admin_url: str, worker: str) -> str:
+    """
+    Create (once, under an advisory lock shared by all xdist workers) a
+    template database migrated to head, then a fresh copy of it for this
+    worker. Returns the worker database's URL.
+    """
+    url = make_url(admin_url)
+    template = f"{url.database}_template_{schema_fingerprint()}"
+    database = f"{url.database}_test_{worker}"
+    admin = create_engine(url, poolclass=NullPool, isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as conn:
+            conn.exec_driver_sql("SELECT pg_advisory_lock(hashtext('test-template'))")
+            try:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM pg_database WHERE datname = %s", (template,)
+                ).scalar()
+                if not exists:
+                    conn.exec_driver_sql(f'CREATE DATABASE "{template}"')
+                    try:
+                        migrate(url.set(database=template))
+                    except BaseException:
+                        # Never leave a half-migrated template to be reused
+                        conn.exec_driver_sql(f'DROP DATABASE "{template}"')
+                        raise
+                conn.exec_driver_sql(f'DROP DATABASE IF EXISTS "{database}"')
+                conn.exec_driver_sql(
+                    f'CREATE DATABASE "{database}" TEMPLATE "{template}"'
+                )
+            finally:
+                conn.exec_driver_sql(
+                    "SELECT pg_advisory_unlock(hashtext('test-template'))"
+                )
+    finally:
+        admin.dispose()
+    return url.set(database=database).render_as_string(hide_password=False)
+
+
+def drop_database(admin_url: str, database_url: str) -> None:
+    admin = create_engine(admin_url, poolclass=NullPool, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.exec_driver_sql(
+            f'DROP DATABASE IF EXISTS "{make_url(database_url).database}"'
+        )
+    admin.dispose()
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Generator[Engine, None, None]:
+    """
+    The test database, with the schema created once per run (per xdist
+    worker). On PostgreSQL each worker gets its own clone of a template.
+    """
+    if not TEST_DATABASE_URL:
+        engine = sqlite_engine()
+        yield engine
+        engine.dispose()
+        return
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    database_url = clone_template_database(TEST_DATABASE_URL, worker)
+    engine = create_engine(database_url)
+    yield engine
+    engine.dispose()
+    drop_database(TEST_DATABASE_URL, database_url)
 
 
 @pytest.fixture(scope="function")
-def db_session() -> Generator[Session, None, None]:
+def db_session(db_engine: Engine) -> Generator[Session, None, None]:
     """
-    Creates a fresh database session for each test.
-    Create tables before test and drop them after.
+    A session inside a transaction that is rolled back after the test, so
+    the schema is kept and no data leaks between tests. Commits (the test's
+    or the app's) only release a savepoint of that transaction.
     """
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
     yield session
     session.close()
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -45,7 +188,7 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
 
     def override_get_db():
         try:
-            yield db_session
+            yield ThreadedSession(db_session)
         finally:
             pass
 
@@ -53,6 +196,7 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+    principal_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -75,5 +219,16 @@ def auth_headers(test_user: User) -> dict:
     """
     Returns authorization headers for the test user.
     """
-    access_token = security.create_access_token(subject=test_user.email)
+    access_token = security.create_access_token(
+        subject=test_user.email, user_id=test_user.id
+    )
     return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.fixture
+def capture_queries() -> type[QueryCapture]:
+    """
+    Capture the SQL of a block: `with capture_queries() as captured: ...`,
+    then `captured.assert_budget(n)` / `captured.assert_index_usage()`.
+    """
+    return QueryCapture
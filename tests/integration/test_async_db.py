@@ -0,0 +1,103 @@
+import asyncio
+import json
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.deps import get_db, principal_cache
+from app.db.base import Base
+from app.db.session import (
+    async_connect_args,
+    create_async_engine_from,
+    get_async_url,
+)
+from app.main import app
+
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path) -> Generator[TestClient, None, None]:
+    """
+    TestClient whose get_db yields native AsyncSessions (aiosqlite),
+    exercising the same code path as DB_ASYNC=true.
+    """
+    db_url = f"sqlite:///{tmp_path / 'async.db'}"
+    Base.metadata.create_all(bind=create_engine(db_url))
+
+    async_engine = create_async_engine(get_async_url(db_url), poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+    principal_cache.clear()
+
+
+def test_get_async_url_maps_drivers():
+    pg_url = get_async_url("postgresql://u:p@localhost:5432/db?sslmode=require")
+    assert pg_url.drivername == "postgresql+asyncpg"
+    assert "sslmode" not in pg_url.query
+
+    sqlite_url = get_async_url("sqlite:///./test.db")
+    assert sqlite_url.drivername == "sqlite+aiosqlite"
+
+
+def test_async_engine_connect_args_follow_driver(tmp_path):
+    pg_url = get_async_url("postgresql://u:p@localhost/db")
+    assert set(async_connect_args(pg_url)) == {"ssl", "statement_cache_size"}
+
+    # aiosqlite rejects asyncpg's options: the engine must connect without them
+    sqlite_engine = create_async_engine_from(f"sqlite:///{tmp_path / 'cfg.db'}")
+
+    async def select_one() -> int:
+        async with sqlite_engine.connect() as conn:
+            return (await conn.exec_driver_sql("SELECT 1")).scalar_one()
+
+    try:
+        assert asyncio.run(select_one()) == 1
+    finally:
+        asyncio.run(sqlite_engine.dispose())
+
+
+def test_async_session_task_lifecycle(async_client: TestClient):
+    async_client.post(
+        "/auth/register",
+        json={"email": "async@example.com", "password": "password123"},
+    )
+    login_res = async_client.post(
+        "/auth/login",
+        json={"email": "async@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+    response = async_client.post("/tasks", json={"title": "Async"}, headers=headers)
+    assert response.status_code == 201
+    task_id = response.json()["id"]
+
+    response = async_client.get("/tasks", headers=headers)
+    assert [t["id"] for t in response.json()] == [task_id]
+
+    response = async_client.get("/tasks/export", headers=headers)
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [task_id]
+
+    response = async_client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Async (Updated)", "status": "DONE"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "DONE"
+
+    response = async_client.delete(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 204
+    assert async_client.get(f"/tasks/{task_id}", headers=headers).status_code == 404
@@ -1,6 +1,15 @@
+import asyncio
+import threading
+
+import bcrypt
 from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.orm import Session
 import time
 
+from app.core import security
+from app.models.user import User
+
 
 def test_register_user(client: TestClient):
     response = client.post(
@@ -98,3 +107,83 @@ def test_refresh_token_invalid(client: TestClient):
     )
     assert response.status_code == 401
     assert response.json()["message"] == "Could not validate credentials"
+
+
+def test_login_sheds_load_when_hash_queue_full(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    client.post(
+        "/auth/register",
+        json={"email": "busy@example.com", "password": "password123"},
+    )
+    # A pool whose single slot is taken and which allows no queued work
+    saturated = security.PasswordHashPool(workers=1, max_pending=0)
+    saturated.in_flight = 1
+    monkeypatch.setattr(security, "password_hasher", saturated)
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "busy@example.com", "password": "password123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert "message" in response.json()
+
+
+def test_cancelled_hash_keeps_its_slot_until_done():
+    pool = security.PasswordHashPool(workers=1, max_pending=0, use_processes=False)
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_hash() -> str:
+        started.set()
+        finish.wait(5)
+        return "hash"
+
+    async def scenario() -> None:
+        caller = asyncio.create_task(pool.run(slow_hash))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()  # the client went away; bcrypt keeps running
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert pool.in_flight == 1
+        with pytest.raises(security.PasswordHasherBusyError):
+            await pool.run(slow_hash)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        finish.set()
+        pool.shutdown()
+    assert pool.in_flight == 0
+
+
+def test_login_rehashes_password_with_stale_cost(
+    client: TestClient, db_session: Session
+):
+    # Any cost other than the current one is stale (tests hash at the minimum)
+    stale_rounds = security.bcrypt_rounds + 1
+    legacy_hash = bcrypt.hashpw(
+        b"password123", bcrypt.gensalt(rounds=stale_rounds)
+    ).decode()
+    user = User(email="legacy@example.com", hashed_password=legacy_hash)
+    db_session.add(user)
+    db_session.commit()
+    assert security.needs_rehash(user.hashed_password)
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "legacy@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+
+    db_session.refresh(user)
+    assert user.hashed_password != legacy_hash
+    assert not security.needs_rehash(user.hashed_password)
+    assert security.verify_password("password123", user.hashed_password)
+
+
+def test_calibrate_bcrypt_rounds_respects_floor(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(security, "bcrypt_rounds", security.bcrypt_rounds)
+    rounds = security.calibrate_bcrypt_rounds(target_ms=1)
+    assert rounds == security.BCRYPT_MIN_ROUNDS
+    assert security.bcrypt_rounds == rounds
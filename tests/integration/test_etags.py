@@ -0,0 +1,137 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.user import User
+
+
+def create_task(client: TestClient, headers: dict, title: str = "Task") -> dict:
+    response = client.post("/tasks", json={"title": title}, headers=headers)
+    assert response.status_code == 201
+    return response
+
+
+def test_read_task_not_modified(client: TestClient, auth_headers: dict):
+    task_id = create_task(client, auth_headers).json()["id"]
+
+    response = client.get(f"/tasks/{task_id}", headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"/tasks/{task_id}", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    client.put(f"/tasks/{task_id}", json={"title": "Changed"}, headers=auth_headers)
+    response = client.get(
+        f"/tasks/{task_id}", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_etag_changes_on_write(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    etag = client.get("/tasks", headers=auth_headers).headers["ETag"]
+    conditional = {**auth_headers, "If-None-Match": etag}
+    assert client.get("/tasks", headers=conditional).status_code == 304
+
+    task_id = create_task(client, auth_headers).json()["id"]
+    response = client.get("/tasks", headers=conditional)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    client.delete(f"/tasks/{task_id}", headers=auth_headers)
+    assert (
+        client.get(
+            "/tasks", headers={**auth_headers, "If-None-Match": etag}
+        ).status_code
+        == 200
+    )
+
+    # A task write does not count as a change to the user itself
+    db_session.expire_all()
+    assert db_session.get(User, test_user.id).updated_at is None
+
+
+def test_update_with_stale_if_match_fails(
+    client: TestClient, auth_headers: dict, db_session: Session
+):
+    created = create_task(client, auth_headers)
+    task_id = created.json()["id"]
+    stale = created.headers["ETag"]
+
+    response = client.put(
+        f"/tasks/{task_id}", json={"title": "First"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    current = response.headers["ETag"]
+    assert current != stale
+
+    response = client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Lost update"},
+        headers={**auth_headers, "If-Match": stale},
+    )
+    assert response.status_code == 412
+    db_session.expire_all()
+    assert db_session.query(Task).one().title == "First"
+
+    response = client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Second"},
+        headers={**auth_headers, "If-Match": current},
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Second"
+
+
+def test_weak_if_match_does_not_match(client: TestClient, auth_headers: dict):
+    created = create_task(client, auth_headers)
+    task_id = created.json()["id"]
+    weak = f"W/{created.headers['ETag']}"
+
+    response = client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Changed"},
+        headers={**auth_headers, "If-Match": weak},
+    )
+    assert response.status_code == 412
+
+    response = client.delete(
+        f"/tasks/{task_id}", headers={**auth_headers, "If-Match": weak}
+    )
+    assert response.status_code == 412
+
+    # If-None-Match keeps weak comparison
+    response = client.get(
+        f"/tasks/{task_id}", headers={**auth_headers, "If-None-Match": weak}
+    )
+    assert response.status_code == 304
+
+
+def test_delete_with_if_match(client: TestClient, auth_headers: dict):
+    created = create_task(client, auth_headers)
+    task_id = created.json()["id"]
+    client.put(f"/tasks/{task_id}", json={"title": "Changed"}, headers=auth_headers)
+
+    response = client.delete(
+        f"/tasks/{task_id}",
+        headers={**auth_headers, "If-Match": created.headers["ETag"]},
+    )
+    assert response.status_code == 412
+
+    response = client.delete(
+        f"/tasks/{task_id}", headers={**auth_headers, "If-Match": "*"}
+    )
+    assert response.status_code == 204
+
+    # A missing task is still a 404, even with a precondition
+    response = client.delete(
+        f"/tasks/{task_id}", headers={**auth_headers, "If-Match": "*"}
+    )
+    assert response.status_code == 404
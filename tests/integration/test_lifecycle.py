@@ -0,0 +1,88 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.orm import Session
+
+from app.api.routes.tasks import list_tasks_query, warmup_queries
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.db import session
+from app.db.base import Base
+from app.db.warmup import warm_up_engines
+
+
+def test_ready_after_startup(client: TestClient):
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+def test_draining_turns_requests_away(client: TestClient):
+    lifecycle.start_draining()
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.headers["Connection"] == "close"
+    assert response.headers["Retry-After"] == "1"
+    assert "message" in response.json()
+
+
+def test_drain_gives_up_after_timeout(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(lifecycle, "in_flight", 1)
+    monkeypatch.setattr(lifecycle, "draining", False)
+    assert asyncio.run(lifecycle.drain(0.1)) is False
+    assert lifecycle.draining
+
+
+def test_warm_up_fills_pool_and_primes_statement_cache(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", pool_size=3)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(session, "replica_engines", [])
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+
+    asyncio.run(warm_up_engines(warmup_queries()))
+    assert engine.pool.checkedin() == 3
+
+    # A request's page query (another owner, same shape) is not compiled again
+    cache_hits = []
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        cache_hits.append(context.cache_hit == CACHE_HIT)
+
+    with Session(engine) as db:
+        db.scalars(list_tasks_query(uuid.uuid4()).limit(11)).all()
+    assert cache_hits == [True]
+    engine.dispose()
+
+
+def test_warm_up_failure_does_not_block_startup(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'x.db'}")
+    monkeypatch.setattr(session, "engine", unreachable)
+    monkeypatch.setattr(session, "replica_engines", [])
+
+    asyncio.run(warm_up_engines(warmup_queries()))
+    assert unreachable.pool.checkedin() == 0
+
+
+def test_warm_up_skips_sync_engines_in_async_mode(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    engine = create_engine(f"sqlite:///{tmp_path / 'idle.db'}")
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(session, "replica_engines", [])
+    monkeypatch.setattr(session, "async_engine", None)
+    monkeypatch.setattr(session, "async_replica_engines", [])
+    monkeypatch.setattr(settings, "DB_ASYNC", True)
+
+    asyncio.run(warm_up_engines(warmup_queries()))
+    assert engine.pool.checkedin() == 0
@@ -0,0 +1,103 @@
+import io
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.logging import (
+    REQUEST_ID_HEADER,
+    JsonFormatter,
+    LogQueueHandler,
+    SamplingFilter,
+    setup_logging,
+    stop_logging,
+)
+
+
+@pytest.fixture
+def json_log() -> io.StringIO:
+    """
+    Route the app's logging through the queue into a buffer, as JSON lines.
+    """
+    stream = io.StringIO()
+    setup_logging(log_format="json", stream=stream)
+    yield stream
+    setup_logging(stream=sys.stdout)
+
+
+def read_lines(stream: io.StringIO) -> list[dict]:
+    stop_logging()  # flushes the queue
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_request_lines_are_json_with_request_id(
+    client: TestClient, auth_headers: dict, json_log: io.StringIO
+):
+    response = client.get(
+        "/tasks", headers={**auth_headers, REQUEST_ID_HEADER: "req-123"}
+    )
+    assert response.headers[REQUEST_ID_HEADER] == "req-123"
+
+    (line,) = [e for e in read_lines(json_log) if e["logger"] == "app.request"]
+    assert line["request_id"] == "req-123"
+    assert line["route"] == "/tasks"
+    assert line["status"] == 200
+    assert line["level"] == "INFO"
+
+
+def test_unsafe_request_ids_are_replaced(client: TestClient):
+    response = client.get("/health", headers={REQUEST_ID_HEADER: "bad id\n"})
+    assert response.headers[REQUEST_ID_HEADER] != "bad id\n"
+    assert len(response.headers[REQUEST_ID_HEADER]) == 32
+
+
+def test_json_formatter_renders_extras_and_traceback():
+    try:
+        raise ValueError("Boom!")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test",
+            logging.ERROR,
+            __file__,
+            1,
+            "failed %s",
+            ("here",),
+            sys.exc_info(),
+            extra={"route": "/tasks"},
+        )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed here"
+    assert entry["route"] == "/tasks"
+    assert "ValueError: Boom!" in entry["exception"]
+
+
+def test_sampling_is_per_request_and_spares_warnings():
+    sampling = SamplingFilter(0.5, ["app.request"])
+
+    def record(level: int, request_id: str, name: str = "app.request"):
+        entry = logging.LogRecord(name, level, __file__, 1, "msg", (), None)
+        entry.request_id = request_id
+        return entry
+
+    decisions = {sampling.filter(record(logging.INFO, f"req-{i}")) for i in range(50)}
+    assert decisions == {True, False}
+    assert sampling.filter(record(logging.INFO, "req-7")) == sampling.filter(
+        record(logging.INFO, "req-7")
+    )
+    assert all(sampling.filter(record(logging.WARNING, f"r{i}")) for i in range(20))
+    assert all(
+        sampling.filter(record(logging.INFO, f"r{i}", "other")) for i in range(20)
+    )
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = LogQueueHandler(queue.Queue(maxsize=1))
+    for _ in range(3):
+        handler.emit(
+            logging.LogRecord("test", logging.INFO, __file__, 1, "m", (), None)
+        )
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
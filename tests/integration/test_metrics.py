@@ -0,0 +1,124 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import Histogram, registry
+from app.db import pool as db_pool
+from app.db.pool import TimedQueuePool, instrument_engine
+
+
+def sample(body: str, line_prefix: str) -> float:
+    """
+    Value of the first exposition line starting with `line_prefix`.
+    """
+    for line in body.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in metrics")
+
+
+def test_metrics_record_routes_by_template(client: TestClient, auth_headers: dict):
+    before = client.get("/metrics").text
+    client.get("/tasks", headers=auth_headers)
+    client.get(f"/tasks/{uuid.uuid4()}", headers=auth_headers)
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+
+    list_count = (
+        'http_request_duration_seconds_count{method="GET",route="/tasks",status="200"}'
+    )
+    previous = sample(before, list_count) if list_count in before else 0
+    assert sample(body, list_count) == previous + 1
+    assert (
+        sample(
+            body,
+            'http_request_duration_seconds_count{method="GET",route="/tasks/{id}",status="404"}',
+        )
+        >= 1
+    )
+    assert 'route="unmatched",status="404"' in body
+    # The scrape itself is in flight while the metrics are rendered
+    assert sample(body, "http_requests_in_flight ") == 1
+    assert "# TYPE db_pool_checked_out gauge" in body
+    assert 'response_cache_events_total{event="hits"}' in body
+
+
+def test_metrics_record_password_hashing(client: TestClient, test_user):
+    client.post(
+        "/auth/login",
+        json={"email": test_user.email, "password": "password123"},
+    )
+    body = client.get("/metrics").text
+    assert (
+        sample(
+            body, 'password_hash_duration_seconds_count{operation="verify_password"}'
+        )
+        >= 1
+    )
+    assert "password_hash_in_flight 0" in body
+
+
+def test_metrics_export_principal_cache_events(client: TestClient, auth_headers: dict):
+    before = client.get("/metrics").text
+    client.get("/auth/me", headers=auth_headers)
+    client.get("/auth/me", headers=auth_headers)
+    body = client.get("/metrics").text
+
+    hits = 'principal_cache_events_total{event="hits"}'
+    misses = 'principal_cache_events_total{event="misses"}'
+    assert sample(body, hits) == sample(before, hits) + 1
+    assert sample(body, misses) == sample(before, misses) + 1
+    assert 'principal_cache_events_total{event="evictions"}' in body
+
+
+def test_pool_metrics_follow_checkouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=2
+    )
+    instrument_engine(engine, "test")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            body = registry.render()
+            assert sample(body, 'db_pool_checked_out{pool="test"}') == 1
+            assert sample(body, 'db_pool_size{pool="test"}') == 2
+
+        body = registry.render()
+        assert sample(body, 'db_pool_checked_out{pool="test"}') == 0
+        assert sample(body, 'db_pool_checkouts_total{pool="test"}') == 1
+        assert sample(body, 'db_pool_connections_created_total{pool="test"}') == 1
+        assert sample(body, 'db_pool_checkout_wait_seconds_count{pool="test"}') == 1
+
+        # dispose() replaces the pool; the metrics follow the new one
+        engine.dispose()
+        with engine.connect():
+            body = registry.render()
+            assert sample(body, 'db_pool_checked_out{pool="test"}') == 1
+        body = registry.render()
+        assert sample(body, 'db_pool_checkouts_total{pool="test"}') == 2
+        assert sample(body, 'db_pool_checkout_wait_seconds_count{pool="test"}') == 2
+    finally:
+        db_pool.engines.pop("test")
+        engine.dispose()
+
+
+def test_histogram_exposition():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route='/a"b')
+    histogram.observe(0.5, route='/a"b')
+    histogram.observe(5, route='/a"b')
+
+    assert histogram.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a\\"b"} 5.55',
+        'latency_seconds_count{route="/a\\"b"} 3',
+    ]
@@ -1,4 +1,10 @@
 from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from app.api.deps import principal_cache
+from app.core.config import settings
+from app.models.user import User
 
 
 def test_read_users_me_success(client: TestClient):
@@ -34,3 +40,42 @@ def test_read_users_me_invalid_token(client: TestClient):
     )
     assert response.status_code == 401
     assert response.json()["message"] == "Could not validate credentials"
+
+
+def test_access_token_carries_user_id(client: TestClient):
+    register_res = client.post(
+        "/auth/register",
+        json={"email": "uid@example.com", "password": "password123"},
+    )
+    login_res = client.post(
+        "/auth/login",
+        json={"email": "uid@example.com", "password": "password123"},
+    )
+    payload = jwt.decode(
+        login_res.json()["access_token"],
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+    )
+    assert payload["uid"] == register_res.json()["id"]
+
+
+def test_current_user_is_cached_per_token(client: TestClient, auth_headers: dict):
+    before = principal_cache.stats()
+    client.get("/auth/me", headers=auth_headers)
+    client.get("/auth/me", headers=auth_headers)
+    after = principal_cache.stats()
+
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_deleted_user_is_evicted_from_cache(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    assert client.get("/auth/me", headers=auth_headers).status_code == 200
+
+    db_session.delete(test_user)
+    db_session.commit()
+
+    response = client.get("/auth/me", headers=auth_headers)
+    assert response.status_code == 401
@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import principal_cache
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from query_budget import query_budget
+
+# Budgets are the current counts of a cold request (the user is loaded from
+# the database): raising one needs a reason. Writes also bump the list
+# version and upsert the counters.
+
+
+@pytest.fixture
+def task(db_session: Session, test_user: User) -> Task:
+    task = Task(title="Budgeted", status=TaskStatus.TODO, owner_id=test_user.id)
+    db_session.add(task)
+    db_session.commit()
+    db_session.refresh(task)  # loaded now, not inside the budgeted test
+    return task
+
+
+@pytest.fixture
+def cold(db_session: Session) -> None:
+    """
+    Request last: the app shares the test's session, so empty its identity
+    map (and the principal cache) to make the request load the user itself.
+    """
+    db_session.expunge_all()
+    principal_cache.clear()
+
+
+@query_budget(4)
+def test_create_task_budget(client: TestClient, auth_headers: dict, cold: None):
+    response = client.post("/tasks", json={"title": "New"}, headers=auth_headers)
+    assert response.status_code == 201
+
+
+@query_budget(3)
+def test_read_tasks_budget(
+    client: TestClient, auth_headers: dict, task: Task, cold: None
+):
+    response = client.get("/tasks?status=TODO", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@query_budget(2)
+def test_read_task_budget(
+    client: TestClient, auth_headers: dict, task: Task, cold: None
+):
+    response = client.get(f"/tasks/{task.id}", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@query_budget(5)
+def test_update_task_budget(
+    client: TestClient, auth_headers: dict, task: Task, cold: None
+):
+    response = client.put(
+        f"/tasks/{task.id}",
+        json={"title": "Done", "status": "DONE"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+
+@query_budget(4)
+def test_delete_task_budget(
+    client: TestClient, auth_headers: dict, task: Task, cold: None
+):
+    response = client.delete(f"/tasks/{task.id}", headers=auth_headers)
+    assert response.status_code == 204
+
+
+@pytest.mark.sqlite_only
+def test_over_budget_failure_lists_statements(
+    client: TestClient, auth_headers: dict, capture_queries
+):
+    with capture_queries() as captured:
+        client.get("/tasks", headers=auth_headers)
+
+    with pytest.raises(pytest.fail.Exception) as failure:
+        captured.assert_budget(1)
+    message = str(failure.value)
+    assert "SQL statements issued, budget is 1:" in message
+    assert "FROM tasks WHERE tasks.owner_id = ?" in message
+
+
+@pytest.mark.sqlite_only
+def test_unindexed_task_query_is_reported(db_session: Session, capture_queries):
+    with capture_queries() as captured:
+        db_session.scalars(select(Task).where(Task.description == "x")).all()
+
+    with pytest.raises(pytest.fail.Exception) as failure:
+        captured.assert_index_usage()
+    assert "SCAN tasks" in str(failure.value)
+    assert "WHERE tasks.description = ?" in str(failure.value)
@@ -0,0 +1,118 @@
+import asyncio
+import time
+import uuid
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.core import security
+from app.core.cache import CachedResponse, MemoryBackend, ResponseCache
+from app.db import session
+from app.db.base import Base
+from app.db.routing import READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER
+from app.main import app
+from app.models.task import Task
+from app.models.user import User
+
+
+@pytest.fixture(scope="function")
+def replicated(tmp_path, monkeypatch) -> Generator[tuple[TestClient, dict], None, None]:
+    """
+    TestClient on the real get_db, with a primary and one replica database.
+    Both hold the same user; each holds one task the other does not, so
+    responses show which database served them.
+    """
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / name}.db",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        engines[name] = engine
+
+    user = User(
+        id=uuid.uuid4(),
+        email="replica@example.com",
+        hashed_password=security.get_password_hash("password123"),
+    )
+    for name, engine in engines.items():
+        with sessionmaker(bind=engine)() as db:
+            db.merge(user)
+            db.add(Task(title=f"On {name}", owner_id=user.id))
+            db.commit()
+
+    monkeypatch.setattr(
+        deps, "SessionLocal", sessionmaker(autoflush=False, bind=engines["primary"])
+    )
+    monkeypatch.setattr(session, "replica_engines", [engines["replica"]])
+    token = security.create_access_token(subject=user.email, user_id=user.id)
+    with TestClient(app) as c:
+        yield c, {"Authorization": f"Bearer {token}"}
+    deps.principal_cache.clear()
+    for engine in engines.values():
+        engine.dispose()
+
+
+def titles(response) -> list[str]:
+    return [task["title"] for task in response.json()]
+
+
+def test_reads_go_to_replica_and_writes_to_primary(replicated):
+    client, headers = replicated
+    assert titles(client.get("/tasks", headers=headers)) == ["On replica"]
+
+    response = client.post("/tasks", json={"title": "New"}, headers=headers)
+    assert response.status_code == 201
+    assert READ_PRIMARY_HEADER in response.headers
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+
+def test_client_is_pinned_to_primary_after_writing(replicated):
+    client, headers = replicated
+    client.post("/tasks", json={"title": "New"}, headers=headers)
+
+    # The cookie keeps this client on the primary: its new task is visible
+    assert titles(client.get("/tasks", headers=headers)) == ["On primary", "New"]
+
+    client.cookies.clear()
+    assert titles(client.get("/tasks", headers=headers)) == ["On replica"]
+
+
+def test_pin_can_be_sent_as_header(replicated):
+    client, headers = replicated
+    response = client.post("/tasks", json={"title": "New"}, headers=headers)
+    pin = response.headers[READ_PRIMARY_HEADER]
+    client.cookies.clear()
+
+    pinned = {**headers, READ_PRIMARY_HEADER: pin}
+    assert titles(client.get("/tasks", headers=pinned)) == ["On primary", "New"]
+
+    expired = {**headers, READ_PRIMARY_HEADER: str(int(time.time() * 1000) - 1)}
+    assert titles(client.get("/tasks", headers=expired)) == ["On replica"]
+
+
+def test_failed_writes_do_not_pin(replicated):
+    client, headers = replicated
+    response = client.post("/tasks", json={"title": ""}, headers=headers)
+    assert response.status_code == 422
+    assert READ_PRIMARY_HEADER not in response.headers
+    assert titles(client.get("/tasks", headers=headers)) == ["On replica"]
+
+
+def test_cache_skips_replica_reads_under_a_fresh_version():
+    response_cache = ResponseCache(MemoryBackend(1024 * 1024, 60), 60, 1024)
+    rendered = CachedResponse(body=b"[]")
+
+    async def scenario():
+        key = await response_cache.key(uuid.uuid4(), "x")
+        await response_cache.set(key, rendered, min_version_age=5)
+        assert await response_cache.get(key) is None
+        await response_cache.set(key, rendered)
+        assert await response_cache.get(key) == rendered
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+import logging
+import re
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.instrumentation import QueryStats, current_query_stats, normalize_sql
+from app.models.task import Task
+from app.models.user import User
+
+
+def request_records(caplog) -> list[logging.LogRecord]:
+    return [record for record in caplog.records if record.name == "app.request"]
+
+
+def test_server_timing_counts_statements(client: TestClient, auth_headers: dict):
+    response = client.get("/tasks", headers=auth_headers)
+    assert response.status_code == 200
+    match = re.fullmatch(
+        r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+',
+        response.headers["Server-Timing"],
+    )
+    assert match
+    # List version/total and the page (the user is already in the session)
+    assert int(match.group(1)) >= 2
+
+
+def test_request_log_carries_db_fields(client: TestClient, auth_headers: dict, caplog):
+    with caplog.at_level(logging.INFO, logger="app.request"):
+        client.post("/tasks", json={"title": "Logged"}, headers=auth_headers)
+
+    (record,) = request_records(caplog)
+    assert record.method == "POST"
+    assert record.route == "/tasks"
+    assert record.status == 201
+    # Statements run after the response is sent (commit) are included
+    assert record.db_statements >= 3
+    assert record.db_time_ms > 0
+
+
+def test_slow_queries_are_logged(
+    client: TestClient, auth_headers: dict, caplog, monkeypatch
+):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        client.get("/tasks", headers=auth_headers)
+    slow = [r for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert slow
+    assert any(record.sql.startswith("SELECT tasks.") for record in slow)
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_SAMPLE_RATE", 0)
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        client.get("/tasks", headers=auth_headers)
+    assert not [r for r in caplog.records if r.getMessage().startswith("Slow query")]
+
+
+def test_repeated_statements_are_flagged(
+    client: TestClient, auth_headers: dict, caplog, monkeypatch
+):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 0)
+    with caplog.at_level(logging.WARNING, logger="app.request"):
+        client.get("/tasks", headers=auth_headers)
+    assert any(
+        r.getMessage().startswith("Possible N+1") for r in request_records(caplog)
+    )
+
+
+def test_query_stats_group_statements_by_shape(db_session: Session, test_user: User):
+    tasks = [Task(title=f"Task {i}", owner_id=test_user.id) for i in range(3)]
+    db_session.add_all(tasks)
+    db_session.commit()
+    ids = [task.id for task in tasks]
+
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        for id in ids:
+            db_session.execute(select(Task.title).where(Task.id == id)).one()
+        db_session.execute(select(Task).where(Task.id.in_(ids)))
+    finally:
+        current_query_stats.reset(token)
+
+    assert stats.statements == 4
+    assert [count for _, count in stats.repeated(2)] == [3]
+    assert (
+        normalize_sql(
+            "SELECT * FROM tasks WHERE id IN (%(id_1)s, %(id_2)s) AND title = 'x'"
+        )
+        == "SELECT * FROM tasks WHERE id IN (?) AND title = ?"
+    )
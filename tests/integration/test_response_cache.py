@@ -0,0 +1,208 @@
+import asyncio
+import socket
+import threading
+import time
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.core.cache import MemoryBackend, RedisBackend, ResponseCache, TTLCache
+from app.core.redis import encode_command, read_reply
+from app.models.task import Task
+from app.models.user import User
+
+
+class FakeRedisServer:
+    """
+    Local stand-in for Redis: GET and SET (PX, NX) over RESP on a free port.
+    """
+
+    def __init__(self):
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self) -> str:
+        self.thread.start()
+        server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.handle, "127.0.0.1", 0), self.loop
+        ).result()
+        self.server = server
+        port = server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def shutdown(self) -> None:
+        self.server.close()
+        handlers = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while (command := await read_reply(reader)) is not None:
+            writer.write(self.reply(command))
+            await writer.drain()
+        writer.close()
+
+    def reply(self, command: list[bytes]) -> bytes:
+        name, key = command[0].upper(), command[1]
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            entry = self.data.pop(key)
+            entry = None
+        if name == b"GET":
+            return b"$-1\r\n" if entry is None else encode_command((entry[0],))[4:]
+        if name == b"SET":
+            options = [part.upper() for part in command[3:]]
+            if b"NX" in options and entry is not None:
+                return b"$-1\r\n"
+            deadline = None
+            if b"PX" in options:
+                deadline = (
+                    time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+                )
+            self.data[key] = (command[2], deadline)
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def memory_cache(monkeypatch) -> ResponseCache:
+    response_cache = ResponseCache(
+        MemoryBackend(max_bytes=1024 * 1024, ttl=60), ttl=60, max_entry_bytes=64 * 1024
+    )
+    monkeypatch.setattr(cache, "response_cache", response_cache)
+    return response_cache
+
+
+@pytest.fixture
+def redis_url() -> Generator[str, None, None]:
+    server = FakeRedisServer()
+    yield server.start()
+    server.stop()
+
+
+def add_task_behind_the_api(db_session: Session, user: User, title: str) -> None:
+    # Writes that bypass the routes do not invalidate, exposing cached reads
+    db_session.add(Task(title=title, owner_id=user.id))
+    db_session.commit()
+
+
+def test_list_served_from_cache_until_write(
+    client: TestClient,
+    auth_headers: dict,
+    db_session: Session,
+    test_user: User,
+    memory_cache: ResponseCache,
+):
+    client.post("/tasks", json={"title": "First"}, headers=auth_headers)
+    first = client.get("/tasks", headers=auth_headers)
+    assert [task["title"] for task in first.json()] == ["First"]
+
+    add_task_behind_the_api(db_session, test_user, "Hidden")
+    cached = client.get("/tasks", headers=auth_headers)
+    assert cached.json() == first.json()
+    assert cached.headers["ETag"] == first.headers["ETag"]
+    assert memory_cache.stats()["hits"] == 1
+
+    response = client.get(
+        "/tasks", headers={**auth_headers, "If-None-Match": first.headers["ETag"]}
+    )
+    assert response.status_code == 304
+
+    client.post("/tasks", json={"title": "Second"}, headers=auth_headers)
+    response = client.get("/tasks", headers=auth_headers)
+    assert [task["title"] for task in response.json()] == ["First", "Hidden", "Second"]
+
+
+def test_task_cache_invalidated_by_update(
+    client: TestClient, auth_headers: dict, memory_cache: ResponseCache
+):
+    task_id = client.post(
+        "/tasks", json={"title": "Draft"}, headers=auth_headers
+    ).json()["id"]
+    assert (
+        client.get(f"/tasks/{task_id}", headers=auth_headers).json()["title"] == "Draft"
+    )
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers).status_code == 200
+    assert memory_cache.stats()["hits"] == 1
+
+    client.put(f"/tasks/{task_id}", json={"title": "Final"}, headers=auth_headers)
+    assert (
+        client.get(f"/tasks/{task_id}", headers=auth_headers).json()["title"] == "Final"
+    )
+
+    client.delete(f"/tasks/{task_id}", headers=auth_headers)
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers).status_code == 404
+
+
+def test_redis_backend_is_shared_between_workers(
+    client: TestClient,
+    auth_headers: dict,
+    db_session: Session,
+    test_user: User,
+    redis_url: str,
+    monkeypatch,
+):
+    worker_a = ResponseCache(RedisBackend(redis_url), ttl=60, max_entry_bytes=64 * 1024)
+    worker_b = ResponseCache(RedisBackend(redis_url), ttl=60, max_entry_bytes=64 * 1024)
+
+    monkeypatch.setattr(cache, "response_cache", worker_a)
+    client.post("/tasks", json={"title": "First"}, headers=auth_headers)
+    client.get("/tasks", headers=auth_headers)
+
+    add_task_behind_the_api(db_session, test_user, "Hidden")
+    monkeypatch.setattr(cache, "response_cache", worker_b)
+    assert len(client.get("/tasks", headers=auth_headers).json()) == 1
+    assert worker_b.stats()["hits"] == 1
+
+    # A write handled by one worker invalidates the other's reads
+    client.post("/tasks", json={"title": "Second"}, headers=auth_headers)
+    monkeypatch.setattr(cache, "response_cache", worker_a)
+    assert len(client.get("/tasks", headers=auth_headers).json()) == 3
+
+
+def test_unreachable_backend_falls_back_to_database(
+    client: TestClient, auth_headers: dict, monkeypatch
+):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    response_cache = ResponseCache(
+        RedisBackend(f"redis://127.0.0.1:{port}/0"), ttl=60, max_entry_bytes=64 * 1024
+    )
+    monkeypatch.setattr(cache, "response_cache", response_cache)
+
+    client.post("/tasks", json={"title": "Task"}, headers=auth_headers)
+    response = client.get("/tasks", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response_cache.stats()["errors"] >= 2
+
+
+def test_ttl_cache_evicts_by_bytes():
+    lru: TTLCache[str, bytes] = TTLCache(maxsize=100, ttl=60, max_bytes=10)
+    lru.set("a", b"1234")
+    lru.set("b", b"1234")
+    lru.get("a")
+    lru.set("c", b"1234")
+    assert lru.get("b") is None
+    assert lru.get("a") == b"1234"
+    assert lru.stats()["bytes"] == 8
+    assert lru.stats()["evictions"] == 1
+
+    # An entry larger than the whole budget is not stored
+    lru.set("d", b"x" * 11)
+    assert lru.get("d") is None
+    assert lru.stats()["bytes"] == 8
@@ -0,0 +1,123 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.counters import rebuild_task_counters
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.models.user import User
+
+
+def stats(client: TestClient, headers: dict) -> dict:
+    response = client.get("/tasks/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def counters_match_tasks(db_session: Session) -> bool:
+    db_session.expire_all()
+    counted = {
+        (owner_id, status): count
+        for owner_id, status, count in db_session.execute(
+            select(Task.owner_id, Task.status, func.count()).group_by(
+                Task.owner_id, Task.status
+            )
+        )
+    }
+    stored = {
+        (counter.owner_id, counter.status): counter.count
+        for counter in db_session.scalars(select(TaskCounter))
+        if counter.count
+    }
+    return counted == stored
+
+
+def test_counters_follow_every_write(
+    client: TestClient, auth_headers: dict, db_session: Session
+):
+    assert stats(client, auth_headers) == {
+        "total": 0,
+        "by_status": {"TODO": 0, "IN_PROGRESS": 0, "DONE": 0},
+    }
+
+    task_id = client.post("/tasks", json={"title": "One"}, headers=auth_headers).json()[
+        "id"
+    ]
+    client.post(
+        "/tasks/batch",
+        json={"items": [{"title": "Two"}, {"title": "Three", "status": "DONE"}]},
+        headers=auth_headers,
+    )
+    client.post(
+        "/tasks/import",
+        content=b'{"title": "Four", "status": "IN_PROGRESS"}\n',
+        headers=auth_headers,
+    )
+    assert stats(client, auth_headers)["by_status"] == {
+        "TODO": 2,
+        "IN_PROGRESS": 1,
+        "DONE": 1,
+    }
+
+    client.put(
+        f"/tasks/{task_id}",
+        json={"title": "One", "status": "DONE"},
+        headers=auth_headers,
+    )
+    # Title-only updates leave counts alone
+    client.put(f"/tasks/{task_id}", json={"title": "Renamed"}, headers=auth_headers)
+    client.patch(
+        "/tasks/batch",
+        json={"filter": {"status": "DONE"}, "changes": {"status": "IN_PROGRESS"}},
+        headers=auth_headers,
+    )
+    assert stats(client, auth_headers)["by_status"] == {
+        "TODO": 1,
+        "IN_PROGRESS": 3,
+        "DONE": 0,
+    }
+
+    client.delete(f"/tasks/{task_id}", headers=auth_headers)
+    client.request(
+        "DELETE",
+        "/tasks/batch",
+        json={"filter": {"status": "TODO"}},
+        headers=auth_headers,
+    )
+    assert stats(client, auth_headers) == {
+        "total": 2,
+        "by_status": {"TODO": 0, "IN_PROGRESS": 2, "DONE": 0},
+    }
+    assert counters_match_tasks(db_session)
+
+
+def test_list_total_count_header(client: TestClient, auth_headers: dict):
+    for i in range(3):
+        client.post("/tasks", json={"title": f"Todo {i}"}, headers=auth_headers)
+    client.post(
+        "/tasks", json={"title": "Done", "status": "DONE"}, headers=auth_headers
+    )
+
+    response = client.get("/tasks?limit=2", headers=auth_headers)
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == "4"
+
+    response = client.get("/tasks?status=TODO", headers=auth_headers)
+    assert response.headers["X-Total-Count"] == "3"
+
+    # Date filters cannot be answered from the counters
+    response = client.get(
+        "/tasks?created_after=2000-01-01T00:00:00Z", headers=auth_headers
+    )
+    assert len(response.json()) == 4
+    assert "X-Total-Count" not in response.headers
+
+
+def test_rebuild_task_counters(db_session: Session, test_user: User):
+    db_session.add_all(Task(title=f"Task {i}", owner_id=test_user.id) for i in range(3))
+    db_session.commit()
+    assert not counters_match_tasks(db_session)
+
+    rebuild_task_counters(db_session)
+    db_session.commit()
+    assert counters_match_tasks(db_session)
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 import uuid
@@ -75,9 +77,16 @@ def test_read_tasks_own_only(
 def test_read_tasks_pagination(
     client: TestClient, auth_headers: dict, db_session: Session, test_user: User
 ):
-    # Create 15 tasks
+    # Create 15 tasks (list order is by created_at, so make it explicit)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
     for i in range(15):
-        db_session.add(Task(title=f"Task {i}", owner_id=test_user.id))
+        db_session.add(
+            Task(
+                title=f"Task {i}",
+                owner_id=test_user.id,
+                created_at=base + timedelta(seconds=i),
+            )
+        )
     db_session.commit()
 
     # Default limit is 10
@@ -95,6 +104,46 @@ def test_read_tasks_pagination(
     assert response.json()[0]["title"] == "Task 5"
 
 
+def test_read_tasks_cursor_pagination(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    # Tasks sharing a created_at must still page without gaps or repeats
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        db_session.add(
+            Task(
+                title=f"Task {i}",
+                owner_id=test_user.id,
+                created_at=base + timedelta(seconds=i // 2),
+            )
+        )
+    db_session.commit()
+
+    seen = []
+    response = client.get("/tasks?limit=3", headers=auth_headers)
+    while True:
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            assert "Link" not in response.headers
+            break
+        assert 'rel="next"' in response.headers["Link"]
+        response = client.get(
+            "/tasks",
+            params={"limit": 3, "cursor": response.headers["X-Next-Cursor"]},
+            headers=auth_headers,
+        )
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+def test_read_tasks_invalid_cursor(client: TestClient, auth_headers: dict):
+    response = client.get("/tasks?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid cursor"
+
+
 def test_read_task_success(
     client: TestClient, auth_headers: dict, db_session: Session, test_user: User
 ):
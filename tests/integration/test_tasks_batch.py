@@ -0,0 +1,142 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+
+def test_batch_create_preserves_order(client: TestClient, auth_headers: dict):
+    items = [{"title": f"Task {i}", "status": "IN_PROGRESS"} for i in range(5)]
+    response = client.post("/tasks/batch", json={"items": items}, headers=auth_headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert [task["title"] for task in data] == [f"Task {i}" for i in range(5)]
+    assert all(task["status"] == "IN_PROGRESS" for task in data)
+    assert len({task["id"] for task in data}) == 5
+
+    response = client.get("/tasks", headers=auth_headers)
+    assert len(response.json()) == 5
+
+
+def test_batch_create_is_all_or_nothing(client: TestClient, auth_headers: dict):
+    items = [{"title": "Valid"}, {"title": ""}]
+    response = client.post("/tasks/batch", json={"items": items}, headers=auth_headers)
+    assert response.status_code == 422
+    assert client.get("/tasks", headers=auth_headers).json() == []
+
+
+def test_batch_update_by_ids(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    tasks = [Task(title=f"Task {i}", owner_id=test_user.id) for i in range(3)]
+    db_session.add_all(tasks)
+    db_session.commit()
+    ids = [str(task.id) for task in tasks[:2]]
+    missing = str(uuid.uuid4())
+
+    response = client.patch(
+        "/tasks/batch",
+        json={"ids": ids + [missing], "changes": {"status": "DONE"}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(task["id"] for task in data["updated"]) == sorted(ids)
+    assert all(task["status"] == "DONE" for task in data["updated"])
+    assert data["not_found"] == [missing]
+
+    db_session.expire_all()
+    assert db_session.get(Task, tasks[2].id).status == TaskStatus.TODO
+
+
+def test_batch_update_by_filter_is_scoped_to_owner(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    other_user = User(
+        email="other@example.com",
+        hashed_password=security.get_password_hash("pass"),
+    )
+    db_session.add(other_user)
+    db_session.commit()
+    db_session.add_all(
+        [
+            Task(title="Mine", owner_id=test_user.id),
+            Task(title="Theirs", owner_id=other_user.id),
+        ]
+    )
+    db_session.commit()
+
+    response = client.patch(
+        "/tasks/batch",
+        json={"filter": {"status": "TODO"}, "changes": {"status": "IN_PROGRESS"}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()["updated"]] == ["Mine"]
+
+    db_session.expire_all()
+    theirs = db_session.query(Task).filter(Task.title == "Theirs").one()
+    assert theirs.status == TaskStatus.TODO
+
+
+def test_batch_update_requires_one_selector(client: TestClient, auth_headers: dict):
+    response = client.patch(
+        "/tasks/batch",
+        json={"ids": [str(uuid.uuid4())], "filter": {}, "changes": {"status": "DONE"}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+    response = client.patch(
+        "/tasks/batch",
+        json={"ids": [str(uuid.uuid4())], "changes": {}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("batch_filter", [{}, {"status": None}])
+def test_batch_requires_a_filter_criterion(
+    client: TestClient, auth_headers: dict, batch_filter: dict
+):
+    task_id = client.post(
+        "/tasks", json={"title": "Kept"}, headers=auth_headers
+    ).json()["id"]
+
+    response = client.patch(
+        "/tasks/batch",
+        json={"filter": batch_filter, "changes": {"status": "DONE"}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+    response = client.request(
+        "DELETE", "/tasks/batch", json={"filter": batch_filter}, headers=auth_headers
+    )
+    assert response.status_code == 422
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers).status_code == 200
+
+
+def test_batch_delete_by_ids(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    tasks = [Task(title=f"Task {i}", owner_id=test_user.id) for i in range(3)]
+    db_session.add_all(tasks)
+    db_session.commit()
+    ids = [str(task.id) for task in tasks[:2]]
+    missing = str(uuid.uuid4())
+
+    response = client.request(
+        "DELETE", "/tasks/batch", json={"ids": ids + [missing]}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(data["deleted"]) == sorted(ids)
+    assert data["not_found"] == [missing]
+
+    remaining = client.get("/tasks", headers=auth_headers).json()
+    assert [task["id"] for task in remaining] == [str(tasks[2].id)]
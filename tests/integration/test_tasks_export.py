@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import anyio
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.routes import tasks as tasks_routes
+from app.core import security
+from app.db.session import ThreadedResult
+from app.main import app
+from app.models.task import Task
+from app.models.user import User
+
+
+def seed_tasks(db_session: Session, user: User, count: int) -> list[Task]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tasks = [
+        Task(
+            title=f"Task {i}",
+            description="with, comma" if i % 2 else None,
+            owner_id=user.id,
+            created_at=base + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    return tasks
+
+
+def test_export_ndjson(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    seed_tasks(db_session, test_user, 5)
+    other_user = User(
+        email="other@example.com", hashed_password=security.get_password_hash("pass")
+    )
+    db_session.add(other_user)
+    db_session.commit()
+    seed_tasks(db_session, other_user, 2)
+
+    response = client.get(
+        "/tasks/export", headers={**auth_headers, "Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"Task {i}" for i in range(5)]
+    assert rows == client.get("/tasks", headers=auth_headers).json()
+
+
+def test_export_csv_gzip(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    seed_tasks(db_session, test_user, 3)
+
+    response = client.get(
+        "/tasks/export?format=csv",
+        headers={**auth_headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Task 0", "Task 1", "Task 2"]
+    assert rows[1]["description"] == "with, comma"
+    assert rows[0]["description"] == ""
+
+
+def test_export_empty_csv_has_header(client: TestClient, auth_headers: dict):
+    response = client.get("/tasks/export?format=csv", headers=auth_headers)
+    assert response.text.splitlines() == [
+        "title,description,status,id,owner_id,created_at"
+    ]
+
+    response = client.get("/tasks/export?format=xml", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_export_closes_cursor_on_disconnect(
+    client: TestClient,
+    auth_headers: dict,
+    db_session: Session,
+    test_user: User,
+    monkeypatch,
+):
+    seed_tasks(db_session, test_user, 50)
+    monkeypatch.setattr(tasks_routes, "EXPORT_PARTITION_SIZE", 5)
+    closed = []
+    original_close = ThreadedResult.close
+
+    async def spy_close(self):
+        closed.append(True)
+        await original_close(self)
+
+    monkeypatch.setattr(ThreadedResult, "close", spy_close)
+
+    async def export_then_disconnect() -> list[bytes]:
+        chunks: list[bytes] = []
+        first_chunk = anyio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await first_chunk.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                chunks.append(message["body"])
+                first_chunk.set()
+                # Give the disconnect a chance to be noticed between chunks
+                await anyio.sleep(0.01)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/tasks/export",
+            "raw_path": b"/tasks/export",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"authorization", auth_headers["Authorization"].encode()),
+            ],
+            "client": ("testclient", 123),
+            "server": ("testserver", 80),
+        }
+        await app(scope, receive, send)
+        return chunks
+
+    chunks = anyio.run(export_then_disconnect)
+    lines = b"".join(chunks).splitlines()
+    assert 0 < len(lines) < 50
+    assert closed == [True]
@@ -0,0 +1,121 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.routes.tasks import list_tasks_query
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def tasks(db_session: Session, test_user: User) -> list[Task]:
+    statuses = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.DONE]
+    tasks = [
+        Task(
+            title=f"Task {i}",
+            status=statuses[i % 3],
+            owner_id=test_user.id,
+            created_at=BASE + timedelta(days=i),
+            # Tasks 0, 2, 4 were modified later, in reverse order
+            updated_at=BASE + timedelta(days=20 - i) if i % 2 == 0 else None,
+        )
+        for i in range(6)
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    return tasks
+
+
+def titles(client: TestClient, url: str, headers: dict) -> list[str]:
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return [task["title"] for task in response.json()]
+
+
+def test_filter_by_status_and_created_range(
+    client: TestClient, auth_headers: dict, tasks: list[Task]
+):
+    assert titles(client, "/tasks?status=IN_PROGRESS", auth_headers) == [
+        "Task 1",
+        "Task 4",
+    ]
+    url = (
+        "/tasks?created_after=2024-01-02T00:00:00Z&created_before=2024-01-05T00:00:00Z"
+    )
+    assert titles(client, url, auth_headers) == ["Task 2", "Task 3"]
+    # Offsets are normalized to UTC
+    url = "/tasks?created_after=2024-01-02T02:00:00%2B02:00&status=DONE"
+    assert titles(client, url, auth_headers) == ["Task 2", "Task 5"]
+
+
+def test_updated_since_counts_creation(
+    client: TestClient, auth_headers: dict, tasks: list[Task]
+):
+    url = "/tasks?updated_since=2024-01-05T00:00:00Z&sort=updated_at"
+    # Task 5 was created on Jan 6 and never updated; 4, 2, 0 updated Jan 17-21
+    assert titles(client, url, auth_headers) == ["Task 5", "Task 4", "Task 2", "Task 0"]
+
+
+def test_descending_sort_paginates(
+    client: TestClient, auth_headers: dict, tasks: list[Task]
+):
+    for sort, expected in [
+        ("-created_at", [f"Task {i}" for i in (5, 4, 3, 2, 1, 0)]),
+        ("-updated_at", [f"Task {i}" for i in (0, 2, 4, 5, 3, 1)]),
+    ]:
+        seen = []
+        url = f"/tasks?sort={sort}&limit=4"
+        while url:
+            response = client.get(url, headers=auth_headers)
+            seen.extend(task["title"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            url = f"/tasks?sort={sort}&limit=4&cursor={cursor}" if cursor else None
+        assert seen == expected
+
+    response = client.get("/tasks?sort=title", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def query_plan(db_session: Session, query) -> str:
+    """
+    SQLite's EXPLAIN QUERY PLAN for a statement. Parameter values do not
+    affect the plan, so they are bound as plain strings.
+    """
+    compiled = query.compile(dialect=db_session.get_bind().dialect)
+    params = tuple(str(compiled.params[name]) for name in compiled.positiontup)
+    rows = (
+        db_session.connection()
+        .exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        .all()
+    )
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({}, "idx_tasks_owner_created_at_id"),
+        ({"sort": "-created_at"}, "idx_tasks_owner_created_at_id"),
+        ({"created_after": BASE}, "idx_tasks_owner_created_at_id"),
+        ({"status": TaskStatus.DONE}, "idx_tasks_owner_status_created_at_id"),
+        ({"sort": "updated_at"}, "idx_tasks_owner_modified_at_id"),
+        (
+            {"updated_since": BASE, "sort": "-updated_at"},
+            "idx_tasks_owner_modified_at_id",
+        ),
+        ({"after": (BASE, uuid.uuid4())}, "idx_tasks_owner_created_at_id"),
+    ],
+)
+@pytest.mark.sqlite_only
+def test_list_queries_use_indexes(
+    db_session: Session, tasks: list[Task], filters: dict, index: str
+):
+    plan = query_plan(db_session, list_tasks_query(uuid.uuid4(), **filters))
+    assert f"USING INDEX {index}" in plan
+    # The index also provides the order: no separate sort step
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import uuid
+
+import asyncpg
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.api.routes import tasks as tasks_routes
+from app.core import task_import
+from app.db.bulk import _copy_text, copy_rows
+from app.db.session import get_async_url
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+
+def in_pieces(data: bytes, size: int = 7):
+    # Upload in small chunks so lines and UTF-8 sequences straddle boundaries
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def test_import_ndjson_reports_rejected_rows(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    lines = [
+        json.dumps({"title": "Café ☕"}),
+        json.dumps({"title": ""}),
+        "",
+        "{not json",
+        json.dumps({"title": "Done", "status": "DONE", "id": "ignored"}),
+        json.dumps({"title": "Extra", "priority": 1}),
+    ]
+    response = client.post(
+        "/tasks/import",
+        content=in_pieces("\n".join(lines).encode()),
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["accepted"] == 2
+    assert data["rejected"] == 3
+    assert [error["line"] for error in data["errors"]] == [2, 4, 6]
+    assert data["errors"][0]["errors"][0]["loc"] == ["title"]
+
+    tasks = db_session.query(Task).order_by(Task.title).all()
+    assert [(task.title, task.status) for task in tasks] == [
+        ("Café ☕", TaskStatus.TODO),
+        ("Done", TaskStatus.DONE),
+    ]
+    assert all(task.owner_id == test_user.id for task in tasks)
+
+
+def test_import_csv_in_chunks(
+    client: TestClient, auth_headers: dict, db_session: Session, monkeypatch
+):
+    monkeypatch.setattr(tasks_routes, "IMPORT_CHUNK_SIZE", 3)
+    rows = ["title,description,status"]
+    rows += [f"Task {i},,IN_PROGRESS" for i in range(9)]
+    rows.append('"Multi, line","first\nsecond",')
+    rows.append("Bad status,,LATER")
+
+    response = client.post(
+        "/tasks/import?format=csv",
+        content=in_pieces("\r\n".join(rows).encode()),
+        headers=auth_headers,
+    )
+    data = response.json()
+    assert (data["accepted"], data["rejected"]) == (10, 1)
+    assert [error["line"] for error in data["errors"]] == [13]
+
+    multi = db_session.query(Task).filter(Task.title == "Multi, line").one()
+    assert multi.description == "first\nsecond"
+    assert multi.status == TaskStatus.TODO
+
+
+def test_export_round_trips_through_import(client: TestClient, auth_headers: dict):
+    client.post(
+        "/tasks", json={"title": "One", "description": "a\tb"}, headers=auth_headers
+    )
+    client.post("/tasks", json={"title": "Two", "status": "DONE"}, headers=auth_headers)
+
+    # Each round imports everything exported so far, doubling the task set
+    for format, expected in (("ndjson", 2), ("csv", 4)):
+        exported = client.get(f"/tasks/export?format={format}", headers=auth_headers)
+        response = client.post(
+            f"/tasks/import?format={format}",
+            content=exported.content,
+            headers=auth_headers,
+        )
+        assert response.json()["accepted"] == expected
+
+    titles = [
+        task["title"] for task in client.get("/tasks", headers=auth_headers).json()
+    ]
+    assert sorted(titles) == ["One"] * 4 + ["Two"] * 4
+
+
+def test_import_rejects_overlong_line(
+    client: TestClient, auth_headers: dict, db_session: Session, monkeypatch
+):
+    monkeypatch.setattr(task_import, "IMPORT_MAX_LINE_BYTES", 64)
+    body = json.dumps({"title": "Fine"}) + "\n" + json.dumps({"title": "x" * 100})
+    response = client.post(
+        "/tasks/import", content=in_pieces(body.encode(), 16), headers=auth_headers
+    )
+    assert response.status_code == 400
+    # Nothing is committed when the upload is aborted
+    assert db_session.query(Task).count() == 0
+
+
+def test_copy_text_escaping():
+    assert _copy_text(None) == "\\N"
+    assert _copy_text("a\tb\nc\\d\r") == "a\\tb\\nc\\\\d\\r"
+    assert _copy_text(TaskStatus.IN_PROGRESS) == "IN_PROGRESS"
+
+
+@pytest.mark.postgres_only
+def test_async_copy_chunks_roll_back_together(db_engine: Engine):
+    owner = User(id=uuid.uuid4(), email="copy@example.com", hashed_password="x")
+    with Session(db_engine) as db:
+        db.add(owner)
+        db.commit()
+
+    def chunk(owner_id: uuid.UUID) -> list[dict]:
+        row = {"id": uuid.uuid4(), "title": "Copied", "description": None}
+        return [{**row, "status": TaskStatus.TODO, "owner_id": owner_id}]
+
+    async def import_chunks() -> None:
+        url = db_engine.url.render_as_string(hide_password=False)
+        async_engine = create_async_engine(get_async_url(url), poolclass=NullPool)
+        try:
+            async with AsyncSession(async_engine) as db:
+                # COPY is the first statement, as after a principal cache hit
+                await db.run_sync(copy_rows, Task.__table__, chunk(owner.id))
+                with pytest.raises(asyncpg.ForeignKeyViolationError):
+                    await db.run_sync(copy_rows, Task.__table__, chunk(uuid.uuid4()))
+                await db.rollback()
+        finally:
+            await async_engine.dispose()
+
+    try:
+        asyncio.run(import_chunks())
+        with Session(db_engine) as db:
+            copied = db.scalar(
+                select(func.count()).select_from(Task).where(Task.owner_id == owner.id)
+            )
+        assert copied == 0
+    finally:
+        with Session(db_engine) as db:
+            db.execute(delete(Task).where(Task.owner_id == owner.id))
+            db.execute(delete(User).where(User.id == owner.id))
+            db.commit()
@@ -0,0 +1,78 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.search import search_clauses
+from app.models.task import Task
+from app.models.user import User
+
+
+def test_search_ranks_title_matches_first(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    other_user = User(
+        email="other@example.com", hashed_password=security.get_password_hash("pass")
+    )
+    db_session.add(other_user)
+    db_session.commit()
+    db_session.add_all(
+        [
+            Task(title="Buy milk", owner_id=test_user.id),
+            Task(title="Groceries", description="Milk and eggs", owner_id=test_user.id),
+            Task(title="Call mom", owner_id=test_user.id),
+            Task(title="Milk the cow", owner_id=other_user.id),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/tasks/search?q=MILK", headers=auth_headers)
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Buy milk", "Groceries"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_search_keyset_pagination(
+    client: TestClient, auth_headers: dict, db_session: Session, test_user: User
+):
+    db_session.add_all(
+        [Task(title=f"Report {i}", owner_id=test_user.id) for i in range(5)]
+        + [
+            Task(title=f"Other {i}", description="report", owner_id=test_user.id)
+            for i in range(2)
+        ]
+    )
+    db_session.commit()
+
+    seen = []
+    url = "/tasks/search?q=report&limit=3"
+    while url:
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        seen.extend(task["title"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/tasks/search?q=report&limit=3&cursor={cursor}" if cursor else None
+
+    assert len(seen) == len(set(seen)) == 7
+    assert all(title.startswith("Report") for title in seen[:5])
+
+
+def test_search_rejects_bad_input(client: TestClient, auth_headers: dict):
+    assert client.get("/tasks/search?q=", headers=auth_headers).status_code == 422
+    response = client.get("/tasks/search?q=x&cursor=bogus", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_postgres_search_uses_prefix_tsquery_and_trigrams():
+    rank, match = search_clauses("postgresql", "Fix login-bug!")
+    query = select(Task.id, rank).where(match)
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "tasks.search_vector @@ to_tsquery" in sql
+    assert "tasks.title %%> " in sql  # % is escaped for the pyformat paramstyle
+    assert "fix:* & login:* & bug:*" in compiled.params.values()
+
+    # Nothing left for the text search: trigram similarity only
+    _, match = search_clauses("postgresql", "!!!")
+    assert "to_tsquery" not in str(match.compile(dialect=postgresql.dialect()))
@@ -0,0 +1,112 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import Span, SpanExporter, otlp_json, parse_traceparent
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.traces: list[list[Span]] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.traces.append(spans)
+
+
+@pytest.fixture
+def exported(monkeypatch) -> RecordingExporter:
+    recorder = RecordingExporter()
+    monkeypatch.setattr(tracing, "exporter", recorder)
+    return recorder
+
+
+def test_request_spans_continue_incoming_trace(
+    client: TestClient, auth_headers: dict, exported: RecordingExporter
+):
+    client.post("/tasks", json={"title": "Traced"}, headers=auth_headers)
+    exported.traces.clear()
+
+    response = client.get(
+        "/tasks",
+        headers={**auth_headers, "traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+    assert response.status_code == 200
+
+    (spans,) = exported.traces
+    by_name = {span.name: span for span in spans}
+    root = by_name["GET /tasks"]
+    assert root.trace_id == TRACE_ID
+    assert root.parent_id == PARENT_ID
+    assert root.attributes["http.response.status_code"] == 200
+    assert response.headers["traceresponse"] == f"00-{TRACE_ID}-{root.span_id}-01"
+
+    assert {"get_current_user", "handler", "serialize", "render", "SELECT"} <= set(
+        by_name
+    )
+    assert all(span.trace_id == TRACE_ID for span in spans)
+    assert by_name["handler"].parent_id == root.span_id
+    assert by_name["serialize"].parent_id == by_name["handler"].span_id
+    queries = [span for span in spans if span.name == "SELECT"]
+    assert all("db.statement" in span.attributes for span in queries)
+    assert any(span.parent_id == by_name["handler"].span_id for span in queries)
+
+
+def test_sampling_honours_parent_flag(
+    client: TestClient, auth_headers: dict, exported: RecordingExporter, monkeypatch
+):
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+    response = client.get("/tasks", headers=auth_headers)
+    assert exported.traces == []
+    assert response.headers["traceresponse"].endswith("-00")
+
+    client.get(
+        "/tasks",
+        headers={**auth_headers, "traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+    assert len(exported.traces) == 1
+
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 1.0)
+    client.get(
+        "/tasks",
+        headers={**auth_headers, "traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"},
+    )
+    assert len(exported.traces) == 1
+
+
+def test_parse_traceparent_rejects_malformed_headers():
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (
+        TRACE_ID,
+        PARENT_ID,
+        True,
+    )
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}") is None
+    assert parse_traceparent("garbage") is None
+
+
+def test_exporter_writes_otlp_json_lines():
+    root = Span(name="GET /tasks", trace_id=TRACE_ID, span_id=PARENT_ID, kind=2)
+    child = root.child("SELECT", 3, {"db.system": "sqlite", "app.rows": 3})
+    child.error = "ValueError()"
+    child.end()
+    root.end()
+
+    stream = io.StringIO()
+    exporter = SpanExporter(stream)
+    exporter.export(root.finished)
+    exporter.shutdown()
+
+    (line,) = stream.getvalue().splitlines()
+    assert json.loads(line) == otlp_json(root.finished)
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["parentSpanId"] == PARENT_ID
+    assert spans[0]["status"] == {"code": 2, "message": "ValueError()"}
+    assert {"key": "app.rows", "value": {"intValue": "3"}} in spans[0]["attributes"]
+    assert "parentSpanId" not in spans[1]
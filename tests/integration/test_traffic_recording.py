@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import recording
+from app.core.recording import shape, shape_query
+
+
+class ListRecorder:
+    def __init__(self):
+        self.entries: list[dict] = []
+
+    def record(self, entry: dict) -> None:
+        self.entries.append(entry)
+
+
+@pytest.fixture
+def recorded(monkeypatch) -> ListRecorder:
+    recorder = ListRecorder()
+    monkeypatch.setattr(recording, "recorder", recorder)
+    return recorder
+
+
+def test_requests_are_recorded_sanitized(
+    client: TestClient, auth_headers: dict, recorded: ListRecorder
+):
+    created = client.post(
+        "/tasks",
+        json={"title": "Secret plans", "status": "DONE", "description": None},
+        headers=auth_headers,
+    )
+    client.get(f"/tasks/{created.json()['id']}?q=private&limit=5", headers=auth_headers)
+    client.get("/no-such-route")
+
+    create, read = recorded.entries
+    assert create["method"] == "POST"
+    assert create["route"] == "/tasks"
+    assert create["status"] == 201
+    assert create["body"] == {
+        "title": "<str:12>",
+        "status": "DONE",
+        "description": None,
+    }
+    assert create["duration_ms"] > 0
+
+    assert read["route"] == "/tasks/{id}"
+    assert read["query"] == {"q": "<str:7>", "limit": "5"}
+    assert read["body"] is None
+    assert read["user"] == create["user"]
+    assert len(read["user"]) == 16
+    token = auth_headers["Authorization"].split()[1]
+    assert token not in str(recorded.entries)
+
+
+def test_shape_keeps_structure_and_whitelisted_values():
+    assert shape(
+        {"items": [{"title": "a", "status": "TODO"}], "limit": 5, "flag": True}
+    ) == {"items": [{"title": "<str:1>", "status": "TODO"}], "limit": 5, "flag": True}
+
+
+def test_secrets_are_redacted_without_length(
+    client: TestClient, recorded: ListRecorder
+):
+    credentials = {"email": "recorded@example.com", "password": "hunter2-hunter2"}
+    client.post("/auth/register", json=credentials)
+    client.post("/auth/login", json=credentials)
+
+    register, login = recorded.entries
+    assert register["body"] == {"email": "<str:20>", "password": "<redacted>"}
+    assert login["body"] == register["body"]
+    assert shape_query({"password": "1234"}) == {"password": "<redacted>"}
@@ -0,0 +1,191 @@
+"""
+Statement budgets and index checks for the SQL an endpoint issues.
+
+    @query_budget(4)
+    def test_create_task_budget(client, auth_headers):
+        client.post("/tasks", json={"title": "x"}, headers=auth_headers)
+
+Every statement executed while the test body runs (fixtures have already
+been set up) is captured; the test fails if there are more than the budget,
+or if a statement on the `tasks` table cannot be served by an index. The
+failure lists the statements, so the extra query is easy to spot.
+`capture_queries` does the same for a block inside a test.
+"""
+
+import functools
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.instrumentation import QueryStats, normalize_sql
+
+TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO")
+
+
+@dataclass
+class CapturedStatement:
+    sql: str
+    parameters: Any
+    connection: Connection
+    executemany: bool
+
+
+@dataclass
+class QueryCapture:
+    statements: list[CapturedStatement] = field(default_factory=list)
+    stats: QueryStats = field(default_factory=QueryStats)
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        # Emitted by the test fixtures' per-test transaction, not the app
+        if statement.lstrip().upper().startswith(TRANSACTION_CONTROL):
+            return
+        self.statements.append(
+            CapturedStatement(statement, parameters, conn, executemany)
+        )
+        self.stats.statements += 1
+        self.stats.shapes[normalize_sql(statement)] += 1
+
+    def __enter__(self) -> "QueryCapture":
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        event.remove(Engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def report(self) -> str:
+        lines = []
+        for n, captured in enumerate(self.statements, start=1):
+            shape = normalize_sql(captured.sql)
+            repeats = self.stats.shapes[shape]
+            suffix = f"  [x{repeats}]" if repeats > 1 else ""
+            lines.append(f"  {n}. {shape}{suffix}")
+        return "\n".join(lines) or "  (none)"
+
+    def assert_budget(self, max_statements: int) -> None:
+        if self.stats.statements > max_statements:
+            pytest.fail(
+                f"{self.stats.statements} SQL statements issued, budget is "
+                f"{max_statements}:\n{self.report()}",
+                pytrace=False,
+            )
+
+    def assert_index_usage(self, table: str = "tasks") -> None:
+        """
+        EXPLAIN every captured SELECT/UPDATE/DELETE that reads `table` and
+        fail if any would scan it rather than use an index.
+        """
+        offending = []
+        for captured in self.statements:
+            verb = captured.sql.lstrip().split(None, 1)[0].upper()
+            if captured.executemany or verb not in {"SELECT", "UPDATE", "DELETE"}:
+                continue
+            if not references(captured.sql, table):
+                continue
+            plan, scans = explain(captured, table)
+            if scans:
+                offending.append(f"{normalize_sql(captured.sql)}\n{plan}")
+        if offending:
+            pytest.fail(
+                f"Statements scanning `{table}` without an index:\n\n"
+                + "\n\n".join(offending),
+                pytrace=False,
+            )
+
+
+def references(sql: str, table: str) -> bool:
+    words = normalize_sql(sql).replace(",", " ").split()
+    return any(word.strip('"') == table for word in words)
+
+
+def explain(captured: CapturedStatement, table: str) -> tuple[str, bool]:
+    """
+    The plan of a captured statement, and whether it scans `table`
+    sequentially. Nothing is executed. On PostgreSQL sequential scans are
+    disabled for the EXPLAIN, so tiny test tables do not hide a missing
+    index: a Seq Scan is then chosen only when no index applies.
+    """
+    with explain_connection(captured) as conn:
+        if conn.dialect.name == "postgresql":
+            # A savepoint inside the test's transaction: rolled back, so the
+            # setting does not outlive the EXPLAIN
+            if conn.in_transaction():
+                transaction = conn.begin_nested()
+            else:
+                transaction = conn.begin()
+            try:
+                conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                (document,) = conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {captured.sql}", captured.parameters
+                ).one()
+            finally:
+                transaction.rollback()
+            if isinstance(document, str):
+                document = json.loads(document)
+            nodes = list(_plan_nodes(document[0]["Plan"]))
+            plan = "\n".join(
+                f"  {node['Node Type']} {node.get('Relation Name', '')}".rstrip()
+                for node in nodes
+            )
+            scans = any(
+                node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table
+                for node in nodes
+            )
+            return plan, scans
+
+        rows = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {captured.sql}", captured.parameters
+        ).all()
+        details = [row[-1] for row in rows]
+        scans = any(detail.startswith(f"SCAN {table}") for detail in details)
+        return "\n".join(f"  {detail}" for detail in details), scans
+
+
+@contextmanager
+def explain_connection(captured: CapturedStatement) -> Iterator[Connection]:
+    """
+    The connection the statement ran on while it is still open: it may hold
+    the test's uncommitted rows. Otherwise a new one from the same engine.
+    """
+    if not captured.connection.closed:
+        yield captured.connection
+        return
+    with captured.connection.engine.connect() as conn:
+        yield conn
+
+
+def _plan_nodes(node: dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def query_budget(
+    max_statements: int, index_table: str | None = "tasks"
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Fail the decorated test if its body issues more than `max_statements`
+    SQL statements, or (unless `index_table` is None) if one of them scans
+    that table without an index.
+    """
+
+    def decorator(test: Callable[..., Any]) -> Callable[..., Any]:
+        # functools.wraps keeps the fixture signature visible to pytest
+        @functools.wraps(test)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with QueryCapture() as captured:
+                result = test(*args, **kwargs)
+            captured.assert_budget(max_statements)
+            if index_table is not None:
+                captured.assert_index_usage(index_table)
+            return result
+
+        return wrapper
+
+    return decorator